@@ -0,0 +1,127 @@
+"""
+Sinkronisasi inkremental basis data lokal -> Google Sheets.
+
+Submit disimpan lebih dulu ke basis data lokal (basis_data.py). Thread latar
+belakang lalu mencerminkan baris yang baru atau berubah ke spreadsheet,
+banyak baris sekaligus (satu batch_update + satu append per spreadsheet).
+Jika Google API gagal, baris tetap tertunda dan target dicoba lagi dengan
+backoff eksponensial, sehingga submit tidak menunggu round-trip ke Google dan
+tidak ada data yang hilang.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+import basis_data
+import koneksi_google
+import metrik
+import penyimpanan
+
+
+JEDA_KUMPUL = 2.0      # detik menunggu submit lain agar masuk batch yang sama
+INTERVAL_CEK = 30.0    # detik antar pengecekan walau tidak ada sinyal
+BATAS_BATCH = 200      # baris maksimal per request ke satu spreadsheet
+
+# Outbox versi sebelumnya; baris yang belum terkirim dipindahkan ke basis data
+PATH_OUTBOX_LAMA = os.path.join("data", "outbox.sqlite")
+
+logger = logging.getLogger(__name__)
+
+_sinyal = threading.Event()
+_kunci_thread = threading.Lock()
+_thread = None
+
+
+def masukkan(target, data, path=basis_data.PATH_DB, id_=None):
+    """
+    Upsert satu baris di basis data lokal dan bangunkan job sinkronisasi.
+    Mengembalikan (status, id) dari basis_data.simpan.
+    """
+    hasil = basis_data.simpan(target, data, path=path, id_=id_)
+    _sinyal.set()
+    return hasil
+
+
+def _kirim(target, daftar_data):
+    worksheet = koneksi_google.ambil_worksheet(target["sumber"], kunci=target["kunci"], nama=target["nama"])
+    try:
+        drive_service = koneksi_google.ambil_drive_service(target["sumber"])
+    except Exception:
+        drive_service = None
+    indeks = penyimpanan.IndeksBaris(worksheet, target["kolom_kunci"], drive_service) if drive_service else None
+    return penyimpanan.simpan_banyak(
+        worksheet, daftar_data, target["column_order"], target["kolom_kunci"], indeks=indeks
+    )
+
+
+def kirim_sekali(path=basis_data.PATH_DB, kirim=_kirim):
+    """
+    Cerminkan satu batch per target yang sudah jatuh tempo.
+    Mengembalikan jumlah baris yang berhasil tersinkron.
+    """
+    terkirim = 0
+    batch = basis_data.belum_tersinkron(BATAS_BATCH, path=path)
+    for target_id, target, entri in batch:
+        with metrik.jejak("sinkron", target=target_id, baris=len(entri)) as jejak:
+            try:
+                kirim(target, [data for _, _, data in entri])
+            except Exception as e:
+                logger.warning("Gagal sinkron %d baris ke Google Sheets: %s", len(entri), e)
+                jejak["status"] = "gagal"
+                basis_data.catat_gagal(target_id, str(e), path=path)
+                continue
+            basis_data.tandai_tersinkron(target_id, [(id_, versi) for id_, versi, _ in entri], path=path)
+        terkirim += len(entri)
+    if batch:
+        metrik.tulis()
+    return terkirim
+
+
+def _impor_outbox_lama(path):
+    if not os.path.exists(PATH_OUTBOX_LAMA):
+        return
+    with closing(sqlite3.connect(PATH_OUTBOX_LAMA, timeout=30)) as conn:
+        rows = conn.execute("SELECT target, data FROM outbox WHERE terkirim IS NULL ORDER BY id").fetchall()
+    for target, data in rows:
+        basis_data.simpan(json.loads(target), json.loads(data), path=path)
+    os.replace(PATH_OUTBOX_LAMA, PATH_OUTBOX_LAMA + ".diimpor")
+    logger.info("%d baris outbox lama dipindahkan ke basis data lokal", len(rows))
+
+
+def _jeda_berikutnya(path):
+    jatuh_tempo = basis_data.jatuh_tempo_berikutnya(path=path)
+    if jatuh_tempo is None:
+        return INTERVAL_CEK
+    return min(INTERVAL_CEK, max(jatuh_tempo - time.time(), 0))
+
+
+def _loop_flusher(path):
+    try:
+        _impor_outbox_lama(path)
+    except Exception:
+        logger.exception("Gagal memindahkan outbox lama")
+    while True:
+        _sinyal.wait(_jeda_berikutnya(path))
+        if _sinyal.is_set():
+            time.sleep(JEDA_KUMPUL)
+            _sinyal.clear()
+        try:
+            while kirim_sekali(path):
+                pass
+        except Exception:
+            logger.exception("Sinkronisasi ke Google Sheets berhenti sementara")
+
+
+def jalankan_flusher(path=basis_data.PATH_DB):
+    """Mulai thread sinkronisasi latar belakang (sekali per proses)."""
+    global _thread
+    with _kunci_thread:
+        if _thread is None or not _thread.is_alive():
+            _thread = threading.Thread(
+                target=_loop_flusher, args=(path,), name="sinkron-sheets", daemon=True
+            )
+            _thread.start()
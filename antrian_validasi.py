@@ -0,0 +1,399 @@
+"""
+Antrian pekerjaan validasi dokumen di latar belakang.
+
+Submit form hanya menyimpan PDF ke folder uploads/, menulis baris dasar
+(jawaban notaris tanpa kolom internal control & link dokumen, status
+"Menunggu validasi"), mencatat satu pekerjaan di tabel `pekerjaan`
+(basis_data.py), lalu langsung kembali. Worker pool
+lokal mengerjakan validasi OCR dan upload ke Google Drive secara bersamaan,
+menghitung internal control & tingkat risiko akhir begitu validasi selesai,
+lalu memperbarui baris yang sama lewat antrian_kirim.masukkan; bila pekerjaan
+gagal, baris dasar tetap ada dengan status gagal. Tahap, progres dan pesan disimpan di basis data
+sehingga form bisa menampilkan status, dan pekerjaan yang terputus
+(server restart) dilanjutkan oleh worker berikutnya.
+"""
+import contextvars
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import antrian_kirim
+import basis_data
+import kuisioner
+import metrik
+import penilaian_risiko
+import unggah_drive
+import validasi_dokumen
+
+
+JENIS_KANWIL = "kanwil"
+JENIS_Q1Q2 = "q1q2"
+
+JUMLAH_WORKER = int(os.environ.get("PMPJ_WORKER_VALIDASI", 2))
+BATAS_MACET = 900.0   # detik tanpa kabar sebelum pekerjaan 'berjalan' dianggap terputus
+
+STATUS_MENUNGGU = "Menunggu validasi"
+STATUS_SELESAI = "Selesai"
+
+# Kata kunci dokumen Q1 (CDD/EDD/Analisis Risiko) form stkanwil.py
+KATA_KUNCI_KANWIL = [
+    "Formulir Customer Due Diligence",
+    "formulir customer due diligence perorangan",
+    "Analisis Risiko", "Analisis Resiko",
+    "Enhanced Due Diligence",
+    "CDD",
+    "EDD",
+]
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_kunci_executor = threading.Lock()
+
+
+def kirim(jenis, masukan, path=basis_data.PATH_DB):
+    """
+    Tulis baris dasar, catat pekerjaan lalu serahkan ke worker pool; langsung kembali.
+
+    masukan: {
+        "sumber", "target", "data" (baris tanpa kolom hasil validasi),
+        "dokumen": [slot per pertanyaan: None atau {"path", "nama", "kolom", "unggah", "kolom_hash"}],
+        "folder_drive", "semua_drive", "kata_kunci",
+        "jawaban": {"q1", "q2"}, "kategori_inherent", "nilai_pengguna"
+    }
+    Mengembalikan id pekerjaan (lihat status()).
+    """
+    # Jawaban notaris tersimpan sebelum validasi; worker memperbarui baris yang sama
+    status_simpan, id_baris = _simpan_baris(masukan, masukan["data"], STATUS_MENUNGGU, path)
+    masukan = {**masukan, "id_baris": id_baris, "status_simpan": status_simpan}
+    id_ = basis_data.buat_pekerjaan(jenis, masukan, path=path)
+    _pool(path).submit(_kerjakan, id_, path)
+    return id_
+
+
+def masukan_kanwil(jawaban, aturan, target, dokumen, sumber, folder_drive, kata_kunci=KATA_KUNCI_KANWIL):
+    """
+    Masukan kirim(JENIS_KANWIL, ...) dari jawaban form (bentuk form_kuisioner.jawaban).
+    Inherent risk & risiko pengguna jasa dihitung di sini; internal control,
+    residual & tingkat risiko akhir oleh worker setelah validasi dokumen.
+    dokumen: per kuisioner.DOKUMEN, None atau (path PDF lokal, nama file asli).
+    """
+    jumlah = jawaban["jumlah"]
+    wilayah = jawaban["identitas"][kuisioner.KOLOM_WILAYAH]
+    hasil_inherent = penilaian_risiko.hitung_risiko({
+        "profil": jumlah["profil"],
+        "bisnis": jumlah["bisnis_pengguna"],
+        "jasa": jumlah["jasa"],
+        "negara": jumlah["negara"],
+        "apgakkum": jawaban["apgakkum"],
+        "wilayah": wilayah
+    }, aturan)
+    nilai_pengguna, kategori_pengguna = penilaian_risiko.risiko_pengguna_jasa(
+        sum(jumlah["profil"].values()), aturan
+    )
+
+    # Identitas, jumlah klien per pilihan, pertanyaan, dokumen & APGAKKUM dari skema form
+    data = {
+        kuisioner.KOLOM_TIMESTAMP: time.strftime("%Y-%m-%d %H:%M:%S"),
+        **kuisioner.baris(JENIS_KANWIL, jawaban),
+        **aturan.bobot["wilayah_skor"],
+    }
+    # Skor pilihan terbesar
+    for kunci in ("profil", "bisnis", "jasa", "negara", "apgakkum", "wilayah"):
+        data[f"jawaban_{kunci}"] = hasil_inherent[f"jawaban_{kunci}"]
+        data[f"skor_{kunci}"] = hasil_inherent[f"skor_{kunci}"]
+    data["wilayah"] = wilayah   # provinsi yang dipilih notaris
+    # Ringkasan skor/tingkat risiko
+    data["Nilai Inherent Risk"] = hasil_inherent["total_skor"]
+    data["Tingkat Inherent Risk"] = hasil_inherent["kategori_risiko"]
+    data["Nilai Risiko Pengguna Jasa"] = nilai_pengguna
+    data["Tingkat Risiko Pengguna Jasa"] = kategori_pengguna
+    data["Versi Aturan"] = hasil_inherent["versi_aturan"]
+
+    q1, q2 = (jawaban["pertanyaan"][p["kolom"]] for p in kuisioner.PERTANYAAN[:2])
+    return {
+        "sumber": sumber,
+        "target": target,
+        "data": data,
+        "dokumen": [
+            {"path": dok[0], "nama": dok[1], "unggah": True, "kolom": slot["kolom"], "kolom_hash": slot["kolom_hash"]}
+            if dok else None
+            for slot, dok in zip(kuisioner.DOKUMEN, dokumen)
+        ],
+        "folder_drive": folder_drive,
+        "semua_drive": False,
+        "kata_kunci": kata_kunci,
+        "jawaban": {"q1": q1, "q2": q2},
+        "kategori_inherent": hasil_inherent["kategori_risiko"],
+        "nilai_pengguna": nilai_pengguna,
+    }
+
+
+def status(id_, path=basis_data.PATH_DB):
+    """Status pekerjaan: dict dengan status, tahap, kemajuan, pesan, hasil, error."""
+    return basis_data.ambil_pekerjaan(id_, path=path)
+
+
+def _pool(path):
+    """Worker pool bersama; saat pertama dibuat, pekerjaan tertunda dilanjutkan."""
+    global _executor
+    with _kunci_executor:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=JUMLAH_WORKER, thread_name_prefix="validasi-dokumen")
+            for id_ in basis_data.pekerjaan_tertunda(BATAS_MACET, path=path):
+                _executor.submit(_kerjakan, id_, path)
+        return _executor
+
+
+def jalankan_worker(path=basis_data.PATH_DB):
+    """
+    Dipanggil saat aplikasi start: pastikan worker pool hidup (dan lanjutkan
+    pekerjaan tertunda) serta job sinkronisasi Google Sheets berjalan, agar
+    baris yang masih tertunda dari proses sebelumnya langsung dikirim.
+    """
+    _pool(path)
+    antrian_kirim.jalankan_flusher(path)
+
+
+def _simpan_baris(masukan, data, status_validasi, path):
+    """Upsert baris `data` (dengan kolom status validasi) ke target; (status, id) dari antrian_kirim.masukkan."""
+    data = {**data, kuisioner.KOLOM_STATUS_VALIDASI: status_validasi}
+    return antrian_kirim.masukkan(masukan["target"], data, path=path, id_=masukan.get("id_baris"))
+
+
+def _kerjakan(id_, path):
+    klaim = basis_data.klaim_pekerjaan(id_, path=path)
+    if klaim is None:
+        return  # sudah diambil worker lain
+    jenis, masukan, dibuat = klaim
+
+    def lapor(tahap=None, kemajuan=None, pesan=None):
+        basis_data.perbarui_pekerjaan(id_, tahap=tahap, kemajuan=kemajuan, pesan=pesan, path=path)
+
+    # Satu baris JSON per submit di data/jejak.jsonl (durasi per tahap) + metrik proses di file Prometheus
+    try:
+        with metrik.jejak(jenis, pekerjaan=id_, nik=masukan["data"].get("NIK KTP")) as jejak:
+            metrik.catat_tahap("antri", max(time.time() - dibuat, 0.0))
+            try:
+                hasil = _proses(jenis, masukan, lapor, path)
+                error = None
+                if hasil["gagal"]:
+                    # Baris tetap tersimpan; tugas yang gagal dicatat di tabel pekerjaan
+                    jejak["status"] = "gagal"
+                    error = "Tugas gagal: " + "; ".join(f"{n} ({p})" for n, p in hasil["gagal"].items())
+            except Exception as e:
+                logger.exception("Pekerjaan validasi %s gagal", id_)
+                jejak["status"] = "gagal"
+                basis_data.selesaikan_pekerjaan(id_, error=str(e), path=path)
+                # Jawaban notaris tidak dibuang: baris dasar ditandai gagal
+                try:
+                    _simpan_baris(masukan, masukan["data"], f"Gagal: {e}", path)
+                except Exception:
+                    logger.exception("Gagal menandai baris pekerjaan %s", id_)
+                return
+            basis_data.selesaikan_pekerjaan(id_, hasil=hasil, error=error, path=path)
+    finally:
+        metrik.tulis()
+
+
+def _baca(dok):
+    if dok is None:
+        return None
+    with open(dok["path"], "rb") as f:
+        return f.read()
+
+
+# --- Validasi per jenis kuisioner ---
+def _validasi_kanwil(masukan, i, isi, lapor):
+    valid, _, jumlah = validasi_dokumen.validasi_kanwil(
+        isi, masukan["kata_kunci"], judul="Dokumen Q1 (CDD/EDD/Analisis Risiko)",
+        laporan=lambda p: lapor(pesan=p)
+    )
+    return {"valid": valid, "jumlah_kata": jumlah}
+
+
+def _nilai_kanwil(masukan, hasil_dokumen):
+    return penilaian_risiko.hitung_internal_control_kanwil(
+        masukan["jawaban"]["q1"], masukan["dokumen"][0], hasil_dokumen[0]["valid"]
+    )
+
+
+def _validasi_q1q2(masukan, i, isi, lapor):
+    valid, _, jumlah, tipe = validasi_dokumen.validasi_q1q2(
+        isi, masukan["kata_kunci"], laporan=lambda p: lapor(pesan=f"File {i + 1}: {p}")
+    )
+    return {"valid": valid, "jumlah_kata": jumlah, "tipe": tipe}
+
+
+def _nilai_q1q2(masukan, hasil_dokumen):
+    dok1, dok2 = masukan["dokumen"]
+    jawaban = masukan["jawaban"]
+    return penilaian_risiko.hitung_internal_control_q1q2(
+        jawaban["q1"], jawaban["q2"], dok1, dok2, hasil_dokumen[0]["valid"], hasil_dokumen[1]["valid"]
+    )
+
+
+# jenis -> (validasi satu dokumen, jumlah slot yang divalidasi, internal control dari hasil validasi)
+_VALIDASI = {
+    JENIS_KANWIL: (_validasi_kanwil, 1, _nilai_kanwil),
+    JENIS_Q1Q2: (_validasi_q1q2, 2, _nilai_q1q2),
+}
+
+
+# --- Graf pekerjaan per submit ---
+def _jalankan_graf(graf, lapor=None):
+    """
+    Jalankan graf tugas {nama: (fungsi, [nama dependensi], selalu=False)} di
+    thread pool: setiap tugas mulai begitu semua dependensinya selesai dan
+    menerima hasil dependensi itu sebagai argumen (urutan sama).
+
+    Tugas yang gagal tidak menghentikan graf: error-nya dicatat, tugas yang
+    bergantung padanya dilewati (juga dicatat), kecuali tugas `selalu` yang
+    tetap dijalankan dengan None sebagai hasil dependensi yang gagal.
+    Mengembalikan (hasil {nama: hasil}, gagal {nama: pesan}).
+    Konteks disalin agar durasi tiap tahap masuk ke jejak submit (metrik.py).
+    """
+    hasil, gagal, berjalan, sisa = {}, {}, {}, dict(graf)
+    with ThreadPoolExecutor(max_workers=len(graf) or 1, thread_name_prefix="submit") as executor:
+        while sisa or berjalan:
+            berubah = True
+            while berubah:  # tugas yang dilewati bisa membuat tugas lain siap
+                berubah = False
+                for nama, (fungsi, dependensi, *opsi) in list(sisa.items()):
+                    if not all(d in hasil or d in gagal for d in dependensi):
+                        continue
+                    del sisa[nama]
+                    dependensi_gagal = [d for d in dependensi if d in gagal]
+                    if dependensi_gagal and not (opsi and opsi[0]):
+                        gagal[nama] = f"dilewati, dependensi gagal: {', '.join(dependensi_gagal)}"
+                        berubah = True
+                        continue
+                    future = executor.submit(
+                        contextvars.copy_context().run, fungsi, *(hasil.get(d) for d in dependensi)
+                    )
+                    berjalan[future] = nama
+            if not berjalan:
+                if sisa:
+                    raise ValueError(f"Dependensi tugas tidak terpenuhi: {sorted(sisa)}")
+                break
+            selesai, _ = wait(berjalan, return_when=FIRST_COMPLETED)
+            for future in selesai:
+                nama = berjalan.pop(future)
+                try:
+                    hasil[nama] = future.result()
+                except Exception as e:
+                    logger.exception("Tugas %s gagal", nama)
+                    gagal[nama] = str(e) or type(e).__name__
+            if lapor:
+                lapor(kemajuan=0.1 + 0.8 * (len(hasil) + len(gagal)) / len(graf))
+    return hasil, gagal
+
+
+def _proses(jenis, masukan, lapor, path=basis_data.PATH_DB):
+    """
+    Validasi dokumen, upload ke Drive dan penilaian sebagai graf:
+
+        validasi_i ─> nilai ─┐
+        unggah_j ────────────┴─> simpan
+
+    Validasi semua dokumen dan upload berjalan bersamaan; penilaian internal
+    control & risiko akhir dimulai begitu validasi selesai walau upload masih
+    berjalan, sehingga latensi ≈ tahap terpanjang, bukan jumlah semua tahap.
+    Simpan tetap berjalan bila tugas sebelumnya gagal: kolom link / hasil
+    validasi tugas itu dikosongkan dan nama tugasnya dicatat di hasil["gagal"].
+    """
+    validasi, jumlah_validasi, nilai_ic_dari = _VALIDASI[jenis]
+    # Setiap PDF dibaca sekali; bytes yang sama dipakai untuk validasi & upload
+    slot = masukan["dokumen"]
+    isi = [_baca(dok) for dok in slot]
+
+    def tugas_validasi(i):
+        def jalankan():
+            with metrik.waktu("validasi"):
+                return validasi(masukan, i, isi[i], lapor)
+        return jalankan
+
+    # SHA-256 isi dokumen: dedup upload Drive & disimpan di baris untuk audit
+    hash_isi = [unggah_drive.sha256(b) if b is not None else None for b in isi]
+
+    def tugas_unggah(i):
+        dok = slot[i]
+
+        def jalankan():
+            link = unggah_drive.unggah_pdf(
+                masukan["sumber"], isi[i], dok["nama"], masukan["folder_drive"],
+                semua_drive=masukan.get("semua_drive", False), laporan=lambda p: lapor(pesan=p),
+                hash_isi=hash_isi[i]
+            )
+            if link is None:
+                # Path lokal tidak ditulis ke sheet; file tetap di uploads/ untuk diulang
+                raise RuntimeError(f"upload Drive gagal, file tetap di {dok['path']}")
+            return link
+        return jalankan
+
+    def tugas_nilai(*hasil_validasi):
+        # --- Internal control, residual & tingkat risiko akhir ---
+        nilai_ic, kategori_ic = nilai_ic_dari(masukan, hasil_validasi)
+        kategori_residual, nilai_residual = penilaian_risiko.hitung_residual_risk(
+            masukan["kategori_inherent"], kategori_ic
+        )
+        kategori_final = penilaian_risiko.tingkat_risiko(nilai_residual, masukan["nilai_pengguna"])
+        return nilai_ic, kategori_ic, kategori_residual, nilai_residual, kategori_final
+
+    nama_validasi = [f"validasi_{i}" for i in range(jumlah_validasi)]
+    unggahan = [i for i, dok in enumerate(slot) if dok is not None and dok.get("unggah")]
+    nama_unggah = [f"unggah_{i}" for i in unggahan]
+
+    def tugas_simpan(nilai, *link):
+        # --- Baris final (penilaian + semua link upload; None untuk tugas yang gagal) ---
+        lapor(tahap="Menyimpan hasil", kemajuan=0.9)
+        data = dict(masukan["data"])
+        for i, l in zip(unggahan, link):
+            data[slot[i]["kolom"]] = l or ""
+        for dok, h in zip(slot, hash_isi):
+            if h is not None and dok.get("kolom_hash"):
+                data[dok["kolom_hash"]] = h
+
+        nilai_ic, kategori_ic, kategori_residual, nilai_residual, kategori_final = nilai or ("",) * 5
+        data["Nilai Internal Control"]  = nilai_ic
+        data["Tingkat Internal Control"]= kategori_ic
+        data["Tingkat Residual Risk"]   = kategori_residual
+        data["Nilai Residual Risk"]     = nilai_residual
+        data["Tingkat Risiko"]          = kategori_final
+
+        tugas_gagal = ["nilai"] if nilai is None else []
+        tugas_gagal += [nama for nama, l in zip(nama_unggah, link) if l is None]
+        status_validasi = f"Gagal: {', '.join(tugas_gagal)}" if tugas_gagal else STATUS_SELESAI
+        with metrik.waktu("simpan_lokal"):
+            status_simpan, _ = _simpan_baris(masukan, data, status_validasi, path)
+        antrian_kirim.jalankan_flusher(path)
+        return data, status_simpan
+
+    graf = {nama: (tugas_validasi(i), []) for i, nama in enumerate(nama_validasi)}
+    graf["nilai"] = (tugas_nilai, nama_validasi)
+    graf.update({nama: (tugas_unggah(i), []) for i, nama in zip(unggahan, nama_unggah)})
+    graf["simpan"] = (tugas_simpan, ["nilai", *nama_unggah], True)
+
+    lapor(tahap="Validasi & upload dokumen", kemajuan=0.1)
+    hasil, gagal = _jalankan_graf(graf, lapor)
+    if "simpan" in gagal:
+        raise RuntimeError(f"Gagal menyimpan hasil: {gagal['simpan']}")
+    data, status_simpan = hasil["simpan"]
+
+    hasil_dokumen = [hasil.get(nama, {}) for nama in nama_validasi]
+    hasil_dokumen += [{} for _ in slot[len(hasil_dokumen):]]  # slot tanpa validasi (mis. Q2 Kanwil)
+    for i in unggahan:
+        hasil_dokumen[i]["link"] = data[slot[i]["kolom"]]
+    for h, hasil_dok in zip(hash_isi, hasil_dokumen):
+        if h is not None:
+            hasil_dok["sha256"] = h
+
+    return {
+        "nama": data.get("Nama Notaris", ""), "nik": str(data.get("NIK KTP", "")).strip(),
+        "nilai_ic": data["Nilai Internal Control"], "kategori_ic": data["Tingkat Internal Control"],
+        "tingkat_risiko": data["Tingkat Risiko"], "status_simpan": masukan.get("status_simpan", status_simpan),
+        "dokumen": hasil_dokumen, "gagal": gagal,
+    }
+
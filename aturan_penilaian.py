@@ -0,0 +1,108 @@
+"""
+Aturan penilaian risiko (bobot, batas kategori, matriks) dari satu file
+konfigurasi berversi: aturan_penilaian.json (atau PMPJ_ATURAN).
+
+File dibaca lalu dikompilasi sekali menjadi tabel berindeks bilangan bulat;
+muat() hanya membaca ulang bila mtime file berubah, jadi perubahan bobot
+dari kementerian cukup dengan mengganti file (tanpa deploy ulang). Setiap
+hasil penilaian menyimpan `versi` aturan yang dipakai.
+"""
+import json
+import logging
+import os
+import threading
+
+
+PATH_ATURAN = os.environ.get(
+    "PMPJ_ATURAN", os.path.join(os.path.dirname(os.path.abspath(__file__)), "aturan_penilaian.json")
+)
+
+# Bagian bobot yang dinilai dengan "pilihan terbanyak" (kunci di pilihan_default)
+BAGIAN_PILIHAN = ("profil", "bisnis_pengguna", "jasa", "negara")
+
+logger = logging.getLogger(__name__)
+
+_cache = {}   # path -> (mtime_ns, Aturan)
+_kunci = threading.Lock()
+
+
+class Aturan:
+    """Aturan hasil kompilasi; dibuat oleh muat(), jangan diubah."""
+
+    def __init__(self, konfigurasi):
+        self.versi = str(konfigurasi["versi"])
+        self.bobot = konfigurasi["bobot"]                  # dict asli (urutan = urutan pilihan di form)
+        self.pilihan_default = konfigurasi["pilihan_default"]
+        self.skor_wilayah_tetap = int(konfigurasi["skor_wilayah_tetap"])
+
+        # Bobot per bagian: label & skor berindeks posisi
+        self.label = {bagian: tuple(bobot) for bagian, bobot in self.bobot.items()}
+        self.skor = {bagian: tuple(int(s) for s in bobot.values()) for bagian, bobot in self.bobot.items()}
+
+        # Kategori inherent: tabel total skor -> kategori
+        self.di_luar_rentang = konfigurasi["kategori_di_luar_rentang"]
+        self.rentang_inherent = tuple((k, int(bawah), int(atas)) for k, bawah, atas in konfigurasi["kategori_inherent"])
+        self.kategori_per_total = [self.di_luar_rentang] * (max(atas for _, _, atas in self.rentang_inherent) + 1)
+        for kategori, bawah, atas in self.rentang_inherent:
+            for total in range(max(bawah, 0), atas + 1):
+                self.kategori_per_total[total] = kategori
+
+        # Kategori risiko (Rendah..Sangat Tinggi) & nilainya
+        self.nilai_risiko = {k: int(v) for k, v in konfigurasi["nilai_risiko"].items()}
+        self.kategori_risiko = tuple(self.nilai_risiko)
+        self.indeks_risiko = {k: i for i, k in enumerate(self.kategori_risiko)}
+        self.kategori_per_nilai = {v: k for k, v in self.nilai_risiko.items()}
+
+        # Residual: [indeks internal control][indeks inherent]; indeks terakhir = tak dikenal
+        self.residual_default = konfigurasi["kategori_residual_default"]
+        self.kategori_ic = tuple(konfigurasi["matriks_residual"])
+        self.indeks_ic = {k: i for i, k in enumerate(self.kategori_ic)}
+        self.residual = tuple(
+            tuple(konfigurasi["matriks_residual"][ic].get(k, self.residual_default) for k in self.kategori_risiko)
+            + (self.residual_default,)
+            for ic in self.kategori_ic
+        ) + ((self.residual_default,) * (len(self.kategori_risiko) + 1),)
+
+        # Tingkat risiko akhir: [nilai residual][nilai pengguna jasa], None di luar matriks
+        prioritas = {
+            int(r): {int(p): k for p, k in baris.items()} for r, baris in konfigurasi["prioritas_risiko"].items()
+        }
+        self.ukuran_prioritas = max(max(prioritas), max(max(b) for b in prioritas.values())) + 1
+        self.prioritas = tuple(
+            tuple(prioritas.get(r, {}).get(p) for p in range(self.ukuran_prioritas))
+            for r in range(self.ukuran_prioritas)
+        )
+
+        self.batas_klien = tuple(konfigurasi["batas_klien"])
+
+        # Tabel turunan (mis. array numpy di penilaian_massal.py), dibuat sekali per versi
+        self.turunan = {}
+
+
+def muat(path=PATH_ATURAN):
+    """
+    Aturan terkini. Dibaca & dikompilasi ulang hanya bila mtime file berubah;
+    bila file baru rusak, aturan sebelumnya tetap dipakai.
+    """
+    mtime = os.stat(path).st_mtime_ns
+    tersimpan = _cache.get(path)
+    if tersimpan is not None and tersimpan[0] == mtime:
+        return tersimpan[1]
+
+    with _kunci:
+        tersimpan = _cache.get(path)
+        if tersimpan is not None and tersimpan[0] == mtime:
+            return tersimpan[1]
+        try:
+            with open(path, encoding="utf-8") as f:
+                aturan = Aturan(json.load(f))
+        except (ValueError, KeyError, TypeError) as e:
+            if tersimpan is None:
+                raise
+            logger.error("Aturan penilaian %s tidak valid, tetap memakai versi %s: %s", path, tersimpan[1].versi, e)
+            _cache[path] = (mtime, tersimpan[1])
+            return tersimpan[1]
+        if tersimpan is not None and tersimpan[1].versi != aturan.versi:
+            logger.info("Aturan penilaian diperbarui: versi %s -> %s", tersimpan[1].versi, aturan.versi)
+        _cache[path] = (mtime, aturan)
+        return aturan
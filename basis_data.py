@@ -0,0 +1,324 @@
+"""
+Basis data lokal (SQLite) sebagai sumber utama hasil penilaian.
+
+Setiap submit di-upsert ke tabel `penilaian` berdasarkan kunci dedup
+(NIK, opsional + nama). Cek duplikat, pembacaan dan laporan berjalan di disk
+lokal; Google Sheets hanya cerminan yang diperbarui oleh job sinkronisasi
+(antrian_kirim.py). Setiap perubahan menaikkan `versi`; baris dengan
+versi > versi_tersinkron adalah baris yang belum dicerminkan ke sheet.
+Tabel `pekerjaan` menyimpan antrian validasi dokumen (antrian_validasi.py);
+tabel `berkas_drive` memetakan SHA-256 isi dokumen ke file Drive (unggah_drive.py).
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+import penyimpanan
+
+
+PATH_DB = os.path.join("data", "pmpj.sqlite")
+BACKOFF_MAKS = 300.0   # detik
+
+_SKEMA = """
+    CREATE TABLE IF NOT EXISTS target_sheet (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        spesifikasi TEXT NOT NULL UNIQUE,
+        percobaan INTEGER NOT NULL DEFAULT 0,
+        coba_lagi_pada REAL NOT NULL DEFAULT 0,
+        error TEXT
+    );
+    CREATE TABLE IF NOT EXISTS penilaian (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        target_id INTEGER NOT NULL REFERENCES target_sheet (id),
+        kunci TEXT,
+        nik TEXT,
+        nama TEXT,
+        data TEXT NOT NULL,
+        dibuat REAL NOT NULL,
+        diubah REAL NOT NULL,
+        versi INTEGER NOT NULL DEFAULT 1,
+        versi_tersinkron INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_penilaian_kunci ON penilaian (target_id, kunci);
+    CREATE INDEX IF NOT EXISTS idx_penilaian_nik ON penilaian (nik);
+    CREATE INDEX IF NOT EXISTS idx_penilaian_belum_sinkron
+        ON penilaian (target_id, id) WHERE versi > versi_tersinkron;
+    CREATE TABLE IF NOT EXISTS pekerjaan (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        jenis TEXT NOT NULL,
+        masukan TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'menunggu',
+        tahap TEXT,
+        kemajuan REAL NOT NULL DEFAULT 0,
+        pesan TEXT NOT NULL DEFAULT '[]',
+        hasil TEXT,
+        error TEXT,
+        dibuat REAL NOT NULL,
+        diubah REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_pekerjaan_status ON pekerjaan (status, id);
+    CREATE TABLE IF NOT EXISTS berkas_drive (
+        sha256 TEXT NOT NULL,
+        folder_id TEXT NOT NULL,
+        file_id TEXT NOT NULL,
+        link TEXT NOT NULL,
+        ukuran INTEGER NOT NULL,
+        dibuat REAL NOT NULL,
+        PRIMARY KEY (sha256, folder_id)
+    );
+"""
+
+
+_skema_siap = set()   # path absolut basis data yang skemanya sudah dibuat di proses ini
+_kunci_skema = threading.Lock()
+
+
+def buka(path=PATH_DB):
+    """
+    Koneksi baru ke basis data. Skema dibuat sekali per proses per file (atau
+    lagi bila file belum ada), di koneksi baru sebelum transaksi apa pun,
+    karena executescript() meng-commit transaksi yang sedang terbuka.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    kunci = os.path.abspath(path)
+    baru = not os.path.exists(path)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=FULL")
+    if baru or kunci not in _skema_siap:
+        with _kunci_skema:
+            conn.executescript(_SKEMA)
+            _skema_siap.add(kunci)
+    return conn
+
+
+def buat_target(sumber, column_order, kolom_kunci, kunci=None, nama=None):
+    """Tujuan cermin: spreadsheet (ID / nama) + urutan kolom + kolom kunci dedup."""
+    return {
+        "sumber": sumber, "kunci": kunci, "nama": nama,
+        "column_order": list(column_order), "kolom_kunci": list(kolom_kunci)
+    }
+
+
+def _id_target(conn, target):
+    spesifikasi = json.dumps(target, sort_keys=True)
+    conn.execute("INSERT OR IGNORE INTO target_sheet (spesifikasi) VALUES (?)", (spesifikasi,))
+    return conn.execute("SELECT id FROM target_sheet WHERE spesifikasi = ?", (spesifikasi,)).fetchone()[0]
+
+
+def simpan(target, data, path=PATH_DB, id_=None):
+    """
+    Upsert satu hasil penilaian berdasarkan kunci dedup target (atau `id_`
+    baris yang sudah ada, mis. baris dasar yang ditulis saat submit).
+    Mengembalikan (status, id) dengan status 'baru' atau 'diganti'.
+    """
+    kunci = penyimpanan.kunci_dari_data(data, target["kolom_kunci"])
+    kunci_teks = "\x1f".join(kunci) if all(kunci) else None
+    sekarang = time.time()
+    data_json = json.dumps(data, default=str)
+    nik = str(data.get("NIK KTP", "")).strip()
+    nama = str(data.get("Nama Notaris", "")).strip().lower()
+
+    with closing(buka(path)) as conn, conn:
+        # Kunci tulis sejak awal agar dua submit NIK yang sama tidak sama-sama insert
+        conn.execute("BEGIN IMMEDIATE")
+        target_id = _id_target(conn, target)
+        row = None
+        if id_ is not None:
+            row = conn.execute(
+                "SELECT id FROM penilaian WHERE target_id = ? AND id = ?", (target_id, id_)
+            ).fetchone()
+        if row is None and kunci_teks is not None:
+            row = conn.execute(
+                "SELECT id FROM penilaian WHERE target_id = ? AND kunci = ?", (target_id, kunci_teks)
+            ).fetchone()
+        if row:
+            conn.execute(
+                "UPDATE penilaian SET data = ?, nik = ?, nama = ?, diubah = ?, versi = versi + 1 WHERE id = ?",
+                (data_json, nik, nama, sekarang, row[0])
+            )
+            return "diganti", row[0]
+        cur = conn.execute(
+            "INSERT INTO penilaian (target_id, kunci, nik, nama, data, dibuat, diubah) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (target_id, kunci_teks, nik, nama, data_json, sekarang, sekarang)
+        )
+        return "baru", cur.lastrowid
+
+
+# --- Pendukung sinkronisasi ke Google Sheets ---
+def jumlah_belum_tersinkron(path=PATH_DB):
+    with closing(buka(path)) as conn:
+        return conn.execute(
+            "SELECT COUNT(*) FROM penilaian WHERE versi > versi_tersinkron"
+        ).fetchone()[0]
+
+
+def belum_tersinkron(batas, path=PATH_DB):
+    """
+    Baris yang belum dicerminkan, per target yang sudah jatuh tempo.
+    Mengembalikan list (target_id, target, [(id, versi, data), ...]).
+    """
+    with closing(buka(path)) as conn:
+        targets = conn.execute(
+            "SELECT id, spesifikasi FROM target_sheet WHERE coba_lagi_pada <= ?", (time.time(),)
+        ).fetchall()
+        hasil = []
+        for target_id, spesifikasi in targets:
+            rows = conn.execute(
+                "SELECT id, versi, data FROM penilaian "
+                "WHERE target_id = ? AND versi > versi_tersinkron ORDER BY id LIMIT ?",
+                (target_id, batas)
+            ).fetchall()
+            if rows:
+                hasil.append((
+                    target_id, json.loads(spesifikasi),
+                    [(id_, versi, json.loads(data)) for id_, versi, data in rows]
+                ))
+    return hasil
+
+
+def tandai_tersinkron(target_id, id_versi, path=PATH_DB):
+    """Catat versi yang sudah ada di sheet; perubahan sesudahnya tetap tertunda."""
+    with closing(buka(path)) as conn, conn:
+        conn.executemany(
+            "UPDATE penilaian SET versi_tersinkron = ? WHERE id = ? AND versi_tersinkron < ?",
+            [(versi, id_, versi) for id_, versi in id_versi]
+        )
+        conn.execute(
+            "UPDATE target_sheet SET percobaan = 0, coba_lagi_pada = 0, error = NULL WHERE id = ?",
+            (target_id,)
+        )
+
+
+def catat_gagal(target_id, error, path=PATH_DB):
+    """Tunda target dengan backoff eksponensial setelah sinkronisasi gagal."""
+    with closing(buka(path)) as conn, conn:
+        percobaan = conn.execute(
+            "SELECT percobaan FROM target_sheet WHERE id = ?", (target_id,)
+        ).fetchone()[0] + 1
+        conn.execute(
+            "UPDATE target_sheet SET percobaan = ?, coba_lagi_pada = ?, error = ? WHERE id = ?",
+            (percobaan, time.time() + min(2 ** percobaan, BACKOFF_MAKS), error, target_id)
+        )
+
+
+def jatuh_tempo_berikutnya(path=PATH_DB):
+    """Waktu (epoch) paling awal sebuah target dengan baris tertunda boleh dicoba lagi."""
+    with closing(buka(path)) as conn:
+        return conn.execute(
+            "SELECT MIN(t.coba_lagi_pada) FROM target_sheet t "
+            "WHERE EXISTS (SELECT 1 FROM penilaian p WHERE p.target_id = t.id AND p.versi > p.versi_tersinkron)"
+        ).fetchone()[0]
+
+
+# --- Antrian pekerjaan validasi dokumen ---
+def buat_pekerjaan(jenis, masukan, path=PATH_DB):
+    """Catat pekerjaan baru berstatus 'menunggu'; mengembalikan id."""
+    sekarang = time.time()
+    with closing(buka(path)) as conn, conn:
+        cur = conn.execute(
+            "INSERT INTO pekerjaan (jenis, masukan, dibuat, diubah) VALUES (?, ?, ?, ?)",
+            (jenis, json.dumps(masukan, default=str), sekarang, sekarang)
+        )
+        return cur.lastrowid
+
+
+def klaim_pekerjaan(id_, path=PATH_DB):
+    """
+    Ubah status 'menunggu' -> 'berjalan' secara atomik.
+    Mengembalikan (jenis, masukan, waktu dibuat), atau None jika sudah diambil worker lain.
+    """
+    with closing(buka(path)) as conn, conn:
+        cur = conn.execute(
+            "UPDATE pekerjaan SET status = 'berjalan', diubah = ? WHERE id = ? AND status = 'menunggu'",
+            (time.time(), id_)
+        )
+        if cur.rowcount == 0:
+            return None
+        jenis, masukan, dibuat = conn.execute(
+            "SELECT jenis, masukan, dibuat FROM pekerjaan WHERE id = ?", (id_,)
+        ).fetchone()
+    return jenis, json.loads(masukan), dibuat
+
+
+def perbarui_pekerjaan(id_, tahap=None, kemajuan=None, pesan=None, path=PATH_DB):
+    """Catat tahap/progres (0..1) dan tambahkan pesan untuk ditampilkan di form."""
+    with closing(buka(path)) as conn, conn:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute("SELECT tahap, kemajuan, pesan FROM pekerjaan WHERE id = ?", (id_,)).fetchone()
+        if row is None:
+            return
+        daftar_pesan = json.loads(row[2]) + ([pesan] if pesan else [])
+        conn.execute(
+            "UPDATE pekerjaan SET tahap = ?, kemajuan = ?, pesan = ?, diubah = ? WHERE id = ?",
+            (tahap if tahap is not None else row[0], kemajuan if kemajuan is not None else row[1],
+             json.dumps(daftar_pesan), time.time(), id_)
+        )
+
+
+def selesaikan_pekerjaan(id_, hasil=None, error=None, path=PATH_DB):
+    """Tandai pekerjaan 'selesai' (dengan hasil) atau 'gagal' (dengan error)."""
+    with closing(buka(path)) as conn, conn:
+        conn.execute(
+            "UPDATE pekerjaan SET status = ?, kemajuan = 1, hasil = ?, error = ?, diubah = ? WHERE id = ?",
+            ("gagal" if error else "selesai", json.dumps(hasil, default=str), error, time.time(), id_)
+        )
+
+
+def ambil_pekerjaan(id_, path=PATH_DB):
+    """Status satu pekerjaan sebagai dict, atau None jika id tidak dikenal."""
+    with closing(buka(path)) as conn:
+        row = conn.execute(
+            "SELECT jenis, status, tahap, kemajuan, pesan, hasil, error, dibuat, diubah "
+            "FROM pekerjaan WHERE id = ?", (id_,)
+        ).fetchone()
+    if row is None:
+        return None
+    jenis, status, tahap, kemajuan, pesan, hasil, error, dibuat, diubah = row
+    return {
+        "id": id_, "jenis": jenis, "status": status, "tahap": tahap, "kemajuan": kemajuan,
+        "pesan": json.loads(pesan), "hasil": json.loads(hasil) if hasil else None,
+        "error": error, "dibuat": dibuat, "diubah": diubah
+    }
+
+
+def pekerjaan_tertunda(batas_macet, path=PATH_DB):
+    """
+    Id pekerjaan yang perlu (di)jalankan: 'menunggu', atau 'berjalan' tanpa
+    kabar selama `batas_macet` detik (worker terputus, mis. server restart).
+    Pekerjaan macet dikembalikan ke 'menunggu' agar bisa diklaim lagi.
+    """
+    with closing(buka(path)) as conn, conn:
+        conn.execute(
+            "UPDATE pekerjaan SET status = 'menunggu' WHERE status = 'berjalan' AND diubah < ?",
+            (time.time() - batas_macet,)
+        )
+        rows = conn.execute("SELECT id FROM pekerjaan WHERE status = 'menunggu' ORDER BY id").fetchall()
+    return [r[0] for r in rows]
+
+
+# --- Indeks isi dokumen (SHA-256) -> file di Google Drive ---
+def cari_berkas_drive(sha256, folder_id, path=PATH_DB):
+    """(file_id, link) file Drive dengan isi yang sama di folder itu, atau None."""
+    with closing(buka(path)) as conn:
+        return conn.execute(
+            "SELECT file_id, link FROM berkas_drive WHERE sha256 = ? AND folder_id = ?", (sha256, folder_id)
+        ).fetchone()
+
+
+def simpan_berkas_drive(sha256, folder_id, file_id, link, ukuran, path=PATH_DB):
+    with closing(buka(path)) as conn, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO berkas_drive VALUES (?, ?, ?, ?, ?, ?)",
+            (sha256, folder_id, file_id, link, ukuran, time.time())
+        )
+
+
+def lupakan_berkas_drive(file_id, path=PATH_DB):
+    """Hapus entri indeks untuk file Drive yang sudah dihapus / dipindah."""
+    with closing(buka(path)) as conn, conn:
+        conn.execute("DELETE FROM berkas_drive WHERE file_id = ?", (file_id,))
@@ -0,0 +1,14 @@
+"""
+Benchmark jalur panas penilaian & validasi dokumen (tanpa Streamlit/Google).
+
+Jalankan dari root repo:
+    python -m benchmarks.jalankan                    # profil cepat, bandingkan dengan baseline
+    python -m benchmarks.jalankan --profil lengkap   # termasuk PDF 200 halaman & 100k baris
+    python -m benchmarks.jalankan --simpan-baseline  # jadikan hasil sekarang baseline
+
+Uji beban submit bersamaan terhadap Google Sheets/Drive tiruan (google_palsu.py):
+    python -m benchmarks.beban --notaris 50 --laju-429 0.05
+
+Anggaran waktu import saat start & rerun skrip Streamlit (-X importtime):
+    python -m benchmarks.impor --anggaran-dingin-ms 150 --anggaran-rerun-ms 2
+"""
@@ -0,0 +1,302 @@
+"""
+Uji beban jalur submit: N notaris mengirim form lengkap (beserta 2 PDF)
+bersamaan, terhadap Google Sheets/Drive tiruan (google_palsu.py).
+
+Setiap notaris menjalankan apa yang dilakukan stkanwil.py saat tombol submit
+ditekan: simpan PDF ke uploads/, bangun masukan dengan
+antrian_validasi.masukan_kanwil (baris, inherent risk, kata kunci yang sama
+dengan form), lalu antrian_validasi.kirim. Setelah semua pekerjaan selesai dan outbox kosong,
+isi spreadsheet tiruan diperiksa: baris yang hilang atau terduplikasi (per
+NIK), serta jumlah file di Drive.
+
+Jalankan dari root repo (basis data & uploads dibuat di folder sementara):
+    python -m benchmarks.beban --notaris 50
+    python -m benchmarks.beban --notaris 100 --kuota 60 --laju-429 0.05 --duplikat 0.2
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import aturan_penilaian
+import koneksi_google
+import kuisioner
+from benchmarks import fixture
+
+
+JENIS_FORM = "kanwil"   # = antrian_validasi.JENIS_KANWIL, form stkanwil.py
+KUNCI_SPREADSHEET = "spreadsheet-uji-beban"
+FOLDER_DRIVE = "folder-uji-beban"
+
+
+def persentil(nilai, p):
+    """Persentil dengan interpolasi linear (nilai tidak perlu terurut)."""
+    if not nilai:
+        return None
+    urut = sorted(nilai)
+    posisi = (len(urut) - 1) * p / 100
+    bawah = int(posisi)
+    atas = min(bawah + 1, len(urut) - 1)
+    return urut[bawah] + (urut[atas] - urut[bawah]) * (posisi - bawah)
+
+
+def ringkas(nilai):
+    return {
+        "p50": persentil(nilai, 50), "p95": persentil(nilai, 95), "p99": persentil(nilai, 99),
+        "maks": max(nilai) if nilai else None,
+    }
+
+
+# --- Form satu notaris ---
+def jawaban_form(baris, aturan):
+    """Jawaban form (bentuk form_kuisioner.jawaban) dari satu baris fixture.data_submit."""
+    identitas = {f["kolom"]: "-" for f in kuisioner.FORM[JENIS_FORM]["identitas"]}
+    identitas.update({
+        kuisioner.KOLOM_NAMA: baris[kuisioner.KOLOM_NAMA], kuisioner.KOLOM_NIK: baris[kuisioner.KOLOM_NIK],
+        kuisioner.KOLOM_WILAYAH: baris[kuisioner.KOLOM_WILAYAH],
+    })
+    return {
+        "identitas": identitas,
+        "jumlah": {
+            b["bagian"]: {opsi: baris.get(opsi, 0) for opsi in aturan.bobot[b["bagian"]]}
+            for b in kuisioner.BAGIAN_JUMLAH
+        },
+        "apgakkum": baris[kuisioner.KOLOM_APGAKKUM],
+        "pertanyaan": {p["kolom"]: "YA" for p in kuisioner.PERTANYAAN},
+        "berkas": [None] * len(kuisioner.DOKUMEN),
+    }
+
+
+def masukan_form(baris, percobaan, pdf, aturan, target):
+    """Masukan antrian_validasi.kirim untuk satu submit, dibangun seperti form stkanwil.py (PDF ditulis ke uploads/)."""
+    import antrian_validasi
+
+    dokumen = []
+    for i, isi in enumerate(pdf, start=1):
+        path = os.path.join("uploads", f"{baris['NIK KTP']}_{percobaan}_q{i}.pdf")
+        with open(path, "wb") as f:
+            f.write(isi)
+        dokumen.append((path, os.path.basename(path)))
+    return antrian_validasi.masukan_kanwil(
+        jawaban_form(baris, aturan), aturan, target, dokumen, koneksi_google.SUMBER_OAUTH, FOLDER_DRIVE
+    )
+
+
+# --- Uji beban ---
+def jalankan(jumlah_notaris, duplikat=0.0, halaman=3, batas_waktu=600.0, interval_cek=0.05,
+             template_bersama=False):
+    """
+    Jalankan uji beban di folder kerja saat ini (harus sudah berisi uploads/).
+    Setiap notaris punya PDF sendiri, kecuali `template_bersama` (semua
+    kantor mengirim file yang sama). Mengembalikan dict laporan.
+    """
+    import antrian_kirim
+    import antrian_validasi
+    import basis_data
+    import google_palsu
+
+    aturan = aturan_penilaian.muat()
+    target = basis_data.buat_target(
+        koneksi_google.SUMBER_OAUTH, kuisioner.column_order(JENIS_FORM, aturan), [kuisioner.KOLOM_NIK],
+        kunci=KUNCI_SPREADSHEET
+    )
+    baris_notaris = fixture.data_submit(jumlah_notaris, seed=19, aturan=aturan)
+    if template_bersama:
+        pdf = [(fixture.pdf_digital(halaman, "Q1"), fixture.pdf_digital(halaman, "Q2"))] * jumlah_notaris
+    else:
+        pdf = [(fixture.pdf_digital(halaman, "Q1", seed=i), fixture.pdf_digital(halaman, "Q2", seed=i))
+               for i in range(jumlah_notaris)]
+
+    # Sebagian notaris mengirim ulang form yang sama (upsert per NIK)
+    jumlah_ulang = int(round(jumlah_notaris * duplikat))
+    submit = [(i, 1) for i in range(jumlah_notaris)] + [(i, 2) for i in range(jumlah_ulang)]
+
+    hasil = [None] * len(submit)
+    mulai_bersama = threading.Barrier(len(submit))
+
+    def notaris(i, nomor, percobaan):
+        mulai_bersama.wait()
+        t0 = time.perf_counter()
+        try:
+            id_ = antrian_validasi.kirim(
+                antrian_validasi.JENIS_KANWIL,
+                masukan_form(baris_notaris[nomor], percobaan, pdf[nomor], aturan, target)
+            )
+        except Exception as e:
+            hasil[i] = {"error": f"submit: {e}"}
+            return
+        t_kirim = time.perf_counter()
+        batas = t0 + batas_waktu
+        while time.perf_counter() < batas:
+            pekerjaan = antrian_validasi.status(id_)
+            if pekerjaan["status"] in ("selesai", "gagal"):
+                hasil[i] = {
+                    "submit": t_kirim - t0, "selesai": time.perf_counter() - t0,
+                    "error": pekerjaan["error"], "hasil": pekerjaan["hasil"],
+                }
+                return
+            time.sleep(interval_cek)
+        hasil[i] = {"submit": t_kirim - t0, "error": "batas waktu habis"}
+
+    threads = [
+        threading.Thread(target=notaris, args=(i, n, p), name=f"notaris-{i}") for i, (n, p) in enumerate(submit)
+    ]
+    t_mulai = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    t_validasi = time.perf_counter()
+
+    # Tunggu outbox kosong (flusher memakai backoff bila kena 429)
+    antrian_kirim.jalankan_flusher()
+    batas = t_mulai + batas_waktu
+    while basis_data.jumlah_belum_tersinkron() and time.perf_counter() < batas:
+        time.sleep(interval_cek)
+    t_sinkron = time.perf_counter()
+
+    return _laporan(
+        [(baris_notaris[n], p) for n, p in submit], hasil, google_palsu, jumlah_notaris,
+        durasi_validasi=t_validasi - t_mulai, durasi_total=t_sinkron - t_mulai,
+        belum_tersinkron=basis_data.jumlah_belum_tersinkron(),
+    )
+
+
+def _laporan(submit, hasil, google_palsu, jumlah_notaris, durasi_validasi, durasi_total, belum_tersinkron):
+    sukses = [h for h in hasil if h and not h.get("error")]
+    gagal = [h["error"] for h in hasil if h and h.get("error")]
+
+    # Isi spreadsheet tiruan: hitung kemunculan tiap NIK
+    spreadsheet = google_palsu.CLIENT.spreadsheet(KUNCI_SPREADSHEET)
+    nilai = spreadsheet.sheet1.nilai if spreadsheet else []
+    kemunculan = {}
+    if nilai:
+        kolom_nik = nilai[0].index("NIK KTP")
+        for b in nilai[1:]:
+            if len(b) > kolom_nik and b[kolom_nik]:
+                kemunculan[b[kolom_nik]] = kemunculan.get(b[kolom_nik], 0) + 1
+    diharapkan = {b["NIK KTP"] for b, _ in submit}
+    hilang = sorted(diharapkan - set(kemunculan))
+    duplikat = sorted(nik for nik, n in kemunculan.items() if n > 1)
+
+    # Setiap dokumen di sheet harus punya link file Drive (upload gagal = kolom kosong)
+    link_kosong = 0
+    if nilai:
+        indeks_dokumen = [nilai[0].index(d["kolom"]) for d in kuisioner.DOKUMEN if d["kolom"] in nilai[0]]
+        link_kosong = sum(
+            1 for b in nilai[1:] for i in indeks_dokumen if len(b) > i and not b[i].startswith("https://")
+        )
+    with google_palsu.DRIVE.kunci:
+        berkas = [b for b in google_palsu.DRIVE.berkas.values() if not b.get("folder")]
+
+    return {
+        "notaris": jumlah_notaris,
+        "submit": len(submit),
+        "sukses": len(sukses),
+        "gagal": len(gagal),
+        "contoh_error": gagal[:3],
+        "durasi_validasi_detik": durasi_validasi,
+        "durasi_total_detik": durasi_total,
+        "throughput_per_detik": len(sukses) / durasi_total if durasi_total else None,
+        "latensi_submit_detik": ringkas([h["submit"] for h in hasil if h and "submit" in h]),
+        "latensi_selesai_detik": ringkas([h["selesai"] for h in sukses]),
+        "baris_sheet": max(len(nilai) - 1, 0),
+        "baris_hilang": len(hilang),
+        "baris_duplikat": len(duplikat),
+        "contoh_hilang": hilang[:5],
+        "contoh_duplikat": duplikat[:5],
+        "belum_tersinkron": belum_tersinkron,
+        "file_drive": len(berkas),
+        "file_drive_tanpa_izin": sum(1 for b in berkas if not google_palsu.DRIVE.publik(b["id"])),
+        "link_dokumen_kosong": link_kosong,
+        "request_google": google_palsu.statistik(),
+    }
+
+
+def _cetak(laporan):
+    def detik(x):
+        return "-" if x is None else f"{x:.3f}"
+
+    print(f"Submit            : {laporan['submit']} ({laporan['notaris']} notaris), "
+          f"sukses {laporan['sukses']}, gagal {laporan['gagal']}")
+    for e in laporan["contoh_error"]:
+        print(f"  error           : {e}")
+    print(f"Durasi            : validasi {laporan['durasi_validasi_detik']:.2f}s, "
+          f"sampai tersinkron {laporan['durasi_total_detik']:.2f}s")
+    print(f"Throughput        : {laporan['throughput_per_detik'] or 0:.2f} submit/detik")
+    for nama, kunci in (("Latensi submit", "latensi_submit_detik"), ("Latensi selesai", "latensi_selesai_detik")):
+        r = laporan[kunci]
+        print(f"{nama:<18}: p50 {detik(r['p50'])}s  p95 {detik(r['p95'])}s  "
+              f"p99 {detik(r['p99'])}s  maks {detik(r['maks'])}s")
+    print(f"Baris sheet       : {laporan['baris_sheet']} (hilang {laporan['baris_hilang']}, "
+          f"duplikat {laporan['baris_duplikat']}, belum tersinkron {laporan['belum_tersinkron']})")
+    print(f"File Drive        : {laporan['file_drive']} (tanpa izin {laporan['file_drive_tanpa_izin']}, "
+          f"link kosong di sheet {laporan['link_dokumen_kosong']})")
+    r = laporan["request_google"]
+    print(f"Request Google    : sheets {r['sheets']}, drive {r['drive']}, ditolak 429 {r['ditolak_429']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--notaris", type=int, default=20, help="jumlah notaris yang submit bersamaan")
+    parser.add_argument("--duplikat", type=float, default=0.0,
+                        help="porsi notaris yang submit ulang form yang sama (0-1)")
+    parser.add_argument("--halaman", type=int, default=3, help="halaman per PDF")
+    parser.add_argument("--worker", type=int, help="jumlah worker validasi (default PMPJ_WORKER_VALIDASI)")
+    parser.add_argument("--latensi", type=float, help="detik per request Google tiruan")
+    parser.add_argument("--jitter", type=float, help="variasi acak latensi, detik")
+    parser.add_argument("--kuota", type=int, help="request per menit per layanan (0 = tanpa batas)")
+    parser.add_argument("--laju-429", type=float, help="peluang request ditolak 429")
+    parser.add_argument("--template-bersama", action="store_true",
+                        help="semua notaris mengirim PDF yang sama (uji dedup upload Drive)")
+    parser.add_argument("--folder-publik", action="store_true",
+                        help="folder Drive tujuan sudah dibagikan publik (izin diwarisi file)")
+    parser.add_argument("--chunk-kb", type=int, help="ukuran chunk resumable upload, KiB (kelipatan 256)")
+    parser.add_argument("--batas-waktu", type=float, default=600.0, help="detik maksimal uji")
+    parser.add_argument("--keluaran", help="simpan laporan JSON ke file ini")
+    args = parser.parse_args(argv)
+
+    # Semua akses Google lewat tiruan di proses ini
+    koneksi_google.PAKAI_PALSU = True
+    import antrian_validasi
+    import google_palsu
+    import unggah_drive
+
+    pengaturan = {
+        k: v for k, v in (
+            ("latensi", args.latensi), ("jitter", args.jitter), ("kuota", args.kuota), ("laju_429", args.laju_429)
+        ) if v is not None
+    }
+    google_palsu.atur(**pengaturan)
+    if args.worker:
+        antrian_validasi.JUMLAH_WORKER = args.worker
+    if args.folder_publik:
+        google_palsu.DRIVE.buat_folder(FOLDER_DRIVE, publik=True)
+    if args.chunk_kb:
+        unggah_drive.UKURAN_CHUNK = args.chunk_kb * 1024
+
+    keluaran = os.path.abspath(args.keluaran) if args.keluaran else None
+    asal = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="pmpj-beban-") as folder:
+        os.chdir(folder)
+        try:
+            os.makedirs("uploads")
+            laporan = jalankan(
+                args.notaris, args.duplikat, args.halaman, args.batas_waktu, template_bersama=args.template_bersama
+            )
+        finally:
+            os.chdir(asal)
+
+    _cetak(laporan)
+    if keluaran:
+        with open(keluaran, "w", encoding="utf-8") as f:
+            json.dump(laporan, f, indent=2, ensure_ascii=False)
+    masalah = laporan["gagal"] or laporan["baris_hilang"] or laporan["baris_duplikat"] or laporan["belum_tersinkron"]
+    return 1 if masalah else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""
+Pembuat data uji benchmark: PDF digital (ber-text layer), PDF "scan"
+(halaman berupa gambar), teks OCR yang berisik dan tabel hasil penilaian.
+Semua deterministik (seed tetap) supaya hasil antar-run bisa dibandingkan.
+"""
+import io
+import random
+import zlib
+
+import aturan_penilaian
+
+
+# --- Teks dokumen ---
+PARAGRAF_Q1 = [
+    "FORMULIR CUSTOMER DUE DILIGENCE PERORANGAN",
+    "Enhanced Due Diligence (EDD) untuk pengguna jasa berisiko tinggi",
+    "Analisis risiko pengguna jasa berdasarkan profil, bisnis dan negara",
+    "Nama lengkap, NIK, alamat, pekerjaan dan sumber dana pengguna jasa",
+]
+PARAGRAF_Q2 = [
+    "STANDAR OPERASIONAL PROSEDUR (SOP) PENERAPAN PMPJ",
+    "Kebijakan pengendalian intern dan mitigasi risiko pencucian uang",
+    "Sesuai pasal 17 Permkham Nomor 9 Tahun 2017 tentang PMPJ",
+]
+KATA_ISIAN = (
+    "notaris akta pengguna jasa transaksi dokumen identitas kantor klien laporan "
+    "pemeriksaan tanggal nomor pihak pembayaran perjanjian kuasa wilayah kewajiban"
+).split()
+
+
+def teks_halaman(nomor, tipe="Q1", baris=40, seed=0):
+    """Teks satu halaman: judul sesuai tipe di halaman pertama, sisanya kalimat isian."""
+    rnd = random.Random(seed * 100003 + nomor)
+    hasil = list(PARAGRAF_Q1 if tipe == "Q1" else PARAGRAF_Q2) if nomor == 1 else []
+    while len(hasil) < baris:
+        hasil.append(" ".join(rnd.choice(KATA_ISIAN) for _ in range(rnd.randint(6, 12))))
+    return hasil
+
+
+def teks_ocr_bising(panjang, laju_galat=0.08, seed=0):
+    """Teks mirip hasil OCR: huruf tertukar (l/1, o/0, rn/m), huruf hilang, spasi nyasar."""
+    rnd = random.Random(seed)
+    salah_baca = {"l": "1", "o": "0", "i": "l", "e": "c", "a": "o", "s": "5", "m": "rn"}
+    kata = []
+    total = 0
+    while total < panjang:
+        w = rnd.choice(KATA_ISIAN)
+        huruf = []
+        for c in w:
+            r = rnd.random()
+            if r < laju_galat / 3:
+                continue                                  # huruf hilang
+            if r < laju_galat and c in salah_baca:
+                huruf.append(salah_baca[c])               # salah baca
+            else:
+                huruf.append(c)
+            if rnd.random() < laju_galat / 4:
+                huruf.append(" ")                         # spasi di tengah kata
+        kata.append("".join(huruf))
+        total += len(kata[-1]) + 1
+    return " ".join(kata)[:panjang]
+
+
+# --- PDF digital (text layer, tanpa dependensi tambahan) ---
+def _escape_pdf(teks):
+    return teks.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def pdf_digital(jumlah_halaman, tipe="Q1", seed=0):
+    """PDF A4 dengan text layer (font Helvetica), satu halaman = teks_halaman()."""
+    objek = {1: b"<< /Type /Catalog /Pages 2 0 R >>", 3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+    kids = []
+    for nomor in range(1, jumlah_halaman + 1):
+        id_halaman, id_isi = 2 + 2 * nomor, 3 + 2 * nomor
+        perintah = ["BT", "/F1 10 Tf", "12 TL", "50 800 Td"]
+        for baris in teks_halaman(nomor, tipe, seed=seed):
+            perintah.append(f"({_escape_pdf(baris)}) Tj T*")
+        perintah.append("ET")
+        isi = zlib.compress("\n".join(perintah).encode("latin-1"))
+        objek[id_isi] = b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(isi) + isi + b"\nendstream"
+        objek[id_halaman] = (
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % id_isi
+        )
+        kids.append(b"%d 0 R" % id_halaman)
+    objek[2] = b"<< /Type /Pages /Kids [" + b" ".join(kids) + b"] /Count %d >>" % jumlah_halaman
+    return _tulis_pdf(objek)
+
+
+def _tulis_pdf(objek):
+    keluaran = io.BytesIO()
+    keluaran.write(b"%PDF-1.4\n")
+    offset = {}
+    for nomor in sorted(objek):
+        offset[nomor] = keluaran.tell()
+        keluaran.write(b"%d 0 obj\n" % nomor + objek[nomor] + b"\nendobj\n")
+    awal_xref = keluaran.tell()
+    jumlah = max(objek) + 1
+    keluaran.write(b"xref\n0 %d\n0000000000 65535 f \n" % jumlah)
+    for nomor in range(1, jumlah):
+        keluaran.write(b"%010d 00000 n \n" % offset.get(nomor, 0))
+    keluaran.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (jumlah, awal_xref))
+    return keluaran.getvalue()
+
+
+# --- PDF hasil scan (halaman gambar) ---
+def pdf_scan(jumlah_halaman, tipe="Q1", dpi=150, seed=0):
+    """
+    PDF berisi gambar halaman (tanpa text layer) dengan bintik noise, seperti hasil
+    scan. Paling banyak 3 gambar berbeda dipakai bergantian agar memori tetap kecil.
+    """
+    from PIL import Image, ImageDraw, ImageFont
+
+    lebar, tinggi = int(8.27 * dpi), int(11.69 * dpi)
+    try:
+        font = ImageFont.load_default(size=max(dpi // 9, 10))
+    except TypeError:   # Pillow lama: hanya font bitmap kecil
+        font = ImageFont.load_default()
+
+    def gambar(nomor):
+        rnd = random.Random(seed * 100003 + nomor)
+        img = Image.new("L", (lebar, tinggi), 255)
+        draw = ImageDraw.Draw(img)
+        y = dpi // 2
+        for baris in teks_halaman(nomor, tipe, seed=seed):
+            draw.text((dpi // 2, y), baris, fill=rnd.randint(0, 60), font=font)
+            y += dpi // 6
+            if y > tinggi - dpi // 2:
+                break
+        for _ in range(lebar * tinggi // 2000):
+            draw.point((rnd.randrange(lebar), rnd.randrange(tinggi)), fill=rnd.randint(0, 200))
+        return img
+
+    unik = [gambar(n) for n in range(1, min(jumlah_halaman, 3) + 1)]
+    halaman = [unik[i % len(unik)] for i in range(jumlah_halaman)]
+    keluaran = io.BytesIO()
+    halaman[0].save(keluaran, "PDF", save_all=True, append_images=halaman[1:], resolution=dpi)
+    return keluaran.getvalue()
+
+
+# --- Tabel hasil penilaian ---
+def data_submit(jumlah, seed=0, aturan=None, per_wilayah=True):
+    """List dict baris tersimpan (kolom jumlah per pilihan, APGAKKUM, wilayah, IC, jumlah klien)."""
+    import penilaian_massal
+
+    aturan = aturan or aturan_penilaian.muat()
+    rnd = random.Random(seed)
+    kategori_ic = ["Sangat Baik", "Baik", "Cukup", "Lemah"]
+    provinsi = list(aturan.bobot["wilayah_skor"])
+    hasil = []
+    for i in range(jumlah):
+        data = {"Nama Notaris": f"Notaris {i}", "NIK KTP": f"{3500000000000000 + i}"}
+        for bagian in aturan_penilaian.BAGIAN_PILIHAN:
+            for label in aturan.label[bagian]:
+                data[label] = rnd.choice((0, 0, 0, 1, 3, 10, 40))
+        data[penilaian_massal.KOLOM_APGAKKUM] = rnd.choice(("YA", "TIDAK"))
+        data[penilaian_massal.KOLOM_JUMLAH_KLIEN] = rnd.randint(0, 400)
+        data[penilaian_massal.KOLOM_INTERNAL_CONTROL] = rnd.choice(kategori_ic)
+        if per_wilayah:
+            data[penilaian_massal.KOLOM_WILAYAH] = rnd.choice(provinsi)
+        hasil.append(data)
+    return hasil
+
+
+def input_form(data, aturan=None):
+    """Ubah satu baris data_submit menjadi argumen inputs hitung_risiko."""
+    import penilaian_massal
+
+    aturan = aturan or aturan_penilaian.muat()
+    nama_input = {"profil": "profil", "bisnis_pengguna": "bisnis", "jasa": "jasa", "negara": "negara"}
+    inputs = {
+        nama_input[bagian]: {label: data[label] for label in aturan.label[bagian]}
+        for bagian in aturan_penilaian.BAGIAN_PILIHAN
+    }
+    inputs["apgakkum"] = data[penilaian_massal.KOLOM_APGAKKUM]
+    if penilaian_massal.KOLOM_WILAYAH in data:
+        inputs["wilayah"] = data[penilaian_massal.KOLOM_WILAYAH]
+    return inputs
@@ -0,0 +1,174 @@
+"""
+Anggaran waktu start & rerun skrip Streamlit.
+
+    python -m benchmarks.impor [--ulang 5] [--anggaran-dingin-ms 200] [--anggaran-rerun-ms 75]
+
+Setiap skrip (q1q2.py, stkanwil.py) dijalankan utuh lewat
+streamlit.testing.v1.AppTest di interpreter baru (`python -X importtime`),
+dengan Google tiruan tanpa latensi (PMPJ_GOOGLE_PALSU=1) dan folder kerja
+sementara:
+
+- dingin: run pertama skrip pada proses baru (import + kode tingkat modul:
+  koneksi Google, aturan, form, status), median beberapa proses, plus
+  rincian kumulatif per modul tingkat atas dari laporan importtime;
+- rerun: median run berikutnya di proses yang sama, seperti setiap kali
+  Streamlit menjalankan ulang skrip.
+
+Runtime Streamlit dipanaskan lebih dulu dengan skrip kosong, dan durasi run
+skrip kosong dikurangkan dari kedua angka. Keluar dengan kode 1 bila salah
+satu melewati anggaran, bila skrip error, bila modul berat (TERLARANG) sudah
+ter-import, atau bila objek Google yang hanya dibutuhkan worker
+(GOOGLE_TERLARANG, mis. service Drive) sudah dibangun sebelum ada submit.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SKRIP = ("q1q2.py", "stkanwil.py")
+
+# Rerun didominasi pembukuan widget Streamlit untuk ±120 input form kuisioner
+ANGGARAN_DINGIN_MS = 200.0
+ANGGARAN_RERUN_MS = 75.0
+ULANG_RERUN = 20
+BATAS_RUN_DETIK = 120
+
+# Hanya boleh dimuat di jalur yang membutuhkannya (OCR, penilaian massal, login OAuth, ...)
+TERLARANG = (
+    "pandas", "numpy", "openpyxl", "pytesseract", "pdfplumber", "pdf2image", "PyPDF2", "PIL",
+    "oauth2client", "google_auth_oauthlib", "googleapiclient", "gspread",
+)
+# Fungsi koneksi_google yang hanya boleh dipanggil worker (upload), bukan saat start
+GOOGLE_TERLARANG = ("ambil_drive_service",)
+
+# Dijalankan di proses anak; argumen: path skrip
+_PROGRAM = """
+import json, statistics, sys, time
+from streamlit.testing.v1 import AppTest
+import koneksi_google
+
+dipanggil = set()
+def _intai(nama, asli):
+    def fungsi(*a, **k):
+        dipanggil.add(nama)
+        return asli(*a, **k)
+    return fungsi
+for nama in {google_terlarang!r}:
+    setattr(koneksi_google, nama, _intai(nama, getattr(koneksi_google, nama)))
+
+def durasi(at):
+    awal = time.perf_counter()
+    at.run()
+    return time.perf_counter() - awal
+
+kosong = AppTest.from_string("import streamlit as st\\nst.write('')", default_timeout={batas})
+durasi(kosong)   # pemanasan runtime Streamlit
+print("--- mulai ---", file=sys.stderr, flush=True)
+at = AppTest.from_file(sys.argv[1], default_timeout={batas})
+dingin = durasi(at)
+if at.exception:
+    print(json.dumps({{"error": at.exception[0].message}}))
+    sys.exit(0)
+terlarang = sorted(m for m in {terlarang!r} if m in sys.modules)
+rerun = statistics.median(durasi(at) for _ in range({ulang}))
+dasar = statistics.median(durasi(kosong) for _ in range({ulang}))
+print(json.dumps({{
+    "dingin_ms": (dingin - dasar) * 1000, "rerun_ms": (rerun - dasar) * 1000, "dasar_ms": dasar * 1000,
+    "terlarang": terlarang, "google_terlarang": sorted(dipanggil),
+}}))
+"""
+
+
+def _baca_importtime(stderr):
+    """{modul tingkat atas: kumulatif ms} dari laporan -X importtime setelah penanda mulai."""
+    hasil = {}
+    _, _, laporan = stderr.partition("--- mulai ---")
+    for baris in laporan.splitlines():
+        if not baris.startswith("import time:"):
+            continue
+        bagian = baris.split("|")
+        if len(bagian) != 3 or not bagian[1].strip().isdigit():
+            continue
+        nama = bagian[2]
+        if nama.startswith(" ") and not nama.startswith("  "):
+            hasil[nama.strip()] = hasil.get(nama.strip(), 0.0) + int(bagian[1]) / 1000
+    return hasil
+
+
+def ukur(path, ulang=5):
+    """Median dingin/rerun dari `ulang` proses baru + rincian importtime proses terakhir."""
+    program = _PROGRAM.format(
+        ulang=ULANG_RERUN, batas=BATAS_RUN_DETIK, terlarang=TERLARANG, google_terlarang=GOOGLE_TERLARANG
+    )
+    # Google tiruan tanpa latensi: yang diukur biaya skrip, bukan jaringan
+    env = dict(
+        os.environ, PMPJ_GOOGLE_PALSU="1", PMPJ_PALSU_LATENSI="0", PMPJ_PALSU_JITTER="0",
+        PMPJ_METRIK="", PMPJ_LOG_JEJAK=""
+    )
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (ROOT, os.environ.get("PYTHONPATH")) if p)
+    dingin, rerun = [], []
+    for _ in range(ulang):
+        # Folder kerja sementara: basis data & uploads/ skrip tidak mengotori repo
+        with tempfile.TemporaryDirectory(prefix="pmpj-impor-") as folder:
+            proses = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", program, path],
+                cwd=folder, env=env, capture_output=True, text=True
+            )
+        if proses.returncode != 0:
+            raise RuntimeError(f"Menjalankan {path} gagal:\n{proses.stderr[-2000:]}")
+        data = json.loads(proses.stdout.strip().splitlines()[-1])
+        if "error" in data:
+            raise RuntimeError(f"Skrip {path} error: {data['error']}")
+        dingin.append(data["dingin_ms"])
+        rerun.append(data["rerun_ms"])
+    return {
+        "dingin_ms": statistics.median(dingin), "rerun_ms": statistics.median(rerun),
+        "dasar_ms": data["dasar_ms"], "terlarang": data["terlarang"],
+        "google_terlarang": data["google_terlarang"], "modul": _baca_importtime(proses.stderr),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Anggaran waktu start & rerun skrip Streamlit.")
+    parser.add_argument("--skrip", nargs="+", default=list(SKRIP))
+    parser.add_argument("--ulang", type=int, default=5, help="jumlah proses baru per skrip")
+    parser.add_argument("--anggaran-dingin-ms", type=float, default=ANGGARAN_DINGIN_MS)
+    parser.add_argument("--anggaran-rerun-ms", type=float, default=ANGGARAN_RERUN_MS)
+    parser.add_argument("--teratas", type=int, default=8, help="jumlah modul termahal yang ditampilkan")
+    parser.add_argument("--keluaran", help="simpan hasil lengkap (JSON)")
+    args = parser.parse_args(argv)
+
+    hasil, pelanggaran = {}, []
+    for skrip in args.skrip:
+        h = hasil[skrip] = ukur(os.path.join(ROOT, skrip), args.ulang)
+        print(f"{skrip}: dingin {h['dingin_ms']:.1f}ms (anggaran {args.anggaran_dingin_ms:.0f}ms), "
+              f"rerun {h['rerun_ms']:.1f}ms (anggaran {args.anggaran_rerun_ms:g}ms)")
+        for nama, ms in sorted(h["modul"].items(), key=lambda x: -x[1])[:args.teratas]:
+            print(f"    {nama:32} {ms:8.1f}ms")
+
+        if h["dingin_ms"] > args.anggaran_dingin_ms:
+            pelanggaran.append(f"{skrip}: start {h['dingin_ms']:.1f}ms")
+        if h["rerun_ms"] > args.anggaran_rerun_ms:
+            pelanggaran.append(f"{skrip}: rerun {h['rerun_ms']:.1f}ms")
+        if h["terlarang"]:
+            pelanggaran.append(f"{skrip}: modul berat ter-import saat start ({', '.join(h['terlarang'])})")
+        if h["google_terlarang"]:
+            pelanggaran.append(f"{skrip}: objek Google dibangun saat start ({', '.join(h['google_terlarang'])})")
+
+    if args.keluaran:
+        with open(args.keluaran, "w", encoding="utf-8") as f:
+            json.dump({"skrip": hasil, "pelanggaran": pelanggaran}, f, indent=2)
+
+    if pelanggaran:
+        print("\n❌ Melewati anggaran start/rerun:\n  " + "\n  ".join(pelanggaran))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
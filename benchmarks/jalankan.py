@@ -0,0 +1,266 @@
+"""
+Runner benchmark: mengukur waktu (median/min beberapa ulangan), puncak
+memori Python (tracemalloc) dan puncak RSS proses (getrusage, termasuk memori
+native seperti buffer gambar, dan proses anak OCR yang sudah selesai) setiap
+kasus, lalu membandingkan dengan baseline.
+
+    python -m benchmarks.jalankan [--profil cepat|lengkap] [--filter teks]
+                                  [--baseline benchmarks/baseline.json] [--simpan-baseline]
+
+Kasus OCR dilewati bila tesseract / poppler tidak terpasang. Cache dokumen
+dimatikan selama pengukuran supaya yang diukur jalur dingin (ekstraksi/OCR).
+Keluar dengan kode 1 bila ada kasus yang lebih lambat / boros dari baseline
+melebihi toleransi, atau bila file baseline tidak ada (buat dengan
+--simpan-baseline). RSS adalah puncak sepanjang umur proses, jadi hanya
+sebanding antar-run dengan profil & filter yang sama.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import pandas as pd
+
+import cache_dokumen
+import dokumen
+import google_palsu
+import pencocokan
+import penilaian_massal
+import penilaian_risiko
+import penyimpanan
+import validasi_dokumen
+from benchmarks import fixture
+
+PATH_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+PROFIL = ("cepat", "lengkap")
+
+
+# --- Lingkungan terisolasi ---
+@contextmanager
+def tanpa_cache_dokumen():
+    ambil, simpan = cache_dokumen.ambil, cache_dokumen.simpan
+    cache_dokumen.ambil = lambda *a, **k: None
+    cache_dokumen.simpan = lambda *a, **k: None
+    try:
+        yield
+    finally:
+        cache_dokumen.ambil, cache_dokumen.simpan = ambil, simpan
+
+
+def lembar_palsu(header, baris):
+    """Worksheet tiruan (google_palsu) berisi header + baris, untuk jalur simpan_banyak / tulis_ulang_semua."""
+    lembar = google_palsu.SpreadsheetPalsu("benchmark", "benchmark").sheet1
+    lembar.nilai = [list(header)] + [list(b) for b in baris]
+    return lembar
+
+
+# --- Kasus ---
+def _perlu(*program):
+    hilang = [p for p in program if shutil.which(p) is None]
+    return f"{', '.join(hilang)} tidak terpasang" if hilang else None
+
+
+def _kasus_dokumen(profil):
+    kasus = []
+    halaman = (5, 200) if profil == "lengkap" else (5,)
+    for n in halaman:
+        digital = fixture.pdf_digital(n, "Q2")
+        kasus.append((f"lapisan_teks/digital/{n}hal",
+                      lambda b=digital: dokumen.lapisan_teks(b, maks_halaman=5), None))
+        kasus.append((f"validasi_q1q2/digital/{n}hal",
+                      lambda b=digital: validasi_dokumen.validasi_q1q2(b, validasi_dokumen.KATA_KUNCI_UMUM), None))
+    kasus.append(("validasi_kanwil/digital/5hal", lambda b=fixture.pdf_digital(5, "Q1"): validasi_dokumen.validasi_kanwil(
+        b, ["formulir customer due diligence", "enhanced due diligence", "analisis risiko", "cdd"]
+    ), None))
+
+    for n in (1, 200) if profil == "lengkap" else (1, 5):
+        scan = fixture.pdf_scan(n, "Q1")
+        kasus.append((f"lapisan_teks/scan/{n}hal", lambda b=scan: dokumen.lapisan_teks(b, maks_halaman=5), None))
+        kasus.append((f"validasi_q1q2/scan/{n}hal",
+                      lambda b=scan: validasi_dokumen.validasi_q1q2(b, validasi_dokumen.KATA_KUNCI_UMUM),
+                      _perlu("tesseract", "pdftoppm")))
+        kasus.append((f"validasi_kanwil/scan/{n}hal", lambda b=scan: validasi_dokumen.validasi_kanwil(
+            b, ["formulir customer due diligence", "enhanced due diligence", "analisis risiko", "cdd"]
+        ), _perlu("tesseract")))
+    return kasus
+
+
+def _kasus_pencocokan(profil):
+    kasus = []
+    for panjang in (10_000, 100_000) if profil == "lengkap" else (10_000,):
+        teks = fixture.teks_ocr_bising(panjang)
+        # Kata kunci yang tidak ada -> seluruh teks harus diperiksa (kasus terburuk)
+        kasus.append((f"cari_jendela_mirip/{panjang // 1000}k_karakter",
+                      lambda t=teks: pencocokan.cari_jendela_mirip("pasal 17 permkham", t, 0.6, lebih=3), None))
+        token = pencocokan.siapkan_token(teks)
+        kasus.append((f"siapkan_token/{panjang // 1000}k_karakter", lambda t=teks: pencocokan.siapkan_token(t), None))
+        kasus.append((f"cari_token_mirip/{panjang // 1000}k_karakter",
+                      lambda t=token: [pencocokan.cari_token_mirip(k, t, 0.7) for k in ("permkham", "kebijakan", "mitigasi")],
+                      None))
+    return kasus
+
+
+def _kasus_penilaian(profil):
+    kasus = []
+    jumlah_skalar = 10_000 if profil == "lengkap" else 1_000
+    inputs = [fixture.input_form(d) for d in fixture.data_submit(jumlah_skalar, seed=1)]
+    kasus.append((f"hitung_risiko/{jumlah_skalar // 1000}k_submit",
+                  lambda x=inputs: [penilaian_risiko.hitung_risiko(i) for i in x], None))
+
+    for jumlah in (1_000, 10_000, 100_000) if profil == "lengkap" else (1_000, 10_000):
+        df = pd.DataFrame(fixture.data_submit(jumlah, seed=2))
+        kasus.append((f"nilai_ulang/{jumlah // 1000}k_baris", lambda d=df: penilaian_massal.nilai_ulang(d), None))
+    return kasus
+
+
+def _kasus_sheet(profil):
+    # Yang diukur kode penyimpanan.py, bukan latensi jaringan tiruan
+    google_palsu.atur(latensi=0, jitter=0)
+    kasus = []
+    kolom = ["Timestamp", "Nama Notaris", "NIK KTP", "Nilai Inherent Risk", "Tingkat Risiko"]
+    kolom_kunci = ["Nama Notaris", "NIK KTP"]
+    for jumlah in (1_000, 10_000) if profil == "lengkap" else (1_000,):
+        lama = [[f"2025-01-01 00:00:{i % 60:02d}", f"Notaris {i}", str(3500000000000000 + i), "20", "Sedang"]
+                for i in range(jumlah)]
+        # Batch 50 submit: separuh mengganti baris lama, ada duplikat di dalam batch
+        baru = [{"Nama Notaris": f"Notaris {i * 37 % (2 * jumlah)}", "NIK KTP": str(3500000000000000 + i * 37 % (2 * jumlah)),
+                 "Nilai Inherent Risk": 25, "Tingkat Risiko": "Tinggi"} for i in range(50)]
+        baru += baru[:10]
+        kasus.append((f"gabungkan_duplikat/{jumlah // 1000}k_baris",
+                      lambda d=[dict(zip(kolom, b)) for b in lama]: penyimpanan.gabungkan_duplikat(d, kolom_kunci), None))
+        kasus.append((f"simpan_banyak_upsert/{jumlah // 1000}k_baris", lambda l=lama, b=baru: penyimpanan.simpan_banyak(
+            lembar_palsu(kolom, l), b, kolom, kolom_kunci
+        ), None))
+        kasus.append((f"tulis_ulang_semua/{jumlah // 1000}k_baris", lambda l=lama, b=baru: penyimpanan.tulis_ulang_semua(
+            lembar_palsu(kolom, l), b, kolom, kolom_kunci
+        ), None))
+    return kasus
+
+
+def daftar_kasus(profil):
+    """List (nama, fungsi, alasan_dilewati) untuk profil yang dipilih."""
+    return _kasus_dokumen(profil) + _kasus_pencocokan(profil) + _kasus_penilaian(profil) + _kasus_sheet(profil)
+
+
+# --- Pengukuran ---
+def _rss_puncak_mb(siapa):
+    """ru_maxrss proses ini / proses anak dalam MB (Linux: KB, macOS: byte); None bila tidak didukung."""
+    if resource is None:
+        return None
+    satuan = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(siapa).ru_maxrss / satuan
+
+
+def ukur(fungsi, ulang=5, batas_detik=20.0):
+    """Median & min waktu (paling banyak `ulang` kali atau sampai batas_detik) + puncak memori."""
+    fungsi()  # pemanasan: import lazy, process pool OCR, dsb.
+    waktu = []
+    mulai = time.perf_counter()
+    while len(waktu) < ulang and (not waktu or time.perf_counter() - mulai < batas_detik):
+        t0 = time.perf_counter()
+        fungsi()
+        waktu.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    try:
+        fungsi()
+        _, puncak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "median_detik": statistics.median(waktu), "min_detik": min(waktu),
+        "ulangan": len(waktu), "puncak_mb": puncak / 1024 / 1024,
+        "rss_mb": _rss_puncak_mb(resource.RUSAGE_SELF) if resource else None,
+        "rss_anak_mb": _rss_puncak_mb(resource.RUSAGE_CHILDREN) if resource else None,
+    }
+
+
+def bandingkan(hasil, baseline, toleransi):
+    """Rasio terhadap baseline per kasus; kasus regresi ditandai."""
+    regresi = []
+    for nama, h in hasil.items():
+        b = baseline.get(nama)
+        if not b:
+            continue
+        h["rasio_waktu"] = h["median_detik"] / b["median_detik"] if b["median_detik"] else None
+        h["rasio_memori"] = h["puncak_mb"] / b["puncak_mb"] if b["puncak_mb"] else None
+        h["rasio_rss"] = h["rss_mb"] / b["rss_mb"] if h.get("rss_mb") and b.get("rss_mb") else None
+        if any((h[r] or 0) > 1 + toleransi for r in ("rasio_waktu", "rasio_memori", "rasio_rss")):
+            regresi.append(nama)
+    return regresi
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark jalur panas penilaian & validasi dokumen.")
+    parser.add_argument("--profil", choices=PROFIL, default="cepat")
+    parser.add_argument("--filter", default="", help="hanya kasus yang namanya memuat teks ini")
+    parser.add_argument("--ulang", type=int, default=5, help="jumlah ulangan per kasus")
+    parser.add_argument("--baseline", default=PATH_BASELINE)
+    parser.add_argument("--simpan-baseline", action="store_true", help="tulis hasil sebagai baseline baru")
+    parser.add_argument("--toleransi", type=float, default=0.25, help="batas kenaikan relatif (0.25 = 25%%)")
+    parser.add_argument("--keluaran", help="simpan hasil lengkap (JSON)")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f).get("kasus", {})
+    elif not args.simpan_baseline:
+        print(f"❌ Baseline {args.baseline} tidak ada; jalankan dengan --simpan-baseline untuk membuatnya.")
+        return 1
+
+    hasil = {}
+    print(f"{'kasus':44} {'median':>10} {'min':>10} {'memori':>9} {'rss':>9} {'vs baseline':>12}")
+    with tanpa_cache_dokumen():
+        for nama, fungsi, alasan in daftar_kasus(args.profil):
+            if args.filter not in nama:
+                continue
+            if alasan:
+                print(f"{nama:44} dilewati: {alasan}")
+                continue
+            h = ukur(fungsi, args.ulang)
+            hasil[nama] = h
+            pembanding = ""
+            if nama in baseline and baseline[nama]["median_detik"]:
+                pembanding = f"{h['median_detik'] / baseline[nama]['median_detik']:.2f}x"
+            rss = f"{h['rss_mb']:7.1f}MB" if h["rss_mb"] is not None else f"{'-':>9}"
+            print(f"{nama:44} {h['median_detik'] * 1000:8.2f}ms {h['min_detik'] * 1000:8.2f}ms "
+                  f"{h['puncak_mb']:7.1f}MB {rss} {pembanding:>12}")
+
+    regresi = bandingkan(hasil, baseline, args.toleransi)
+    tanpa_baseline = [nama for nama in hasil if nama not in baseline]
+    if tanpa_baseline and not args.simpan_baseline:
+        print(f"\n⚠️ {len(tanpa_baseline)} kasus belum ada di baseline: {', '.join(tanpa_baseline)}")
+    info = {"python": platform.python_version(), "mesin": platform.platform(), "waktu": datetime.now().isoformat(),
+            "profil": args.profil}
+    if args.keluaran:
+        with open(args.keluaran, "w", encoding="utf-8") as f:
+            json.dump({"info": info, "kasus": hasil, "regresi": regresi}, f, indent=2)
+    if args.simpan_baseline:
+        gabungan = dict(baseline)
+        gabungan.update({nama: {k: h[k] for k in ("median_detik", "puncak_mb", "rss_mb")} for nama, h in hasil.items()})
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"info": info, "kasus": gabungan}, f, indent=2, sort_keys=True)
+        print(f"Baseline disimpan: {args.baseline}")
+        return 0
+
+    if regresi:
+        print(f"\n❌ {len(regresi)} kasus melewati toleransi {args.toleransi:.0%}: {', '.join(regresi)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
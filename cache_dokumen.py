@@ -0,0 +1,100 @@
+"""
+Cache hasil ekstraksi/OCR dokumen di disk, dialamatkan oleh isi file.
+
+Kunci = SHA-256 isi PDF + hash pengaturan (kata kunci, halaman, dpi, mesin
+render, versi logika). Notaris yang mengunggah ulang PDF yang sama setelah
+memperbaiki salah ketik NIK tidak perlu menunggu ekstraksi/OCR lagi.
+Disimpan di SQLite (WAL) sehingga aman dipakai bersama beberapa proses;
+entri yang paling lama tidak diakses dibuang bila ukuran total melewati batas.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+
+PATH_CACHE = os.path.join("data", "cache_dokumen.sqlite")
+BATAS_CACHE_MB = float(os.environ.get("PMPJ_BATAS_CACHE_MB", 256))
+
+logger = logging.getLogger(__name__)
+
+_SKEMA = """
+    CREATE TABLE IF NOT EXISTS cache (
+        kunci TEXT PRIMARY KEY,
+        nilai TEXT NOT NULL,
+        ukuran INTEGER NOT NULL,
+        diakses REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_cache_diakses ON cache (diakses);
+"""
+_skema_siap = set()   # path absolut cache yang skemanya sudah dibuat di proses ini
+_kunci_skema = threading.Lock()
+
+
+def _buka_db(path):
+    # Mode WAL tersimpan di file dan skema cukup dibuat sekali per proses per file
+    # (atau lagi bila file belum ada), seperti basis_data.buka()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    kunci = os.path.abspath(path)
+    baru = not os.path.exists(path)
+    conn = sqlite3.connect(path, timeout=30)
+    if baru or kunci not in _skema_siap:
+        with _kunci_skema:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SKEMA)
+            _skema_siap.add(kunci)
+    return conn
+
+
+def buat_kunci(pdf_bytes, **pengaturan):
+    """SHA-256 isi dokumen + hash pengaturan ekstraksi/OCR."""
+    isi = hashlib.sha256(pdf_bytes).hexdigest()
+    atur = hashlib.sha256(json.dumps(pengaturan, sort_keys=True, default=str).encode()).hexdigest()
+    return f"{isi}:{atur[:16]}"
+
+
+def ambil(kunci, path=PATH_CACHE):
+    """Nilai tersimpan (hasil json.loads) atau None; waktu akses diperbarui (LRU)."""
+    try:
+        with closing(_buka_db(path)) as conn, conn:
+            row = conn.execute("SELECT nilai FROM cache WHERE kunci = ?", (kunci,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE cache SET diakses = ? WHERE kunci = ?", (time.time(), kunci))
+    except sqlite3.Error as e:
+        # Cache hanya optimasi: kalau bermasalah, proses dokumen seperti biasa
+        logger.warning("Cache dokumen tidak bisa dibaca: %s", e)
+        return None
+    return json.loads(row[0])
+
+
+def simpan(kunci, nilai, path=PATH_CACHE, batas_mb=BATAS_CACHE_MB):
+    """Simpan nilai (harus bisa di-JSON-kan) lalu buang entri LRU sampai di bawah batas."""
+    teks = json.dumps(nilai)
+    batas = int(batas_mb * 1024 * 1024)
+    try:
+        _simpan(kunci, teks, path, batas)
+    except sqlite3.Error as e:
+        logger.warning("Cache dokumen tidak bisa ditulis: %s", e)
+
+
+def _simpan(kunci, teks, path, batas):
+    with closing(_buka_db(path)) as conn, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+            (kunci, teks, len(teks.encode()), time.time())
+        )
+        total = conn.execute("SELECT COALESCE(SUM(ukuran), 0) FROM cache").fetchone()[0]
+        if total <= batas:
+            return
+        dibuang = []
+        for k, ukuran in conn.execute("SELECT kunci, ukuran FROM cache ORDER BY diakses"):
+            if total <= batas:
+                break
+            dibuang.append((k,))
+            total -= ukuran
+        conn.executemany("DELETE FROM cache WHERE kunci = ?", dibuang)
@@ -0,0 +1,271 @@
+"""
+Utilitas dokumen PDF untuk validasi dokumen pendukung (ekstraksi & OCR).
+
+OCR dijalankan per halaman di process pool bersama (satu proses per core),
+sehingga halaman-halaman satu dokumen, dan dokumen-dokumen dari submit yang
+sama, dikerjakan paralel. Setiap halaman dirender sendiri-sendiri dan
+langsung dibuang setelah di-OCR, jadi memori puncak per worker = satu halaman.
+ocr_bertahap() menyerahkan teks halaman satu per satu agar pemanggil bisa
+berhenti begitu hasil validasi sudah pasti.
+
+Resolusi adaptif: jika `dpi` berupa tuple (mis. DPI_ADAPTIF), halaman dirender
+dulu di resolusi terendah; hanya halaman dengan keyakinan rata-rata tesseract
+(atau cakupan kata kunci) di bawah ambang yang dirender ulang lebih tinggi.
+
+PDF campuran (mis. sampul digital + formulir bertanda tangan hasil scan)
+dideteksi per halaman oleh lapisan_teks(); gabung_halaman() hanya me-render
+dan meng-OCR halaman tanpa text layer yang terpakai, lalu menggabungkannya
+dengan teks hasil ekstraksi sesuai urutan halaman.
+"""
+import io
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from statistics import mean
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as _FutureTimeout
+from contextlib import closing, contextmanager
+
+import pdfplumber
+import pytesseract
+from PIL import Image
+from pdf2image import convert_from_path, pdfinfo_from_path
+from PyPDF2 import PdfReader
+
+import metrik
+
+
+MESIN_PDF2IMAGE = "pdf2image"     # poppler (pdftoppm)
+MESIN_PDFPLUMBER = "pdfplumber"   # pypdfium2 lewat pdfplumber
+
+JUMLAH_PROSES_OCR = int(os.environ.get("PMPJ_PROSES_OCR", os.cpu_count() or 1))
+BATAS_WAKTU_OCR = float(os.environ.get("PMPJ_BATAS_WAKTU_OCR", 180))  # detik per dokumen
+
+EKSTRAKTOR_PDFPLUMBER = "pdfplumber"
+EKSTRAKTOR_PYPDF2 = "pypdf2"
+
+# Text layer dianggap terpakai jika cukup banyak karakter; halaman yang
+# sebagian besar berupa gambar butuh lebih banyak teks (mis. hanya kop digital)
+MIN_KARAKTER_TEKS = 25
+MIN_KARAKTER_HALAMAN_GAMBAR = 200
+BATAS_CAKUPAN_GAMBAR = 0.5
+
+DPI_ADAPTIF = (150, 300)
+AMBANG_KEYAKINAN = float(os.environ.get("PMPJ_AMBANG_KEYAKINAN_OCR", 70))  # 0-100, rata-rata per kata
+
+_executor = None
+_kunci_executor = threading.Lock()
+
+def _catat(hasil, daftar_dpi):
+    """Catat satu halaman hasil _ocr_halaman; mengembalikan teksnya."""
+    teks, dpi_dipakai, detik_render, detik_ocr = hasil
+    metrik.catat_tahap("render_halaman", detik_render)
+    metrik.catat_tahap("tesseract", detik_ocr)
+    metrik.tambah("halaman_total", sumber="ocr")
+    if dpi_dipakai != daftar_dpi[0]:
+        metrik.tambah("ocr_eskalasi_total")
+    return teks
+
+
+def _pool():
+    """Process pool OCR bersama (dibuat sekali per proses)."""
+    global _executor
+    with _kunci_executor:
+        if _executor is None:
+            # spawn: aman dipakai dari server Streamlit yang multi-thread
+            _executor = ProcessPoolExecutor(
+                max_workers=JUMLAH_PROSES_OCR, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+
+@contextmanager
+def _pdf_sementara(pdf_bytes):
+    with tempfile.TemporaryDirectory(prefix="pmpj_pdf_") as tmp:
+        path_pdf = os.path.join(tmp, "dokumen.pdf")
+        with open(path_pdf, "wb") as f:
+            f.write(pdf_bytes)
+        yield path_pdf
+
+
+def _jumlah_halaman(path_pdf, mesin):
+    if mesin == MESIN_PDFPLUMBER:
+        with pdfplumber.open(path_pdf) as pdf:
+            return len(pdf.pages)
+    return pdfinfo_from_path(path_pdf)["Pages"]
+
+
+@contextmanager
+def _buka_halaman(path_pdf, nomor, dpi, mesin):
+    """Render satu halaman (1-based) menjadi image; dibuang saat keluar dari blok."""
+    if mesin == MESIN_PDFPLUMBER:
+        with pdfplumber.open(path_pdf, pages=[nomor]) as pdf:
+            yield pdf.pages[0].to_image(resolution=dpi).original
+        return
+
+    with tempfile.TemporaryDirectory(prefix="pmpj_ocr_") as tmp:
+        paths = convert_from_path(
+            path_pdf, dpi=dpi, first_page=nomor, last_page=nomor,
+            grayscale=True, output_folder=tmp, fmt="png", paths_only=True
+        )
+        with Image.open(paths[0]) as img:
+            yield img
+
+
+def _baca_dengan_keyakinan(img, lang, config):
+    """Teks (baris dipisah newline) + keyakinan rata-rata per kata dari image_to_data."""
+    data = pytesseract.image_to_data(img, lang=lang, config=config, output_type=pytesseract.Output.DICT)
+    baris, keyakinan = {}, []
+    for i, kata in enumerate(data["text"]):
+        if not kata.strip():
+            continue
+        baris.setdefault((data["block_num"][i], data["par_num"][i], data["line_num"][i]), []).append(kata)
+        if float(data["conf"][i]) >= 0:
+            keyakinan.append(float(data["conf"][i]))
+    teks = "\n".join(" ".join(kata_kata) for kata_kata in baris.values())
+    return teks, (mean(keyakinan) if keyakinan else 0.0)
+
+
+def _cukup_jelas(teks, keyakinan, ambang, kata_kunci, cakupan_min):
+    if keyakinan < ambang:
+        return False
+    if kata_kunci and cakupan_min > 0:
+        teks = teks.lower()
+        cakupan = sum(1 for k in kata_kunci if k.lower() in teks) / len(kata_kunci)
+        return cakupan >= cakupan_min
+    return True
+
+
+def _ocr_halaman(path_pdf, nomor, dpi, mesin, lang, config, tesseract_cmd,
+                 ambang=AMBANG_KEYAKINAN, kata_kunci=(), cakupan_min=0.0):
+    """
+    Dijalankan di worker: render satu halaman lalu OCR.
+    Mengembalikan (teks, dpi yang dipakai, detik render, detik tesseract);
+    durasi dicatat ke metrik oleh proses pemanggil lewat _catat().
+    """
+    if tesseract_cmd:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    detik_render = detik_ocr = 0.0
+    if not isinstance(dpi, (tuple, list)):
+        awal = time.perf_counter()
+        with _buka_halaman(path_pdf, nomor, dpi, mesin) as img:
+            tengah = time.perf_counter()
+            teks = pytesseract.image_to_string(img, lang=lang, config=config)
+            selesai = time.perf_counter()
+        return teks, dpi, tengah - awal, selesai - tengah
+
+    # Resolusi adaptif: naik hanya jika hasil resolusi sebelumnya kurang jelas
+    for resolusi in dpi:
+        awal = time.perf_counter()
+        with _buka_halaman(path_pdf, nomor, resolusi, mesin) as img:
+            tengah = time.perf_counter()
+            teks, keyakinan = _baca_dengan_keyakinan(img, lang, config)
+            selesai = time.perf_counter()
+        detik_render += tengah - awal
+        detik_ocr += selesai - tengah
+        if _cukup_jelas(teks, keyakinan, ambang, kata_kunci, cakupan_min):
+            break
+    return teks, resolusi, detik_render, detik_ocr
+
+
+def _tesseract_cmd():
+    """Program tesseract untuk worker: PMPJ_TESSERACT_CMD, atau pengaturan pytesseract proses ini."""
+    return os.environ.get("PMPJ_TESSERACT_CMD") or pytesseract.pytesseract.tesseract_cmd
+
+
+def _daftar_dpi(dpi):
+    return tuple(dpi) if isinstance(dpi, (tuple, list)) else (dpi,)
+
+
+def ocr_bertahap(pdf_bytes, maks_halaman=5, dpi=300, mesin=MESIN_PDF2IMAGE,
+                 lang="ind+eng", config="--psm 6", batas_waktu=BATAS_WAKTU_OCR,
+                 ambang=AMBANG_KEYAKINAN, kata_kunci=(), cakupan_min=0.0, halaman=None):
+    """
+    Generator teks OCR per halaman (urutan halaman tetap).
+    `halaman` membatasi OCR ke nomor halaman tertentu (1-based, <= maks_halaman).
+    Halaman pertama dikerjakan lebih dulu; sisanya baru dikirim paralel ke
+    pool jika pemanggil meminta halaman berikutnya. Saat pemanggil berhenti
+    (break + close), halaman yang belum mulai dibatalkan.
+    TimeoutError jika dokumen tidak selesai dalam `batas_waktu` detik.
+    """
+    tesseract_cmd = _tesseract_cmd()
+    args = (dpi, mesin, lang, config, tesseract_cmd, ambang, tuple(kata_kunci), cakupan_min)
+    tenggat = time.monotonic() + batas_waktu
+    with _pdf_sementara(pdf_bytes) as path_pdf:
+        nomor_halaman = range(1, min(_jumlah_halaman(path_pdf, mesin), maks_halaman) + 1)
+        if halaman is not None:
+            nomor_halaman = [nomor for nomor in halaman if nomor in nomor_halaman]
+
+        if JUMLAH_PROSES_OCR <= 1:
+            for nomor in nomor_halaman:
+                yield _catat(_ocr_halaman(path_pdf, nomor, *args), _daftar_dpi(dpi))
+            return
+
+        def kirim(nomor):
+            return _pool().submit(_ocr_halaman, path_pdf, nomor, *args)
+
+        futures = [kirim(nomor) for nomor in nomor_halaman[:1]]
+        try:
+            for i in range(len(nomor_halaman)):
+                if i == 1:
+                    futures += [kirim(nomor) for nomor in nomor_halaman[1:]]
+                try:
+                    hasil = futures[i].result(timeout=max(tenggat - time.monotonic(), 0))
+                except _FutureTimeout:
+                    raise TimeoutError(f"OCR melebihi batas waktu {batas_waktu:.0f} detik")
+                yield _catat(hasil, _daftar_dpi(dpi))
+        finally:
+            for f in futures:
+                f.cancel()
+
+
+# --- Deteksi text layer per halaman ---
+def _cakupan_gambar(page):
+    """Perkiraan porsi luas halaman yang tertutup gambar (0..1)."""
+    luas = float(page.width * page.height) or 1.0
+    tertutup = sum(
+        max(img["x1"] - img["x0"], 0) * max(img["bottom"] - img["top"], 0) for img in page.images
+    )
+    return min(tertutup / luas, 1.0)
+
+
+def _perlu_ocr(teks, cakupan_gambar):
+    jumlah = len("".join((teks or "").split()))
+    if cakupan_gambar >= BATAS_CAKUPAN_GAMBAR:
+        return jumlah < MIN_KARAKTER_HALAMAN_GAMBAR
+    return jumlah < MIN_KARAKTER_TEKS
+
+
+def lapisan_teks(pdf_bytes, maks_halaman=5, ekstraktor=EKSTRAKTOR_PDFPLUMBER):
+    """
+    Text layer halaman 1..maks_halaman.
+    Mengembalikan list (teks, perlu_ocr) per halaman sesuai urutan.
+    """
+    with metrik.waktu("ekstraksi_teks"), pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        halaman = pdf.pages[:maks_halaman]
+        cakupan = [_cakupan_gambar(page) for page in halaman]
+        if ekstraktor == EKSTRAKTOR_PYPDF2:
+            reader = PdfReader(io.BytesIO(pdf_bytes))
+            daftar_teks = [page.extract_text() for page in reader.pages[:maks_halaman]]
+        else:
+            daftar_teks = [page.extract_text() for page in halaman]
+    return [(teks, _perlu_ocr(teks, c)) for teks, c in zip(daftar_teks, cakupan)]
+
+
+def gabung_halaman(pdf_bytes, lapisan, **opsi_ocr):
+    """
+    Generator teks per halaman sesuai urutan: text layer bila terpakai,
+    selain itu hasil OCR (lewat ocr_bertahap, hanya untuk halaman itu).
+    """
+    perlu_ocr = [nomor for nomor, (_, ocr) in enumerate(lapisan, start=1) if ocr]
+    metrik.tambah("dokumen_total", ocr="ya" if perlu_ocr else "tidak")
+    opsi_ocr.setdefault("maks_halaman", len(lapisan))
+    with closing(ocr_bertahap(pdf_bytes, halaman=perlu_ocr, **opsi_ocr)) as hasil_ocr:
+        for teks, ocr in lapisan:
+            if ocr:
+                yield next(hasil_ocr, "")
+            else:
+                metrik.tambah("halaman_total", sumber="text_layer")
+                yield teks
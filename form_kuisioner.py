@@ -0,0 +1,91 @@
+"""
+Widget Streamlit form kuisioner, dibangun dari skema kuisioner.py.
+
+Setiap bagian (identitas, tiap bagian jumlah klien, APGAKKUM, pertanyaan
+kepatuhan) dirender sebagai st.fragment: mengubah satu input hanya
+menjalankan ulang fragment bagiannya, tidak seluruh skrip (koneksi Google,
+aturan, status antrian, ...). Nilai input disimpan di st.session_state dengan
+kunci per form & kolom; jawaban() membacanya saat tombol Submit (di luar
+fragment) menjalankan ulang skrip penuh.
+"""
+import streamlit as st
+
+import kuisioner
+
+
+def _kunci(jenis, *bagian):
+    return "|".join((jenis,) + bagian)
+
+
+# --- Bagian form (masing-masing satu fragment) ---
+@st.fragment
+def _identitas(jenis, aturan):
+    st.subheader("Identitas Notaris")
+    for field in kuisioner.FORM[jenis]["identitas"]:
+        pilihan = kuisioner.pilihan(field, aturan)
+        if pilihan is None:
+            st.text_input(field["label"], key=_kunci(jenis, field["kolom"]))
+        else:
+            st.selectbox(field["label"], pilihan, key=_kunci(jenis, field["kolom"]))
+
+
+@st.fragment
+def _jumlah(jenis, bagian, aturan):
+    st.subheader(bagian["judul"])
+    kunci = [_kunci(jenis, bagian["bagian"], opsi) for opsi in aturan.bobot[bagian["bagian"]]]
+    for opsi, k in zip(aturan.bobot[bagian["bagian"]], kunci):
+        st.number_input(opsi, min_value=0, value=0, key=k)
+    if "total" in bagian:
+        st.subheader(bagian["total"])
+        st.write(sum(st.session_state[k] for k in kunci))
+
+
+@st.fragment
+def _apgakkum(jenis, aturan):
+    st.subheader(kuisioner.APGAKKUM["judul"])
+    st.radio(kuisioner.APGAKKUM["label"], kuisioner.pilihan(kuisioner.APGAKKUM, aturan),
+             key=_kunci(jenis, kuisioner.APGAKKUM["kolom"]))
+
+
+@st.fragment
+def _kepatuhan(jenis):
+    st.subheader("Pertanyaan Kepatuhan Notaris")
+    for pertanyaan in kuisioner.PERTANYAAN:
+        st.radio(pertanyaan["label"], kuisioner.PILIHAN_YA_TIDAK, key=_kunci(jenis, pertanyaan["kolom"]))
+        if "dokumen" in pertanyaan:
+            dokumen = kuisioner.DOKUMEN[pertanyaan["dokumen"]]
+            berkas = st.file_uploader(dokumen["label"], type=["pdf"], key=_kunci(jenis, dokumen["kolom"]))
+            if berkas is not None:
+                st.success(f"File berhasil diupload: {berkas.name}")
+
+
+def tampilkan(jenis, aturan):
+    """Render seluruh form `jenis` ("kanwil" / "q1q2")."""
+    _identitas(jenis, aturan)
+    for bagian in kuisioner.BAGIAN_JUMLAH:
+        _jumlah(jenis, bagian, aturan)
+    _apgakkum(jenis, aturan)
+    _kepatuhan(jenis)
+
+
+# --- Nilai form ---
+def jawaban(jenis, aturan):
+    """
+    Nilai semua input form dari session_state:
+    {"identitas": {kolom: nilai}, "jumlah": {bagian: {pilihan: jumlah}},
+     "apgakkum": "YA"/"TIDAK", "pertanyaan": {kolom: "YA"/"TIDAK"},
+     "berkas": [UploadedFile atau None per kuisioner.DOKUMEN]}
+    """
+    s = st.session_state
+    return {
+        "identitas": {
+            f["kolom"]: s.get(_kunci(jenis, f["kolom"])) or "" for f in kuisioner.FORM[jenis]["identitas"]
+        },
+        "jumlah": {
+            b["bagian"]: {opsi: s.get(_kunci(jenis, b["bagian"], opsi), 0) for opsi in aturan.bobot[b["bagian"]]}
+            for b in kuisioner.BAGIAN_JUMLAH
+        },
+        "apgakkum": s.get(_kunci(jenis, kuisioner.APGAKKUM["kolom"])),
+        "pertanyaan": {p["kolom"]: s.get(_kunci(jenis, p["kolom"])) for p in kuisioner.PERTANYAAN},
+        "berkas": [s.get(_kunci(jenis, d["kolom"])) for d in kuisioner.DOKUMEN],
+    }
@@ -0,0 +1,357 @@
+"""
+Pengganti Google Sheets & Drive di dalam proses, untuk uji beban dan
+pengembangan tanpa akses ke Google.
+
+Aktif bila PMPJ_GOOGLE_PALSU=1 (lihat koneksi_google.py): semua ambil_*
+mengembalikan objek di sini. Hanya bagian API yang dipakai aplikasi yang
+ditiru: worksheet gspread (get_all_records, clear, update, batch_get,
+batch_update, append_rows) serta Drive v3 files().create (multipart dan
+resumable per chunk) / get dan permissions().create. Setiap request bisa diberi latensi, kuota per menit
+dan error 429 acak, dengan error yang sama jenisnya dengan library asli.
+
+Pengaturan lewat environment (atau atur() dari kode):
+    PMPJ_PALSU_LATENSI   detik per request (default 0.05)
+    PMPJ_PALSU_JITTER    variasi acak latensi, detik (default 0.02)
+    PMPJ_PALSU_KUOTA     request per menit per layanan, 0 = tanpa batas (default 0)
+    PMPJ_PALSU_LAJU_429  peluang request acak ditolak 429 (default 0)
+"""
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+
+
+_pengaturan = {
+    "latensi": float(os.environ.get("PMPJ_PALSU_LATENSI", 0.05)),
+    "jitter": float(os.environ.get("PMPJ_PALSU_JITTER", 0.02)),
+    "kuota": int(os.environ.get("PMPJ_PALSU_KUOTA", 0)),
+    "laju_429": float(os.environ.get("PMPJ_PALSU_LAJU_429", 0)),
+}
+_kunci = threading.Lock()
+_riwayat = {"sheets": deque(), "drive": deque()}   # waktu request dalam satu menit terakhir
+_statistik = {"sheets": 0, "drive": 0, "ditolak_429": 0}
+_rnd = random.Random()
+
+CREDENTIALS = type("CredentialsPalsu", (), {"valid": True})()
+
+
+def atur(**pengaturan):
+    """Ubah latensi / jitter / kuota / laju_429 saat runtime."""
+    with _kunci:
+        _pengaturan.update(pengaturan)
+
+
+def statistik():
+    """Jumlah request per layanan dan yang ditolak 429."""
+    with _kunci:
+        return dict(_statistik)
+
+
+# --- Latensi, kuota & error ---
+def _galat_429(layanan, pesan):
+    if layanan == "sheets":
+        from gspread.exceptions import APIError
+
+        class _Respons:
+            status_code = 429
+            text = pesan
+
+            def json(self):
+                return {"error": {"code": 429, "message": pesan, "status": "RESOURCE_EXHAUSTED"}}
+
+        return APIError(_Respons())
+
+    import httplib2
+    from googleapiclient.errors import HttpError
+    isi = json.dumps({"error": {"code": 429, "message": pesan}}).encode()
+    return HttpError(httplib2.Response({"status": 429, "reason": "Too Many Requests"}), isi)
+
+
+def _request(layanan):
+    """Dipanggil di awal setiap request palsu: tunda, lalu tolak bila kuota habis / acak."""
+    with _kunci:
+        sekarang = time.monotonic()
+        riwayat = _riwayat[layanan]
+        while riwayat and riwayat[0] < sekarang - 60:
+            riwayat.popleft()
+        _statistik[layanan] += 1
+        kuota_habis = _pengaturan["kuota"] and len(riwayat) >= _pengaturan["kuota"]
+        acak = _rnd.random() < _pengaturan["laju_429"]
+        if not kuota_habis:
+            riwayat.append(sekarang)
+        if kuota_habis or acak:
+            _statistik["ditolak_429"] += 1
+        jeda = max(_pengaturan["latensi"] + _rnd.uniform(-1, 1) * _pengaturan["jitter"], 0)
+
+    time.sleep(jeda)
+    if kuota_habis:
+        raise _galat_429(layanan, "Quota exceeded for quota metric 'Requests per minute'")
+    if acak:
+        raise _galat_429(layanan, "Rate limit exceeded")
+
+
+# --- Google Sheets ---
+def _kolom_ke_indeks(huruf):
+    indeks = 0
+    for c in huruf:
+        indeks = indeks * 26 + ord(c) - 64
+    return indeks - 1
+
+
+def _indeks_ke_kolom(indeks):
+    huruf = ""
+    indeks += 1
+    while indeks:
+        indeks, sisa = divmod(indeks - 1, 26)
+        huruf = chr(65 + sisa) + huruf
+    return huruf
+
+
+class WorksheetPalsu:
+    """Sheet pertama sebuah spreadsheet; nilai disimpan sebagai list baris (string)."""
+
+    def __init__(self, spreadsheet):
+        self.spreadsheet = spreadsheet
+        self.id = 0
+        self.title = "Sheet1"
+        self.nilai = []
+        self._kunci = threading.Lock()
+
+    def _ubah(self):
+        self.spreadsheet.version += 1
+
+    def get_all_values(self):
+        _request("sheets")
+        with self._kunci:
+            return [list(b) for b in self.nilai]
+
+    def get_all_records(self):
+        _request("sheets")
+        with self._kunci:
+            if not self.nilai:
+                return []
+            header = self.nilai[0]
+            return [
+                {k: (b[i] if i < len(b) else "") for i, k in enumerate(header)} for b in self.nilai[1:]
+            ]
+
+    def clear(self):
+        _request("sheets")
+        with self._kunci:
+            self.nilai = []
+            self._ubah()
+
+    def update(self, range_name="A1", values=None, **_):
+        _request("sheets")
+        with self._kunci:
+            self._tulis(range_name, values or [])
+            self._ubah()
+
+    def _tulis(self, range_name, values):
+        cocok = re.fullmatch(r"([A-Z]+)(\d+)(?::.*)?", range_name)
+        kolom, baris = _kolom_ke_indeks(cocok.group(1)), int(cocok.group(2)) - 1
+        while len(self.nilai) < baris + len(values):
+            self.nilai.append([])
+        for i, isi in enumerate(values):
+            lama = self.nilai[baris + i]
+            lama.extend([""] * (kolom + len(isi) - len(lama)))
+            lama[kolom:kolom + len(isi)] = ["" if v is None else str(v) for v in isi]
+
+    def batch_get(self, ranges, **_):
+        _request("sheets")
+        hasil = []
+        with self._kunci:
+            for rentang in ranges:
+                cocok = re.fullmatch(r"(\d+):(\d+)", rentang)
+                if cocok:   # baris penuh, mis. "1:1"
+                    awal, akhir = int(cocok.group(1)) - 1, int(cocok.group(2))
+                    hasil.append([list(b) for b in self.nilai[awal:akhir] if b])
+                    continue
+                cocok = re.fullmatch(r"([A-Z]+)(\d+):([A-Z]+)", rentang)
+                kolom, awal = _kolom_ke_indeks(cocok.group(1)), int(cocok.group(2)) - 1
+                nilai = [[b[kolom]] if len(b) > kolom and b[kolom] != "" else [] for b in self.nilai[awal:]]
+                while nilai and not nilai[-1]:
+                    nilai.pop()   # API asli memangkas sel kosong di akhir
+                hasil.append(nilai)
+        return hasil
+
+    def batch_update(self, data, **_):
+        _request("sheets")
+        with self._kunci:
+            for item in data:
+                self._tulis(item["range"], item["values"])
+            self._ubah()
+        return {"totalUpdatedRows": len(data)}
+
+    def append_rows(self, values, table_range="A1", **_):
+        _request("sheets")
+        with self._kunci:
+            while self.nilai and not any(self.nilai[-1]):
+                self.nilai.pop()
+            awal = len(self.nilai) + 1
+            self.nilai.extend(["" if v is None else str(v) for v in b] for b in values)
+            self._ubah()
+            lebar = max((len(b) for b in values), default=1)
+        rentang = f"{self.title}!A{awal}:{_indeks_ke_kolom(lebar - 1)}{awal + len(values) - 1}"
+        return {"updates": {"updatedRange": rentang, "updatedRows": len(values)}}
+
+
+class SpreadsheetPalsu:
+    def __init__(self, id_, nama):
+        self.id = id_
+        self.title = nama
+        self.version = 1
+        self.sheet1 = WorksheetPalsu(self)
+
+
+class ClientPalsu:
+    """Pengganti gspread.Client: spreadsheet dibuat otomatis saat pertama dibuka."""
+
+    def __init__(self):
+        self._spreadsheet = {}
+        self._kunci = threading.Lock()
+
+    def _ambil(self, id_, nama):
+        with self._kunci:
+            for sh in self._spreadsheet.values():
+                if (id_ and sh.id == id_) or (not id_ and sh.title == nama):
+                    return sh
+            sh = SpreadsheetPalsu(id_ or f"palsu-{len(self._spreadsheet) + 1}", nama or id_)
+            self._spreadsheet[sh.id] = sh
+            return sh
+
+    def open_by_key(self, kunci):
+        _request("sheets")
+        return self._ambil(kunci, None)
+
+    def open(self, nama):
+        _request("sheets")
+        return self._ambil(None, nama)
+
+    def spreadsheet(self, id_):
+        """Akses langsung (tanpa latensi) untuk pemeriksaan hasil uji."""
+        with self._kunci:
+            return self._spreadsheet.get(id_)
+
+
+# --- Google Drive ---
+class _Eksekusi:
+    def __init__(self, layanan, fungsi):
+        self._layanan = layanan
+        self._fungsi = fungsi
+
+    def execute(self, num_retries=0):
+        _request(self._layanan)
+        return self._fungsi()
+
+
+class _Unggah(_Eksekusi):
+    """files().create dengan media: execute() sekali jalan, atau next_chunk() untuk resumable."""
+
+    def __init__(self, fungsi, media_body):
+        super().__init__("drive", fungsi)
+        self._media = media_body
+        self._sesi = False
+        self._terkirim = 0
+
+    def next_chunk(self, num_retries=0):
+        from googleapiclient.http import MediaUploadProgress
+
+        if not self._sesi:   # request pembuka sesi resumable
+            _request(self._layanan)
+            self._sesi = True
+        _request(self._layanan)   # error di sini: posisi tetap, chunk berikutnya melanjutkan
+        ukuran = self._media.size()
+        self._terkirim = min(self._terkirim + self._media.chunksize(), ukuran)
+        if self._terkirim < ukuran:
+            return MediaUploadProgress(self._terkirim, ukuran), None
+        return None, self._fungsi()
+
+
+class _Files:
+    def __init__(self, drive):
+        self._drive = drive
+
+    def create(self, body=None, media_body=None, fields=None, **_):
+        def buat():
+            isi = b""
+            if media_body is not None:
+                isi = media_body.getbytes(0, media_body.size())
+            with self._drive.kunci:
+                id_ = f"berkas-{len(self._drive.berkas) + 1}"
+                self._drive.berkas[id_] = {
+                    "id": id_, "name": (body or {}).get("name"), "parents": (body or {}).get("parents", []),
+                    "ukuran": len(isi), "izin": [],
+                    "webViewLink": f"https://drive.google.com/file/d/{id_}/view",
+                }
+                return {"id": id_, "webViewLink": self._drive.berkas[id_]["webViewLink"]}
+        return _Unggah(buat, media_body)
+
+    def get(self, fileId=None, fields=None, **_):
+        def ambil():
+            sh = self._drive.client.spreadsheet(fileId)
+            if sh is not None:
+                return {"id": fileId, "version": str(sh.version)}
+            with self._drive.kunci:
+                berkas = self._drive.berkas.get(fileId)
+            if berkas is None:
+                berkas = self._drive.buat_folder(fileId)
+            with self._drive.kunci:
+                return {**berkas, "permissions": list(berkas["izin"])}
+        return _Eksekusi("drive", ambil)
+
+
+class _Permissions:
+    def __init__(self, drive):
+        self._drive = drive
+
+    def create(self, fileId=None, body=None, **_):
+        def buat():
+            with self._drive.kunci:
+                self._drive.berkas[fileId]["izin"].append(body)
+            return {"id": f"izin-{fileId}"}
+        return _Eksekusi("drive", buat)
+
+
+class DrivePalsu:
+    """Pengganti service Drive v3 (files & permissions)."""
+
+    def __init__(self, client):
+        self.client = client
+        self.berkas = {}
+        self.kunci = threading.Lock()
+
+    def buat_folder(self, id_, publik=False):
+        """Folder tujuan upload (dibuat otomatis saat pertama dirujuk, default privat)."""
+        with self.kunci:
+            izin = [{"type": "anyone", "role": "reader"}] if publik else []
+            self.berkas[id_] = {"id": id_, "name": id_, "parents": [], "ukuran": 0, "izin": izin, "folder": True}
+            return self.berkas[id_]
+
+    def publik(self, id_):
+        """True jika berkas (atau folder induknya) bisa dibaca siapa saja."""
+        with self.kunci:
+            berkas = self.berkas.get(id_)
+            if berkas is None:
+                return False
+            induk = [self.berkas[p] for p in berkas["parents"] if p in self.berkas]
+            return any(i.get("type") == "anyone" for b in [berkas, *induk] for i in b["izin"])
+
+    def files(self):
+        return _Files(self)
+
+    def permissions(self):
+        return _Permissions(self)
+
+
+# --- Instance bersama per proses ---
+CLIENT = ClientPalsu()
+DRIVE = DrivePalsu(CLIENT)
+
+
+def ambil_worksheet(kunci=None, nama=None):
+    sh = CLIENT.open_by_key(kunci) if kunci else CLIENT.open(nama)
+    return sh.sheet1
@@ -0,0 +1,199 @@
+"""
+Lapisan koneksi Google (Sheets & Drive) yang dipakai bersama oleh semua sesi.
+
+Streamlit menjalankan ulang seluruh skrip setiap kali widget berubah. Tanpa
+cache, setiap rerun membuat ulang credentials, client gspread, service Drive
+dan membuka spreadsheet lagi. Modul ini membangun semua objek tersebut sekali
+per proses (st.cache_resource), me-refresh token hanya ketika sudah
+kedaluwarsa, dan mencatat setiap pengambilan ke metrik google_cache_total
+(objek=credentials/client/drive/worksheet, hasil=hit/miss/refresh).
+
+Dengan PMPJ_GOOGLE_PALSU=1 semua objek diganti tiruan di dalam proses
+(google_palsu.py) untuk uji beban / pengembangan tanpa akses ke Google;
+objek tiruan melewati cache yang sama sehingga hit/miss tetap tercatat.
+
+Library Google (gspread, google-auth, googleapiclient, google_auth_oauthlib)
+di-import di dalam fungsi yang membangun objeknya, jadi baru dimuat saat
+objek itu pertama kali dibutuhkan, tidak saat modul ini di-import.
+"""
+import json
+import os
+import threading
+
+import streamlit as st
+
+import metrik
+
+
+# --- Scope Akses Google API ---
+SCOPE = [
+    "https://www.googleapis.com/auth/drive",
+    "https://www.googleapis.com/auth/drive.file",
+    "https://www.googleapis.com/auth/spreadsheets"
+]
+
+# Sumber credentials OAuth (token.json lokal / Streamlit Secrets).
+# Sumber lain dianggap path file JSON service account.
+SUMBER_OAUTH = "oauth"
+
+PAKAI_PALSU = os.environ.get("PMPJ_GOOGLE_PALSU", "") == "1"
+
+
+# --- Hit/miss cache ---
+# Fungsi ber-cache dijalankan di thread pemanggil; yang benar-benar membangun
+# objek (miss) menandai dirinya di sini, selain itu pengambilan dihitung hit.
+_miss = threading.local()
+
+
+def _tandai_miss(objek):
+    _miss.__dict__.setdefault("objek", set()).add(objek)
+
+
+def _ambil(objek, buat, *args):
+    tertanda = _miss.__dict__.setdefault("objek", set())
+    tertanda.discard(objek)
+    hasil = buat(*args)
+    metrik.tambah("google_cache_total", objek=objek, hasil="miss" if objek in tertanda else "hit")
+    tertanda.discard(objek)
+    return hasil
+
+
+# --- Credentials ---
+_kunci_refresh = threading.Lock()
+
+
+@st.cache_resource(show_spinner=False)
+def _muat_credentials(sumber):
+    _tandai_miss("credentials")
+    if PAKAI_PALSU:
+        import google_palsu
+        return google_palsu.CREDENTIALS
+    from google.oauth2 import service_account
+    from google.oauth2.credentials import Credentials
+
+    if sumber != SUMBER_OAUTH:
+        return service_account.Credentials.from_service_account_file(sumber, scopes=SCOPE)
+
+    creds = None
+    if os.path.exists("token.json"):
+        creds = Credentials.from_authorized_user_file("token.json", scopes=SCOPE)
+    elif "google" in st.secrets and "token" in st.secrets["google"]:
+        creds_data = json.loads(st.secrets["google"]["token"])
+        creds = Credentials.from_authorized_user_info(creds_data, scopes=SCOPE)
+
+    if not creds:
+        st.warning("🔐 Token belum ada, buka login Google OAuth untuk membuat token.json (hanya di lokal).")
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
+        flow = InstalledAppFlow.from_client_secrets_file("credentials.json", scopes=SCOPE)
+        creds = flow.run_local_server(port=0)
+        with open("token.json", "w") as token_file:
+            token_file.write(creds.to_json())
+    return creds
+
+
+def ambil_credentials(sumber=SUMBER_OAUTH):
+    """Credentials yang di-cache; token di-refresh hanya jika sudah kedaluwarsa."""
+    creds = _ambil("credentials", _muat_credentials, sumber)
+    if not creds.valid:
+        from google.auth.transport.requests import Request
+        from google.oauth2 import service_account
+
+        with _kunci_refresh:
+            # Cek ulang: sesi lain mungkin sudah me-refresh saat kita menunggu lock
+            bisa_refresh = isinstance(creds, service_account.Credentials) or getattr(creds, "refresh_token", None)
+            if not creds.valid and bisa_refresh:
+                creds.refresh(Request())
+                metrik.tambah("google_cache_total", objek="credentials", hasil="refresh")
+    return creds
+
+
+# --- Client gspread ---
+@st.cache_resource(show_spinner=False)
+def _buat_client(sumber):
+    _tandai_miss("client")
+    if PAKAI_PALSU:
+        import google_palsu
+        return google_palsu.CLIENT
+    import gspread
+
+    return gspread.authorize(ambil_credentials(sumber))
+
+
+def ambil_client(sumber=SUMBER_OAUTH):
+    return _ambil("client", _buat_client, sumber)
+
+
+# --- Service Google Drive ---
+# Objek httplib2 tidak thread-safe, sedangkan sesi Streamlit berjalan di thread
+# berbeda. Service Drive dibangun sekali, tetapi setiap thread memakai
+# AuthorizedHttp miliknya sendiri.
+_http_lokal = threading.local()
+
+
+def _http_thread(sumber):
+    semua = _http_lokal.__dict__.setdefault("http", {})
+    if sumber not in semua:
+        import google_auth_httplib2
+        import httplib2
+
+        semua[sumber] = google_auth_httplib2.AuthorizedHttp(ambil_credentials(sumber), http=httplib2.Http())
+    return semua[sumber]
+
+
+@st.cache_resource(show_spinner=False)
+def _buat_drive_service(sumber):
+    _tandai_miss("drive")
+    if PAKAI_PALSU:
+        import google_palsu
+        return google_palsu.DRIVE
+    from googleapiclient.discovery import build
+    from googleapiclient.http import HttpRequest
+
+    def request_builder(http, *args, **kwargs):
+        return HttpRequest(_http_thread(sumber), *args, **kwargs)
+
+    return build(
+        "drive", "v3",
+        credentials=ambil_credentials(sumber),
+        requestBuilder=request_builder,
+        cache_discovery=False
+    )
+
+
+def ambil_drive_service(sumber=SUMBER_OAUTH):
+    return _ambil("drive", _buat_drive_service, sumber)
+
+
+# --- Spreadsheet / worksheet ---
+@st.cache_resource(show_spinner=False)
+def _buka_worksheet(sumber, kunci, nama):
+    _tandai_miss("worksheet")
+    if PAKAI_PALSU:
+        import google_palsu
+        return google_palsu.ambil_worksheet(kunci, nama)
+    import gspread
+
+    client = ambil_client(sumber)
+    if kunci:
+        try:
+            sh = client.open_by_key(kunci)
+        except gspread.SpreadsheetNotFound:
+            if not nama:
+                raise
+            sh = client.open(nama)
+    else:
+        sh = client.open(nama)
+    return sh.sheet1  # sheet pertama
+
+
+def spreadsheet_tidak_ditemukan(e):
+    """True jika `e` adalah gspread.SpreadsheetNotFound (gspread di-import hanya saat ada error)."""
+    import gspread
+
+    return isinstance(e, gspread.SpreadsheetNotFound)
+
+
+def ambil_worksheet(sumber=SUMBER_OAUTH, kunci=None, nama=None):
+    """Sheet pertama dari spreadsheet (dibuka lewat ID, fallback ke nama)."""
+    return _ambil("worksheet", _buka_worksheet, sumber, kunci, nama)
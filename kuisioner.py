@@ -0,0 +1,248 @@
+"""
+Skema kuisioner PMPJ Notaris: bagian, pertanyaan, pilihan jawaban dan header
+kolom sheet ditulis sekali di sini sebagai data.
+
+form_kuisioner.py membangun widget Streamlit dari skema ini dan
+column_order() menyusun urutan kolom sheet dari skema yang sama, jadi label
+pertanyaan dan header kolom tidak lagi ditulis ulang di setiap skrip. Pilihan
+& bobot bagian jumlah klien, wilayah dan APGAKKUM diambil dari
+aturan_penilaian.json (aturan.bobot), urutannya = urutan di form.
+
+Form "kanwil" (stkanwil.py) dan "q1q2" (q1q2.py) sama kecuali bagian
+identitas dan kolom pilihan; kuncinya sama dengan antrian_validasi.JENIS_*.
+"""
+
+
+PILIHAN_YA_TIDAK = ["YA", "TIDAK"]
+
+KOLOM_TIMESTAMP = "Timestamp"
+KOLOM_NAMA = "Nama Notaris"
+KOLOM_NIK = "NIK KTP"
+KOLOM_USERNAME = "Username Akun AHU Online"
+KOLOM_HP = "Nomor HP"
+KOLOM_JUMLAH_KLIEN = "3. Jumlah Klien Tahun 2024-2025"
+KOLOM_WILAYAH = "Wilayah"
+KOLOM_APGAKKUM = "Apakah Notaris pernah dipanggil atau diminta informasi oleh Aparat Penegak Hukum?"
+KOLOM_STATUS_VALIDASI = "Status Validasi Dokumen"
+
+DAFTAR_KOTA = [
+    "Kabupaten Bangkalan",
+    "Kabupaten Banyuwangi",
+    "Kabupaten Blitar",
+    "Kabupaten Bojonegoro",
+    "Kabupaten Bondowoso",
+    "Kabupaten Gresik",
+    "Kabupaten Jember",
+    "Kabupaten Jombang",
+    "Kabupaten Kediri",
+    "Kabupaten Lamongan",
+    "Kabupaten Lumajang",
+    "Kabupaten Madiun",
+    "Kabupaten Magetan",
+    "Kabupaten Malang",
+    "Kabupaten Mojokerto",
+    "Kabupaten Nganjuk",
+    "Kabupaten Ngawi",
+    "Kabupaten Pacitan",
+    "Kabupaten Pamekasan",
+    "Kabupaten Pasuruan",
+    "Kabupaten Ponorogo",
+    "Kabupaten Probolinggo",
+    "Kabupaten Sampang",
+    "Kabupaten Sidoarjo",
+    "Kabupaten Situbondo",
+    "Kabupaten Sumenep",
+    "Kabupaten Trenggalek",
+    "Kabupaten Tuban",
+    "Kabupaten Tulungagung",
+    "Kota Batu",
+    "Kota Blitar",
+    "Kota Kediri",
+    "Kota Madiun",
+    "Kota Malang",
+    "Kota Mojokerto",
+    "Kota Pasuruan",
+    "Kota Probolinggo",
+    "Kota Surabaya",
+]
+
+
+# --- Identitas ---
+# Field dengan "pilihan" / "pilihan_aturan" menjadi selectbox, selain itu text input.
+# Semua field identitas wajib diisi.
+_IDENTITAS_AWAL = [
+    {"kolom": KOLOM_NAMA, "label": "1. Nama Notaris (contoh: Herman Setiawan, S.H., M.Kn)"},
+    {"kolom": KOLOM_NIK, "label": "NIK KTP (16 digit angka)"},
+    {"kolom": KOLOM_USERNAME, "label": "Username Akun AHU Online"},
+    {"kolom": KOLOM_HP, "label": "Nomor HP"},
+]
+
+# --- Jumlah klien per bagian bobot (satu number input per pilihan) ---
+BAGIAN_JUMLAH = [
+    {"bagian": "profil", "judul": "Jumlah Klien Sesuai Profesi", "total": "Jumlah Klien Total"},
+    {"bagian": "bisnis_pengguna", "judul": "Jumlah Klien Sesuai Bisnis"},
+    {"bagian": "jasa", "judul": "Jumlah Klien Sesuai Jasa yang Digunakan"},
+    {"bagian": "produk", "judul": "Jumlah Dokumen/Produk Jasa yang Diurus Klien"},
+    {"bagian": "negara", "judul": "Jumlah Klien Sesuai Negara"},
+]
+
+APGAKKUM = {"judul": "Terkait Aparat Penegak Hukum", "kolom": KOLOM_APGAKKUM, "label": KOLOM_APGAKKUM,
+            "pilihan_aturan": "apgakkum"}
+
+# --- Dokumen pendukung (diupload di bawah pertanyaan yang merujuknya) ---
+DOKUMEN = [
+    {"label": "Upload Dokumen Pendukung (Form CDD, EDD dan Analisa Resiko) dengan format PDF",
+     "kolom": "Dokumen_Pendukung (Q1)", "kolom_hash": "SHA-256 Dokumen (Q1)"},
+    {"label": "Upload Dokumen Pendukung (SOP PMPJ) dengan format PDF",
+     "kolom": "Dokumen Pendukung (SOP PMPJ) (Q2)", "kolom_hash": "SHA-256 Dokumen (Q2)"},
+]
+
+# --- Pertanyaan kepatuhan (jawaban YA / TIDAK); "kolom" = header di sheet ---
+PERTANYAAN = [
+    {"kolom": "1.  Apakah Kantor Notaris anda memiliki mekanisme analisis risiko Pengguna Jasa? (form cdd, edd dan analisa resiko)", "dokumen": 0,
+     "label": "1. Apakah Kantor Notaris anda memiliki mekanisme analisis risiko Pengguna Jasa? (form cdd, edd dan analisa resiko)?"},
+    {"kolom": "2.  Apakah Kantor Notaris anda memiliki kebijakan dan prosedur untuk mengelola dan memitigasi risiko tinggi ... Pasal 17 PerMenkumham 9/2017?", "dokumen": 1,
+     "label": "2.  Apakah Kantor Notaris anda memiliki kebijakan dan prosedur untuk mengelola dan memitigasi risiko tinggi pencucian uang dan/atau pendanaan terorisme, termasuk PEP dan negara yang berisiko tinggi sebagaimana diatur dalam Pasal 17 PerMenkumham Nomor 9 Tahun 2017?"},
+    {"kolom": "3.  Apakah Kantor Notaris anda memiliki kebijakan dan prosedur untuk mengelola dan memitigasi risiko sedang pencucian uang dan/atau pendanaan terorisme sebagaimana diatur dalam Pasal 7 PerMenkumham Nomor 9 Tahun 2017?",
+     "label": "3.  Apakah Kantor Notaris anda memiliki kebijakan dan prosedur untuk mengelola dan memitigasi risiko sedang pencucian uang dan/atau pendanaan terorisme sebagaimana diatur dalam Pasal 7 PerMenkumham Nomor 9 Tahun 2017?"},
+    {"kolom": "4.  Apakah Kantor Notaris anda memiliki kebijakan dan prosedur untuk mengelola dan memitigasi risiko rendah pencucian uang dan/atau pendanaan terorisme sebagaimana diatur dalam Pasal 16 PerMenkumham Nomor 9 Tahun 2017?",
+     "label": "4.  Apakah Kantor Notaris anda memiliki kebijakan dan prosedur untuk mengelola dan memitigasi risiko rendah pencucian uang dan/atau pendanaan terorisme sebagaimana diatur dalam Pasal 16 PerMenkumham Nomor 9 Tahun 2017?"},
+    {"kolom": "5.  Kebijakan larangan nama fiktif?",
+     "label": "5.  Apakah Kantor Notaris Anda memiliki kebijakan larangan untuk membuka atau memelihara hubungan usaha yang menggunakan nama fiktif?"},
+    {"kolom": "6.  Pengumpulan informasi OP (Pasal 7 ayat 1)?",
+     "label": "6.  Apakah Kantor Notaris Anda melakukan pengumpulan informasi pengguna jasa orang perseorangan sebagaimana dimaksud dalam Pasal 7 ayat (1) PerMenkumham Nomor 9 Tahun 2017?"},
+    {"kolom": "7.  Pengumpulan informasi Korporasi (Pasal 7 ayat 2)?",
+     "label": "7.  Apakah Kantor Notaris Anda melakukan pengumpulan informasi pengguna jasa korporasi sebagaimana dimaksud dalam Pasal 7 ayat (2) PerMenkumham Nomor 9 Tahun 2017?"},
+    {"kolom": "8.  Pengumpulan informasi legal arrangements?",
+     "label": "8.  Apakah Kantor Notaris Anda melakukan pengumpulan informasi pengguna jasa perikatan lainnya (legal arrangements) sebagaimana dimaksud dalam Pasal 7 ayat (1) PerMenkumham Nomor 9 Tahun 2017?"},
+    {"kolom": "9.  Pengumpulan BO Korporasi (Pasal 8)?",
+     "label": "9.  Apakah Kantor Notaris Anda melakukan pengumpulan informasi Beneficial Owner (Pemilik Manfaat) dari Korporasi sebagaimana dimaksud dalam Pasal 8 PerMenkumham Nomor 9 Tahun 2017?"},
+    {"kolom": "10. Pengumpulan BO legal arrangement (Pasal 9)?",
+     "label": "10.  Apakah Kantor Notaris Anda melakukan pengumpulan informasi Beneficial Owner (Pemilik Manfaat) dari perikatan lainnya (legal arrangement) sebagaimana dimaksud dalam Pasal 9 PerMenkumham Nomor 9 Tahun 2017?"},
+    {"kolom": "11. Kebijakan bertemu langsung dengan pengguna jasa?",
+     "label": "11.  Apakah Kantor Notaris Anda memliliki kebijakan bertemu langsung dengan pegguna jasa dalam rangka pengumpulan informasi pengguna jasa?"},
+    {"kolom": "12. Konfirmasi kebenaran formil dokumen ke pengguna jasa?",
+     "label": "12. Apakah Kantor Notaris Anda melakukan konfirmasi atas dokumen Pengguna Jasa melalui meminta keterangan kepada pengguna jasa untuk mengetahui kebenaran formil dokumen dimaksud?"},
+    {"kolom": "13. Meminta dokumen pendukung dari otoritas berwenang bila ragu?",
+     "label": "13. Apakah Kantor Notaris Anda memiliki kebijakan untuk meminta dokumen pendukung lainnya dari pihak yang berwenang dalam hal terdapat keraguan atas kebenaran formil dokumen?"},
+    {"kolom": "14. Pemantauan kewajaran transaksi?",
+     "label": "14. Apakah Kantor Notaris anda melakukan pemantauan kewajaran transaksi pengguna jasa?"},
+    {"kolom": "15. Pencatatan transaksi pengguna jasa?",
+     "label": "15. Apakah Kantor Notaris anda melakukan pencatatan transaksi pengguna jasa?"},
+    {"kolom": "16. Sistem informasi identifikasi/pemantauan/laporan transaksi?",
+     "label": "16. Apakah Kantor Notaris Anda memiliki sistem informasi mengenai identifikasi, pemantauan transaksi, dan penyediaan laporan mengenai transaksi yang dilakukan oleh pengguna jasa?"},
+    {"kolom": "17. Penatausahaan dokumen transaksi & BO?",
+     "label": "17. Apakah Kantor Notaris anda menatausahakan dokumen seluruh informasi dan dokumen transaksi pengguna jasa dan beneficial owner (pemilik manfaat)?"},
+    {"kolom": "18. Penatausahaan dokumen PJP & BO (prinsip PJP)?",
+     "label": "18. Apakah Kantor Notaris anda menatausahakan dokumen seluruh informasi dan dokumen pengguna jasa dan beneficial owner (pemilik manfaat) yang diperoleh dalam rangka penerapan prinsip mengenali pengguna jasa?"},
+    {"kolom": "19. Penatausahaan dokumen analisis kewajaran transaksi?",
+     "label": "19. Apakah Kantor Notaris anda menatausahakan dokumen analisis kewajaran atas transaksi pengguna jasa dan beneficial owner (pemilik manfaat)?"},
+    {"kolom": "20. Putus hubungan bila PJP menolak prinsip PJP?",
+     "label": "20. Apakah Kantor Notaris anda akan memutuskan hubungan usaha dengan pengguna jasa jika Pengguna Jasa menolak untuk mematuhi prinsip mengenali Pengguna Jasa?"},
+    {"kolom": "21. Putus hubungan bila info PJP diragukan?",
+     "label": "21. Apakah Kantor Notaris anda akan memutuskan hubungan usaha dengan pengguna jasa jika Notaris meragukan kebenaran informasi yang disampaikan oleh Pengguna Jasa?"},
+    {"kolom": "22. Laporkan ke PPATK atas tindakan di no.20 & no.21?",
+     "label": "22. Apakah Kantor Notaris anda akan melaporkan kepada PPATK mengenai tindakan sebagaimana dimaksud pada pertanyaan nomor 20 dan nomor 21 di atas?"},
+    {"kolom": "23. Pemutakhiran informasi & dokumen PJP bila ada perubahan?",
+     "label": "23. Apakah Kantor Notaris anda melakukan upaya pemutakhiran informasi dan dokumen pengguna jasa dalam hal terdapat perubahan yang diketahui oleh Notaris yang bersumber dari Pengguna Jasa yang sama atau informasi lain yang dapat dipertanggungjawabkan?"},
+    {"kolom": "24. Dokumentasi hasil pemutakhiran?",
+     "label": "24. Apakah Kantor Notaris Anda mendokumentasikan hasil pemutakhiran informasi dan/atau dokumen sebagaimana dimaksud dalam pertanyaan Nomor 23?"},
+    {"kolom": "25. Pemeriksaan berkala penerapan prinsip PJP?",
+     "label": "25. Apakah Kantor Notaris Anda melakukan pengendalian internal melalui pelaksanaan pemeriksaan berkala terhadap penerapan prinsip mengenali Pengguna Jasa?"},
+    {"kolom": "26. Pemutakhiran daftar PJP/kuasa berisiko tinggi?",
+     "label": "26. Apakah Kantor Notaris Anda melakukan pengendalian internal melalui Pemutakhiran daftar Pengguna Jasa atau pemberi kuasa yang memenuhi kriteria berisiko tinggi?"},
+    {"kolom": "27. Screening penerimaan karyawan (pre-employee)?",
+     "label": "27. Apakah Kantor Notaris Anda melakukan prosedur penyaringan untuk penerimaan karyawan baru (pre-employee screening)?"},
+    {"kolom": "28. Pengenalan & pemantauan profil karyawan?",
+     "label": "28. Apakah Kantor Notaris Anda melakukan pengenalan dan pemantauan terhadap profil karyawan?"},
+    {"kolom": "29. Sosialisasi/perlatihan regulasi PJP?",
+     "label": "29. Apakah Kantor Notaris anda melakukan sosialisasi atau pelatihan mengenai penerapan peraturan perundang-undangan yang terkait dengan prinsip mengenali Pengguna Jasa? (baik diselenggarakan secara mandiri atau instansi terkait)"},
+    {"kolom": "30. Sosialisasi/perlatihan tipologi TPPU/TPPT?",
+     "label": "30. Apakah Kantor Notaris anda melakukan sosialisasi atau pelatihan mengenai teknik, metode, dan tipologi pencucian uang dan/atau pendanaan terorisme? (baik diselenggarakan secara mandiri atau instansi terkait)"},
+    {"kolom": "31. Sosialisasi/perlatihan kebijakan & prosedur PJP?",
+     "label": "31. Apakah Kantor Notaris anda melakukan sosialisasi atau pelatihan mengenai kebijakan dan prosedur penerapan prinsip mengenali Pengguna Jasa serta peran dan tanggung jawab pegawai dalam mencegah dan memberantas pencucian uang dan/atau pendanaan terorisme? (baik diselenggarakan secara mandiri atau instansi terkait)"},
+    {"kolom": "32. Pemanfaatan teknologi baru?",
+     "label": "32. Apakah Kantor Notaris Anda memanfaatkan teknologi baru dalam memberikan pelayanan kepada pengguna jasa?"},
+    {"kolom": "33. Identifikasi & pengukuran risiko sebelum adopsi teknologi baru?",
+     "label": "33. Apabila jawaban Nomor 32 adalah iya, apakah Kantor Notaris Anda melakukan pengidentifikasian dan pengukuran mengenai risiko terjadinya tindak pidana pencucian uang dan pendanaan terorisme, sebelum pemanfaatan atau pengembangan teknologi baru tersebut pada pertanyaan Nomor 32?"},
+    {"kolom": "34. Kerja sama dengan penegak hukum & otoritas berwenang?",
+     "label": "34.  Apakah Kantor Notaris anda pernah melakukan kerja sama dengan penegak hukum dan otoritas yang berwenang untuk memberantas tindak pidana pencucian uang dan pendanaan terorisme?"},
+]
+
+KOLOM_RINGKASAN = [
+    "Nilai Inherent Risk", "Tingkat Inherent Risk",
+    "Nilai Internal Control", "Tingkat Internal Control",
+    "Tingkat Residual Risk", "Nilai Residual Risk",
+    "Nilai Risiko Pengguna Jasa", "Tingkat Risiko Pengguna Jasa", "Tingkat Risiko", "Versi Aturan",
+    KOLOM_STATUS_VALIDASI,
+]
+
+# --- Form ---
+FORM = {
+    "kanwil": {
+        "identitas": _IDENTITAS_AWAL + [
+            {"kolom": "2. Alamat Lengkap Kantor Notaris", "label": "Alamat Lengkap Kantor Notaris"},
+            {"kolom": "Kedudukan Kota/Kabupaten", "label": "Pilih Kedudukan Kota/Kabupaten", "pilihan": DAFTAR_KOTA},
+            {"kolom": KOLOM_WILAYAH, "label": "Pilih Wilayah Provinsi Kedudukan", "pilihan_aturan": "wilayah_skor"},
+        ],
+        # Urutan kolom identitas di sheet (berbeda dengan urutan widget)
+        "kolom_identitas": [
+            KOLOM_TIMESTAMP, KOLOM_NAMA, KOLOM_NIK, KOLOM_USERNAME, KOLOM_HP, KOLOM_WILAYAH,
+            "2. Alamat Lengkap Kantor Notaris", "Kedudukan Kota/Kabupaten", KOLOM_JUMLAH_KLIEN,
+        ],
+        "kolom_pilihan": [
+            KOLOM_APGAKKUM, "jawaban_profil", "skor_profil", "jawaban_bisnis", "skor_bisnis",
+            "jawaban_jasa", "skor_jasa", "jawaban_negara", "skor_negara", "skor_wilayah",
+            "jawaban_apgakkum", "skor_apgakkum",
+        ],
+    },
+    "q1q2": {
+        "identitas": _IDENTITAS_AWAL + [
+            {"kolom": "2. Alamat Lengkap Notaris", "label": "Alamat Lengkap Notaris"},
+            {"kolom": "Kota/Kabupaten", "label": "Pilih Kota/Kabupaten", "pilihan": DAFTAR_KOTA},
+        ],
+        "kolom_identitas": [
+            KOLOM_TIMESTAMP, KOLOM_NAMA, KOLOM_NIK, KOLOM_USERNAME, KOLOM_HP,
+            "2. Alamat Lengkap Notaris", "Kota/Kabupaten", KOLOM_JUMLAH_KLIEN,
+        ],
+        "kolom_pilihan": [
+            KOLOM_APGAKKUM, "jawaban_profil", "skor_profil", "jawaban_bisnis", "skor_bisnis",
+            "jawaban_jasa", "skor_jasa", "jawaban_negara", "skor_negara",
+            "jawaban_apgakkum", "skor_apgakkum",
+        ],
+    },
+}
+
+
+def pilihan(field, aturan):
+    """Daftar pilihan selectbox / radio sebuah field, atau None untuk text input."""
+    if "pilihan_aturan" in field:
+        return list(aturan.bobot[field["pilihan_aturan"]])
+    return field.get("pilihan")
+
+
+def column_order(jenis, aturan):
+    """Urutan kolom sheet form `jenis`: identitas, jumlah per pilihan, pertanyaan & dokumen, pilihan, ringkasan."""
+    form = FORM[jenis]
+    detail = [opsi for b in BAGIAN_JUMLAH for opsi in aturan.bobot[b["bagian"]]]
+    pertanyaan = [p["kolom"] for p in PERTANYAAN]
+    dokumen = [d["kolom"] for d in DOKUMEN] + [d["kolom_hash"] for d in DOKUMEN]
+    return form["kolom_identitas"] + detail + pertanyaan + dokumen + form["kolom_pilihan"] + KOLOM_RINGKASAN
+
+
+def baris(jenis, jawaban):
+    """
+    Baris dasar dari jawaban form (lihat form_kuisioner.jawaban): identitas,
+    jumlah klien per pilihan, jawaban pertanyaan dan APGAKKUM. Kolom dokumen
+    dikosongkan (diisi worker); timestamp & hasil penilaian ditambah pemanggil.
+    """
+    data = dict(jawaban["identitas"])
+    data[KOLOM_NAMA] = data[KOLOM_NAMA].title()
+    data[KOLOM_JUMLAH_KLIEN] = sum(jawaban["jumlah"]["profil"].values())
+    for b in BAGIAN_JUMLAH:
+        data.update(jawaban["jumlah"][b["bagian"]])
+    data.update(jawaban["pertanyaan"])
+    for d in DOKUMEN:
+        data[d["kolom"]] = ""
+    data[KOLOM_APGAKKUM] = jawaban["apgakkum"]
+    return data
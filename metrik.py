@@ -0,0 +1,210 @@
+"""
+Metrik latensi & throughput jalur submit.
+
+Setiap tahap (ekstraksi text layer, render halaman, tesseract, pencocokan
+kata kunci, upload Drive, baca/tulis Google Sheets, ...) diukur dengan
+waktu("tahap") / amati(). Hasilnya masuk histogram per proses dan, bila ada
+jejak submit yang aktif (jejak()), dijumlahkan ke satu baris JSON per
+submit di PATH_LOG_JEJAK (PMPJ_LOG_JEJAK, default data/jejak.jsonl; kosong =
+tidak ditulis) sehingga submit yang lambat bisa dilacak tahapnya. Baris yang
+sama juga dikirim ke logger "metrik" bila aplikasi mengonfigurasi logging.
+
+Semua metrik proses ditulis dalam format teks Prometheus ke PATH_METRIK
+(PMPJ_METRIK, default data/metrik.prom; kosong = tidak ditulis), cocok untuk
+textfile collector node_exporter.
+"""
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+PATH_METRIK = os.environ.get("PMPJ_METRIK", os.path.join("data", "metrik.prom"))
+PATH_LOG_JEJAK = os.environ.get("PMPJ_LOG_JEJAK", os.path.join("data", "jejak.jsonl"))
+AWALAN = "pmpj_"
+
+# Batas bucket histogram (detik)
+BATAS_DETIK = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 180.0)
+
+# Keterangan (# HELP) metrik yang dikenal
+KETERANGAN = {
+    "tahap_detik": "Durasi per tahap pipeline submit",
+    "submit_detik": "Durasi total satu pekerjaan submit / sinkronisasi",
+    "submit_total": "Jumlah pekerjaan per jenis & status",
+    "halaman_total": "Halaman PDF yang dibaca, per sumber teks (text_layer / ocr)",
+    "dokumen_total": "Dokumen yang divalidasi; ocr=ya bila ada halaman yang perlu OCR",
+    "ocr_eskalasi_total": "Halaman OCR yang dirender ulang di resolusi lebih tinggi",
+    "cache_dokumen_total": "Hasil lookup cache validasi dokumen (hit / miss)",
+    "google_api_total": "Panggilan Google API per layanan & operasi",
+    "google_cache_total": "Pengambilan objek koneksi Google per objek (hit / miss cache, refresh token)",
+    "unggah_dedup_total": "Upload Drive: isi baru vs dipakai ulang dari file dengan SHA-256 sama",
+    "unggah_coba_ulang_total": "Request upload Drive yang diulang setelah gagal sementara",
+}
+
+logger = logging.getLogger("metrik")
+
+_kunci = threading.Lock()
+_kunci_log = threading.Lock()
+_histogram = {}    # (nama, label) -> [hitungan per bucket..., jumlah, total]
+_penghitung = {}   # (nama, label) -> nilai
+_jejak = contextvars.ContextVar("jejak_submit", default=None)
+
+
+def _label(label):
+    return tuple(sorted((k, str(v)) for k, v in label.items()))
+
+
+# --- Pencatatan ---
+def amati(nama, nilai, **label):
+    """Tambahkan satu observasi ke histogram `nama`."""
+    kunci = (nama, _label(label))
+    with _kunci:
+        h = _histogram.get(kunci)
+        if h is None:
+            h = _histogram[kunci] = [0] * (len(BATAS_DETIK) + 2)
+        for i, batas in enumerate(BATAS_DETIK):
+            if nilai <= batas:
+                h[i] += 1
+        h[-2] += nilai
+        h[-1] += 1
+
+
+def tambah(nama, jumlah=1, **label):
+    """Naikkan penghitung `nama` (dan hitungan di jejak submit aktif)."""
+    kunci = (nama, _label(label))
+    with _kunci:
+        _penghitung[kunci] = _penghitung.get(kunci, 0) + jumlah
+        jejak_aktif = _jejak.get()
+        if jejak_aktif is not None:
+            nama_log = nama + "".join(f".{v}" for _, v in kunci[1])
+            jejak_aktif["hitungan"][nama_log] = jejak_aktif["hitungan"].get(nama_log, 0) + jumlah
+
+
+def nilai(nama, **label):
+    """Nilai penghitung `nama` dengan label persis ini di proses ini (0 bila belum ada)."""
+    with _kunci:
+        return _penghitung.get((nama, _label(label)), 0)
+
+
+def catat_tahap(tahap, detik):
+    """Durasi satu tahap: histogram tahap_detik + dijumlahkan di jejak submit aktif."""
+    amati("tahap_detik", detik, tahap=tahap)
+    jejak_aktif = _jejak.get()
+    if jejak_aktif is not None:
+        with _kunci:
+            jejak_aktif["tahap"][tahap] = jejak_aktif["tahap"].get(tahap, 0.0) + detik
+
+
+@contextmanager
+def waktu(tahap):
+    """Ukur durasi blok sebagai tahap `tahap` (tetap dicatat bila blok error)."""
+    awal = time.perf_counter()
+    try:
+        yield
+    finally:
+        catat_tahap(tahap, time.perf_counter() - awal)
+
+
+@contextmanager
+def jejak(jenis, **info):
+    """
+    Jejak satu submit / batch: semua tahap & hitungan di dalam blok (termasuk
+    thread yang dijalankan lewat contextvars.copy_context()) dijumlahkan lalu
+    ditulis sebagai satu baris log JSON saat blok selesai. Mengembalikan dict
+    jejak; isi kunci "status" untuk mengganti status default ('selesai').
+    """
+    data = {"jenis": jenis, **info, "status": "selesai", "tahap": {}, "hitungan": {}}
+    token = _jejak.set(data)
+    awal = time.perf_counter()
+    try:
+        yield data
+    except BaseException:
+        data["status"] = "gagal"
+        raise
+    finally:
+        _jejak.reset(token)
+        data["detik"] = round(time.perf_counter() - awal, 4)
+        data["tahap"] = {k: round(v, 4) for k, v in data["tahap"].items()}
+        amati("submit_detik", data["detik"], jenis=jenis)
+        tambah("submit_total", jenis=jenis, status=data["status"])
+        baris = json.dumps(data, ensure_ascii=False, default=str)
+        _tulis_jejak(baris)
+        logger.info("%s", baris)
+
+
+def _tulis_jejak(baris, path=None):
+    """Tambahkan satu baris JSON jejak ke PATH_LOG_JEJAK (tanpa bergantung konfigurasi logging)."""
+    path = PATH_LOG_JEJAK if path is None else path
+    if not path:
+        return
+    try:
+        with _kunci_log:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(baris + "\n")
+    except OSError as e:
+        logger.warning("Log jejak %s tidak bisa ditulis: %s", path, e)
+
+
+# --- Ekspor ---
+def _format_label(label, tambahan=()):
+    isi = [(k, v) for k, v in label] + list(tambahan)
+    if not isi:
+        return ""
+    return "{" + ",".join(
+        f'{k}="' + v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"' for k, v in isi
+    ) + "}"
+
+
+def teks_prometheus():
+    """Semua metrik proses dalam format teks Prometheus (exposition 0.0.4)."""
+    with _kunci:
+        histogram = {k: list(v) for k, v in _histogram.items()}
+        penghitung = dict(_penghitung)
+
+    baris = []
+    for nama in sorted({n for n, _ in penghitung}):
+        lengkap = AWALAN + nama
+        baris.append(f"# HELP {lengkap} {KETERANGAN.get(nama, nama)}")
+        baris.append(f"# TYPE {lengkap} counter")
+        for (n, label), nilai in sorted(penghitung.items()):
+            if n == nama:
+                baris.append(f"{lengkap}{_format_label(label)} {nilai}")
+
+    for nama in sorted({n for n, _ in histogram}):
+        lengkap = AWALAN + nama
+        baris.append(f"# HELP {lengkap} {KETERANGAN.get(nama, nama)}")
+        baris.append(f"# TYPE {lengkap} histogram")
+        for (n, label), h in sorted(histogram.items()):
+            if n != nama:
+                continue
+            for batas, jumlah in zip(BATAS_DETIK, h):
+                baris.append(f"{lengkap}_bucket{_format_label(label, [('le', repr(batas))])} {jumlah}")
+            baris.append(f"{lengkap}_bucket{_format_label(label, [('le', '+Inf')])} {h[-1]}")
+            baris.append(f"{lengkap}_sum{_format_label(label)} {h[-2]:.6f}")
+            baris.append(f"{lengkap}_count{_format_label(label)} {h[-1]}")
+    return "\n".join(baris) + "\n"
+
+
+def tulis(path=PATH_METRIK):
+    """Tulis teks_prometheus() ke file secara atomik (tmp + rename)."""
+    if not path:
+        return
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        sementara = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(sementara, "w", encoding="utf-8") as f:
+            f.write(teks_prometheus())
+        os.replace(sementara, path)
+    except OSError as e:
+        logger.warning("File metrik %s tidak bisa ditulis: %s", path, e)
+
+
+def reset():
+    """Kosongkan semua metrik proses (untuk benchmark / uji)."""
+    with _kunci:
+        _histogram.clear()
+        _penghitung.clear()
@@ -0,0 +1,84 @@
+"""
+Pencocokan kata kunci toleran OCR tanpa membangun SequenceMatcher per posisi.
+
+Keputusan ditemukan / tidak ditemukan sama persis dengan loop difflib lama:
+SequenceMatcher.ratio() tidak pernah melebihi batas atas histogram huruf
+(= quick_ratio: 2 * jumlah huruf sekutu / total panjang). Batas itu dihitung
+untuk setiap jendela teks dengan jendela geser (O(1) per karakter), dan
+ratio() yang mahal hanya dihitung untuk kandidat yang lolos batas atas.
+Untuk mode token, token kembar dicek sekali dan token yang panjangnya saja
+sudah membuat rasio <= ambang dilewati.
+"""
+from collections import Counter
+from difflib import SequenceMatcher
+
+
+def cari_jendela_mirip(kata, teks, ambang, lebih=3, awal=0, akhir=None):
+    """
+    Setara dengan:
+        any(SequenceMatcher(None, kata, teks[i:i + len(kata) + lebih]).ratio() > ambang
+            for i in range(awal, min(akhir, len(teks) - len(kata) + 1)))
+    tetapi linear dalam panjang teks. `akhir` (eksklusif) membatasi posisi
+    awal jendela, mis. agar jendela di ujung teks yang masih akan bertambah
+    belum dicek.
+    """
+    panjang = len(kata)
+    lebar = panjang + lebih
+    akhir = len(teks) - panjang + 1 if akhir is None else min(akhir, len(teks) - panjang + 1)
+    if awal >= akhir:
+        return False
+
+    butuh = Counter(kata)
+    isi = dict.fromkeys(butuh, 0)   # jumlah tiap huruf kata di jendela
+    sekutu = 0                      # sum(min(butuh[c], isi[c]))
+    for c in teks[awal:awal + lebar]:
+        if c in isi:
+            if isi[c] < butuh[c]:
+                sekutu += 1
+            isi[c] += 1
+
+    for i in range(awal, akhir):
+        total = panjang + min(lebar, len(teks) - i)
+        if 2.0 * sekutu / total > ambang:
+            if SequenceMatcher(None, kata, teks[i:i + lebar]).ratio() > ambang:
+                return True
+
+        # Geser jendela satu karakter
+        c = teks[i]
+        if c in isi:
+            isi[c] -= 1
+            if isi[c] < butuh[c]:
+                sekutu -= 1
+        if i + lebar < len(teks):
+            c = teks[i + lebar]
+            if c in isi:
+                if isi[c] < butuh[c]:
+                    sekutu += 1
+                isi[c] += 1
+    return False
+
+
+def siapkan_token(teks, panjang_min=4):
+    """Token unik (panjang >= panjang_min) beserta histogram hurufnya."""
+    unik = dict.fromkeys(t for t in teks.split() if len(t) >= panjang_min)
+    return [(t, Counter(t)) for t in unik]
+
+
+def cari_token_mirip(kata, token_siap, ambang):
+    """
+    Setara dengan any(SequenceMatcher(None, kata, t).ratio() > ambang for t in token),
+    dengan token_siap hasil siapkan_token().
+    """
+    panjang = len(kata)
+    butuh = Counter(kata)
+    for token, histogram in token_siap:
+        total = panjang + len(token)
+        # Batas atas dari panjang saja (real_quick_ratio), lalu dari histogram (quick_ratio)
+        if 2.0 * min(panjang, len(token)) / total <= ambang:
+            continue
+        sekutu = sum(min(n, histogram[c]) for c, n in butuh.items())
+        if 2.0 * sekutu / total <= ambang:
+            continue
+        if SequenceMatcher(None, kata, token).ratio() > ambang:
+            return True
+    return False
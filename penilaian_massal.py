@@ -0,0 +1,181 @@
+"""
+Penilaian ulang seluruh tabel hasil penilaian sekaligus (vektor).
+
+Bila bobot di aturan_penilaian.json (`profil`, `negara`, `wilayah_skor` dsb.)
+berubah, semua baris tersimpan harus dinilai ulang. Fungsi di sini memproses
+DataFrame berisi semua submit dengan operasi array (argmax kolom jumlah,
+indeks matriks risiko) dan hasilnya sama persis dengan fungsi per-submit di
+penilaian_risiko.py (hitung_risiko, hitung_residual_risk,
+risiko_pengguna_jasa, tingkat_risiko). Internal control tidak dihitung
+ulang (butuh OCR dokumen); nilai tersimpan di kolom "Tingkat Internal
+Control" dipakai.
+"""
+import numpy as np
+import pandas as pd
+
+import aturan_penilaian
+
+
+KOLOM_APGAKKUM = "Apakah Notaris pernah dipanggil atau diminta informasi oleh Aparat Penegak Hukum?"
+KOLOM_JUMLAH_KLIEN = "3. Jumlah Klien Tahun 2024-2025"
+KOLOM_WILAYAH = "Wilayah"
+KOLOM_INTERNAL_CONTROL = "Tingkat Internal Control"
+KOLOM_VERSI_ATURAN = "Versi Aturan"
+
+# Bagian bobot -> awalan kolom jawaban_*/skor_* di baris tersimpan
+NAMA_KOLOM = {"profil": "profil", "bisnis_pengguna": "bisnis", "jasa": "jasa", "negara": "negara"}
+
+
+def _tabel(aturan):
+    """Tabel numpy dari aturan yang sudah dikompilasi (dibuat sekali per versi aturan)."""
+    tabel = aturan.turunan.get("numpy")
+    if tabel is None:
+        tabel = {
+            "label": {b: np.array(aturan.label[b], dtype=object) for b in aturan_penilaian.BAGIAN_PILIHAN},
+            "skor": {b: np.array(aturan.skor[b], dtype=np.int64) for b in aturan_penilaian.BAGIAN_PILIHAN},
+            "kategori_per_total": np.array(aturan.kategori_per_total, dtype=object),
+            "residual": np.array(aturan.residual, dtype=object),
+            "prioritas": np.array(
+                [list(baris) + [None] for baris in aturan.prioritas] + [[None] * (aturan.ukuran_prioritas + 1)],
+                dtype=object
+            ),
+            "batas_klien": np.array(aturan.batas_klien, dtype=float),
+            "kategori_per_nilai": np.array(
+                [None] + [aturan.kategori_per_nilai[n] for n in range(1, len(aturan.batas_klien) + 2)], dtype=object
+            ),
+        }
+        aturan.turunan["numpy"] = tabel
+    return tabel
+
+
+def _pilih_terbesar(df, aturan, bagian):
+    """
+    Per baris: kolom jumlah terbesar (pertama bila seri) beserta skornya;
+    default bila semua jumlah 0. Kolom yang tidak ada dianggap 0.
+    """
+    tabel = _tabel(aturan)
+    label = aturan.label[bagian]
+    jumlah = (
+        df.reindex(columns=list(label)).apply(pd.to_numeric, errors="coerce").fillna(0).to_numpy()
+        if len(df) else np.zeros((0, len(label)))
+    )
+    default = aturan.pilihan_default[bagian]
+
+    terbaik = jumlah.argmax(axis=1)
+    kosong = (jumlah == 0).all(axis=1)
+    jawaban = np.where(kosong, default, tabel["label"][bagian][terbaik])
+    nilai = np.where(kosong, aturan.bobot[bagian].get(default, 0), tabel["skor"][bagian][terbaik])
+    return jawaban, nilai
+
+
+def _peta(nilai, mapping_dict, default=0):
+    """Lookup mapping_dict per elemen (setara mapping_dict.get(x, default))."""
+    return pd.Series(nilai, dtype=object).map(mapping_dict).fillna(default).to_numpy()
+
+
+def _kolom(df, nama):
+    return df.get(nama, pd.Series(None, index=df.index, dtype=object)).to_numpy()
+
+
+def nilai_inherent(df, per_wilayah=True, aturan=None):
+    """
+    Inherent risk untuk semua baris. per_wilayah: skor dari kolom Wilayah
+    (form Kanwil); False = skor wilayah tetap (form q1q2).
+    Mengembalikan DataFrame kolom jawaban_*/skor_* + Nilai/Tingkat Inherent Risk.
+    """
+    aturan = aturan or aturan_penilaian.muat()
+    hasil = pd.DataFrame(index=df.index)
+    total = np.zeros(len(df), dtype=np.int64)
+    for bagian in aturan_penilaian.BAGIAN_PILIHAN:
+        jawaban, skor = _pilih_terbesar(df, aturan, bagian)
+        hasil[f"jawaban_{NAMA_KOLOM[bagian]}"] = jawaban
+        hasil[f"skor_{NAMA_KOLOM[bagian]}"] = skor
+        total += skor.astype(np.int64)
+
+    apgakkum = _kolom(df, KOLOM_APGAKKUM)
+    hasil["jawaban_apgakkum"] = apgakkum
+    hasil["skor_apgakkum"] = _peta(apgakkum, aturan.bobot["apgakkum"]).astype(np.int64)
+    total += hasil["skor_apgakkum"].to_numpy()
+
+    if per_wilayah:
+        jawaban_wilayah = _kolom(df, KOLOM_WILAYAH)
+        hasil["jawaban_wilayah"] = jawaban_wilayah
+        hasil["skor_wilayah"] = _peta(jawaban_wilayah, aturan.bobot["wilayah_skor"]).astype(np.int64)
+        total += hasil["skor_wilayah"].to_numpy()
+    else:
+        total += aturan.skor_wilayah_tetap
+
+    kategori_per_total = _tabel(aturan)["kategori_per_total"]
+    dalam_tabel = (total >= 0) & (total < len(kategori_per_total))
+    hasil["Nilai Inherent Risk"] = total
+    hasil["Tingkat Inherent Risk"] = np.where(
+        dalam_tabel, kategori_per_total[np.where(dalam_tabel, total, 0)], aturan.di_luar_rentang
+    )
+    return hasil
+
+
+def nilai_residual(kategori_inherent, kategori_internal, aturan=None):
+    """Versi array hitung_residual_risk: (kategori residual, nilai residual)."""
+    aturan = aturan or aturan_penilaian.muat()
+    # Kategori tak dikenal -> indeks terakhir (default hitung_residual_risk)
+    i = _peta(kategori_internal, aturan.indeks_ic, len(aturan.kategori_ic)).astype(np.int64)
+    j = _peta(kategori_inherent, aturan.indeks_risiko, len(aturan.kategori_risiko)).astype(np.int64)
+    kategori = _tabel(aturan)["residual"][i, j]
+    return kategori, _peta(kategori, aturan.nilai_risiko, max(aturan.nilai_risiko.values())).astype(np.int64)
+
+
+def nilai_pengguna_jasa(jumlah_klien, aturan=None):
+    """Versi array risiko_pengguna_jasa: (nilai 1..n, kategori)."""
+    tabel = _tabel(aturan or aturan_penilaian.muat())
+    jumlah = pd.to_numeric(pd.Series(jumlah_klien, dtype=object), errors="coerce").to_numpy(dtype=float)
+    # Posisi pertama batas >= jumlah; NaN (perbandingan selalu False) jatuh ke nilai tertinggi
+    nilai = np.searchsorted(tabel["batas_klien"], jumlah, side="left") + 1
+    return nilai.astype(np.int64), tabel["kategori_per_nilai"][nilai]
+
+
+def tingkat_risiko(nilai_residual, nilai_pengguna, aturan=None):
+    """
+    Versi array penilaian_risiko.tingkat_risiko (dipakai final_risk): kategori
+    akhir per elemen, None bila kombinasi tidak ada di matriks.
+    """
+    aturan = aturan or aturan_penilaian.muat()
+    ukuran = aturan.ukuran_prioritas
+
+    def indeks(nilai):
+        nilai = np.asarray(nilai)
+        sah = np.isin(nilai, np.arange(ukuran))
+        return np.where(sah, nilai, ukuran).astype(np.int64)   # di luar matriks -> baris/kolom None
+
+    return _tabel(aturan)["prioritas"][indeks(nilai_residual), indeks(nilai_pengguna)]
+
+
+def nilai_ulang(df, per_wilayah=True, aturan=None):
+    """
+    Nilai ulang semua baris dengan aturan terkini: inherent, residual, risiko
+    pengguna jasa & tingkat risiko, plus kolom Versi Aturan.
+    Mengembalikan salinan df dengan kolom hasil diperbarui (nama kolom sama dengan form).
+    """
+    aturan = aturan or aturan_penilaian.muat()
+    hasil = df.copy()
+    inherent = nilai_inherent(df, per_wilayah, aturan)
+    for kolom in inherent.columns:
+        hasil[kolom] = inherent[kolom]
+
+    # Form Kanwil juga menyimpan skor setiap provinsi di kolom bernama provinsi
+    if per_wilayah:
+        for provinsi, skor in aturan.bobot["wilayah_skor"].items():
+            if provinsi in hasil.columns:
+                hasil[provinsi] = skor
+
+    kategori_residual, nilai_res = nilai_residual(
+        inherent["Tingkat Inherent Risk"].to_numpy(), _kolom(df, KOLOM_INTERNAL_CONTROL), aturan
+    )
+    hasil["Tingkat Residual Risk"] = kategori_residual
+    hasil["Nilai Residual Risk"] = nilai_res
+
+    nilai_peng, kategori_peng = nilai_pengguna_jasa(_kolom(df, KOLOM_JUMLAH_KLIEN), aturan)
+    hasil["Nilai Risiko Pengguna Jasa"] = nilai_peng
+    hasil["Tingkat Risiko Pengguna Jasa"] = kategori_peng
+    hasil["Tingkat Risiko"] = tingkat_risiko(nilai_res, nilai_peng, aturan)
+    hasil[KOLOM_VERSI_ATURAN] = aturan.versi
+    return hasil
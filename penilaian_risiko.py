@@ -0,0 +1,152 @@
+"""
+Perhitungan skor risiko yang dipakai bersama form Streamlit dan worker
+antrian_validasi.py: internal control, residual risk, risiko pengguna jasa
+dan tingkat risiko akhir. Bobot, batas kategori dan matriks diambil dari
+aturan_penilaian.json (lihat aturan_penilaian.py). Versi vektor untuk
+banyak baris ada di penilaian_massal.py.
+"""
+import aturan_penilaian
+
+
+
+# --- Fungsi hitung inherent risk ---
+def hitung_risiko(inputs, aturan=None):
+    """
+    Inherent risk satu submit.
+    inputs: {"profil", "bisnis", "jasa", "negara": {pilihan: jumlah klien}, "apgakkum": "YA"/"TIDAK",
+             "wilayah": provinsi (form Kanwil; tanpa kunci ini dipakai skor wilayah tetap)}
+    """
+    aturan = aturan or aturan_penilaian.muat()
+
+    def pilih_terbesar(bagian, user_inputs):
+        mapping_dict = aturan.bobot[bagian]
+        default = aturan.pilihan_default[bagian]
+        if all(v == 0 for v in user_inputs.values()):
+            return default, mapping_dict.get(default, 0)
+        terbaik = max(user_inputs, key=user_inputs.get)
+        return terbaik, mapping_dict.get(terbaik, 0)
+
+    jawaban_profil, skor_profil   = pilih_terbesar("profil", inputs["profil"])
+    jawaban_bisnis, skor_bisnis   = pilih_terbesar("bisnis_pengguna", inputs["bisnis"])
+    jawaban_jasa, skor_jasa       = pilih_terbesar("jasa", inputs["jasa"])
+    jawaban_negara, skor_negara   = pilih_terbesar("negara", inputs["negara"])
+    skor_apgakkum                 = aturan.bobot["apgakkum"].get(inputs["apgakkum"], 0)
+    if "wilayah" in inputs:
+        jawaban_wilayah = inputs["wilayah"]
+        skor_wilayah = aturan.bobot["wilayah_skor"].get(jawaban_wilayah, 0)
+    else:
+        skor_wilayah = aturan.skor_wilayah_tetap
+
+    total = skor_profil + skor_bisnis + skor_jasa + skor_negara + skor_apgakkum + skor_wilayah
+
+    if 0 <= total < len(aturan.kategori_per_total):
+        kategori = aturan.kategori_per_total[total]
+    else:
+        kategori = aturan.di_luar_rentang
+
+    hasil = {
+        "jawaban_profil": jawaban_profil, "skor_profil": skor_profil,
+        "jawaban_bisnis": jawaban_bisnis, "skor_bisnis": skor_bisnis,
+        "jawaban_jasa": jawaban_jasa,     "skor_jasa": skor_jasa,
+        "jawaban_negara": jawaban_negara, "skor_negara": skor_negara,
+        "jawaban_apgakkum": inputs["apgakkum"], "skor_apgakkum": skor_apgakkum,
+    }
+    if "wilayah" in inputs:
+        hasil.update({"jawaban_wilayah": jawaban_wilayah, "skor_wilayah": skor_wilayah})
+    hasil.update({"total_skor": total, "kategori_risiko": kategori, "versi_aturan": aturan.versi})
+    return hasil
+
+
+# --- Fungsi hitung internal control ---
+def hitung_internal_control_kanwil(q1, uploaded_file1, is_valid_ocr_q1):
+    """Internal control kuisioner Kanwil (hanya dokumen Q1); uploaded_file1 None jika tidak ada."""
+    if q1 == "TIDAK" or uploaded_file1 is None:
+        nilai = 141  # Lemah jika q1=TIDAK atau no file
+    else:  # q1 == "YA" dan file ada
+        nilai = 37 if is_valid_ocr_q1 else 141  # Sangat Baik jika valid, else Lemah
+    def kategori_ic(nilai):
+        if 37 <= nilai <= 62: return "Sangat Baik"
+        elif 63 <= nilai <= 88: return "Baik"
+        elif 89 <= nilai <= 114: return "Cukup"
+        elif 115 <= nilai <= 141: return "Lemah"
+        return "Diluar Rentang"
+    return nilai, kategori_ic(nilai)
+
+
+# ==========================================================
+# === FUNGSI HITUNG INTERNAL CONTROL (GABUNGAN Q1 & Q2) ===
+# ==========================================================
+def hitung_internal_control_q1q2(q1, q2, uploaded_file1, uploaded_file2, is_valid_ocr_q1, is_valid_ocr_q2):
+    """
+    Hitung nilai dan kategori internal control berdasarkan dua dokumen:
+    - Q1: CDD/EDD/Analisis Risiko
+    - Q2: SOP/Kebijakan/PMPJ
+    Logika:
+        - Jika dua-duanya benar -> nilai 37 (Sangat Baik)
+        - Jika hanya satu benar -> nilai 41 (Baik)
+        - Jika dua-duanya salah / tidak ada -> nilai 141 (Lemah)
+    """
+    # Kondisi lemah (tidak isi, tidak upload, atau jawab TIDAK)
+    if (
+        q1 == "TIDAK" or q2 == "TIDAK" or
+        (uploaded_file1 is None and uploaded_file2 is None)
+    ):
+        nilai = 141
+
+    else:
+        # Dua-duanya valid
+        if is_valid_ocr_q1 and is_valid_ocr_q2:
+            nilai = 37
+        # Salah satu valid
+        elif is_valid_ocr_q1 or is_valid_ocr_q2:
+            nilai = 41
+        # Dua-duanya tidak valid
+        else:
+            nilai = 141
+
+    # Kategori
+    def kategori_ic(nilai):
+        if nilai == 37: return "Sangat Baik"
+        elif nilai == 41: return "Baik"
+        elif 89 <= nilai <= 114: return "Cukup"
+        elif 115 <= nilai <= 141: return "Lemah"
+        return "Diluar Rentang"
+
+    return nilai, kategori_ic(nilai)
+
+
+# --- Residual Risk ---
+def hitung_residual_risk(kategori_inherent, kategori_internal, aturan=None):
+    aturan = aturan or aturan_penilaian.muat()
+    # Kategori tak dikenal -> indeks terakhir (default jika miss)
+    i = aturan.indeks_ic.get(kategori_internal, len(aturan.kategori_ic))
+    j = aturan.indeks_risiko.get(kategori_inherent, len(aturan.kategori_risiko))
+    kategori_residual = aturan.residual[i][j]
+    return kategori_residual, aturan.nilai_risiko.get(kategori_residual, max(aturan.nilai_risiko.values()))
+
+# --- Risiko Pengguna Jasa ---
+def risiko_pengguna_jasa(jumlah_klien, aturan=None):
+    aturan = aturan or aturan_penilaian.muat()
+    for nilai, batas in enumerate(aturan.batas_klien, start=1):
+        if jumlah_klien <= batas:
+            return nilai, aturan.kategori_per_nilai[nilai]
+    nilai = len(aturan.batas_klien) + 1
+    return nilai, aturan.kategori_per_nilai[nilai]
+
+# --- Final Risk Priority ---
+def tingkat_risiko(nilai_residual, nilai_pengguna, aturan=None):
+    """Tingkat risiko akhir satu submit; None bila kombinasi nilai di luar matriks."""
+    aturan = aturan or aturan_penilaian.muat()
+    sah = range(aturan.ukuran_prioritas)
+    if nilai_residual not in sah or nilai_pengguna not in sah:
+        return None
+    return aturan.prioritas[int(nilai_residual)][int(nilai_pengguna)]
+
+
+def final_risk(df, aturan=None):
+    """Isi kolom "Tingkat Risiko" semua baris df sekaligus (lookup tabel 2-D, tanpa apply per baris)."""
+    import penilaian_massal  # numpy/pandas hanya dimuat bila dipakai
+    df["Tingkat Risiko"] = penilaian_massal.tingkat_risiko(
+        df["Nilai Residual Risk"].to_numpy(), df["Nilai Risiko Pengguna Jasa"].to_numpy(), aturan
+    )
+    return df
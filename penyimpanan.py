@@ -0,0 +1,366 @@
+"""
+Penyimpanan hasil penilaian ke Google Sheets.
+
+Mode "upsert" hanya menyentuh satu baris per submit: menambah baris baru di
+bawah, atau menulis ulang baris lama yang kuncinya (NIK, opsional + nama)
+sama. Biaya per submit tetap konstan walaupun sheet sudah berisi ribuan
+notaris. Mode "tulis_ulang" adalah cara lama (baca semua, clear, tulis semua)
+dan dipakai otomatis bila header sheet belum sesuai column_order.
+
+Nomor baris untuk setiap kunci disimpan di indeks SQLite lokal (IndeksBaris)
+sehingga cek duplikat tidak perlu membaca kolom kunci dari sheet. Indeks
+dibangun ulang hanya jika revisi file sheet di Drive atau jumlah barisnya
+berubah di luar aplikasi ini.
+"""
+import os
+import re
+import sqlite3
+import threading
+from contextlib import closing
+
+import metrik
+
+
+MODE_UPSERT = "upsert"
+MODE_TULIS_ULANG = "tulis_ulang"
+
+PATH_INDEKS = os.path.join("data", "indeks_baris.sqlite")
+
+# Penulisan ke sheet diserialkan per proses agar indeks & revisi tetap konsisten
+_kunci_tulis = threading.Lock()
+
+
+def _nilai_sel(nilai):
+    return "" if nilai is None else str(nilai)
+
+
+def _normalisasi_kunci(kolom, nilai):
+    nilai = _nilai_sel(nilai).strip()
+    return nilai.lower() if kolom == "Nama Notaris" else nilai
+
+
+def baris_dari_data(data, column_order):
+    """Ubah dict data menjadi list nilai sel sesuai urutan kolom."""
+    return [_nilai_sel(data.get(kolom)) for kolom in column_order]
+
+
+def kunci_dari_data(data, kolom_kunci):
+    return tuple(_normalisasi_kunci(k, data.get(k)) for k in kolom_kunci)
+
+
+def _baca_header_dan_kunci(worksheet, column_order, kolom_kunci):
+    """Satu request: baris header + kolom-kolom kunci (tanpa header)."""
+    from gspread.utils import rowcol_to_a1
+
+    ranges = ["1:1"]
+    for kolom in kolom_kunci:
+        huruf = rowcol_to_a1(1, column_order.index(kolom) + 1).rstrip("1")
+        ranges.append(f"{huruf}2:{huruf}")
+    metrik.tambah("google_api_total", layanan="sheets", operasi="batch_get")
+    with metrik.waktu("sheets_baca"):
+        hasil = worksheet.batch_get(ranges)
+
+    header = list(hasil[0][0]) if hasil[0] else []
+    kolom_nilai = [[sel[0] if sel else "" for sel in r] for r in hasil[1:]]
+    return header, kolom_nilai
+
+
+def cari_baris(kolom_nilai, kolom_kunci, kunci):
+    """Nomor baris sheet (1-based) pertama yang kuncinya sama, atau None."""
+    jumlah = max((len(k) for k in kolom_nilai), default=0)
+    for i in range(jumlah):
+        kunci_baris = tuple(
+            _normalisasi_kunci(kolom, nilai[i] if i < len(nilai) else "")
+            for kolom, nilai in zip(kolom_kunci, kolom_nilai)
+        )
+        if kunci_baris == kunci:
+            return i + 2  # +1 header, +1 karena 1-based
+    return None
+
+
+def tulis_baris(worksheet, baris_per_nomor):
+    """Tulis ulang beberapa baris di tempat dalam satu request ({nomor_baris: baris})."""
+    metrik.tambah("google_api_total", layanan="sheets", operasi="batch_update")
+    with metrik.waktu("sheets_tulis"):
+        return worksheet.batch_update(
+            [{"range": f"A{nomor}", "values": [baris]} for nomor, baris in baris_per_nomor.items()],
+            value_input_option="RAW"
+        )
+
+
+def tambah_baris(worksheet, baris_list):
+    """Tambah satu atau beberapa baris di bawah data yang sudah ada."""
+    metrik.tambah("google_api_total", layanan="sheets", operasi="append_rows")
+    with metrik.waktu("sheets_tulis"):
+        return worksheet.append_rows(baris_list, value_input_option="RAW", table_range="A1")
+
+
+def _baris_dari_respons_append(resp):
+    """Nomor baris pertama yang ditulis append_rows, dari 'updates.updatedRange'."""
+    try:
+        rentang = resp["updates"]["updatedRange"]
+    except (KeyError, TypeError):
+        return None
+    cocok = re.search(r"![A-Z]+(\d+)", rentang)
+    return int(cocok.group(1)) if cocok else None
+
+
+# --- Indeks kunci -> nomor baris ---
+_SKEMA_INDEKS = """
+    CREATE TABLE IF NOT EXISTS indeks_baris (
+        sheet TEXT NOT NULL,
+        kunci TEXT NOT NULL,
+        baris INTEGER NOT NULL,
+        PRIMARY KEY (sheet, kunci)
+    );
+    CREATE TABLE IF NOT EXISTS indeks_meta (
+        sheet TEXT PRIMARY KEY,
+        revisi TEXT,
+        jumlah_baris INTEGER NOT NULL DEFAULT 0
+    );
+"""
+_skema_siap = set()   # path absolut indeks yang skemanya sudah dibuat di proses ini
+_kunci_skema = threading.Lock()
+
+
+def _buka_db(path):
+    # Mode WAL tersimpan di file dan skema cukup dibuat sekali per proses per file
+    # (atau lagi bila file belum ada), seperti basis_data.buka()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    kunci = os.path.abspath(path)
+    baru = not os.path.exists(path)
+    conn = sqlite3.connect(path, timeout=30)
+    if baru or kunci not in _skema_siap:
+        with _kunci_skema:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SKEMA_INDEKS)
+            _skema_siap.add(kunci)
+    return conn
+
+
+class IndeksBaris:
+    """
+    Indeks lokal kunci (NIK, opsional + nama huruf kecil) -> nomor baris sheet.
+    Lookup O(1) lewat primary key SQLite; revisi sheet dibaca dari metadata
+    Drive ('version') yang naik setiap kali file berubah.
+    """
+
+    def __init__(self, worksheet, kolom_kunci, drive_service, path=PATH_INDEKS):
+        self.worksheet = worksheet
+        self.kolom_kunci = tuple(kolom_kunci)
+        self.drive_service = drive_service
+        self.path = path
+        self.sheet = f"{worksheet.spreadsheet.id}:{worksheet.id}:{'|'.join(self.kolom_kunci)}"
+
+    def revisi_sheet(self):
+        metrik.tambah("google_api_total", layanan="drive", operasi="files.get")
+        with metrik.waktu("revisi_sheet"):
+            meta = self.drive_service.files().get(
+                fileId=self.worksheet.spreadsheet.id, fields="version", supportsAllDrives=True
+            ).execute()
+        return str(meta.get("version"))
+
+    def _meta(self, conn):
+        row = conn.execute(
+            "SELECT revisi, jumlah_baris FROM indeks_meta WHERE sheet = ?", (self.sheet,)
+        ).fetchone()
+        return row if row else (None, 0)
+
+    def status(self):
+        """(revisi, jumlah_baris data) yang tercatat di indeks."""
+        with closing(_buka_db(self.path)) as conn:
+            return self._meta(conn)
+
+    def bangun_ulang(self, column_order, revisi):
+        """Baca kolom kunci dari sheet dan isi ulang indeks. False jika header tidak sesuai."""
+        header, kolom_nilai = _baca_header_dan_kunci(self.worksheet, column_order, self.kolom_kunci)
+        if header != list(column_order):
+            return False
+
+        jumlah = max((len(k) for k in kolom_nilai), default=0)
+        entri = []
+        for i in range(jumlah):
+            kunci = tuple(
+                _normalisasi_kunci(kolom, nilai[i] if i < len(nilai) else "")
+                for kolom, nilai in zip(self.kolom_kunci, kolom_nilai)
+            )
+            if all(kunci):
+                entri.append((self.sheet, "\x1f".join(kunci), i + 2))
+
+        with closing(_buka_db(self.path)) as conn, conn:
+            conn.execute("DELETE FROM indeks_baris WHERE sheet = ?", (self.sheet,))
+            # Baris pertama yang cocok menang (sama dengan cari_baris)
+            conn.executemany("INSERT OR IGNORE INTO indeks_baris VALUES (?, ?, ?)", entri)
+            conn.execute(
+                "INSERT OR REPLACE INTO indeks_meta VALUES (?, ?, ?)", (self.sheet, revisi, jumlah)
+            )
+        return True
+
+    def kosongkan(self):
+        with closing(_buka_db(self.path)) as conn, conn:
+            conn.execute("DELETE FROM indeks_baris WHERE sheet = ?", (self.sheet,))
+            conn.execute("DELETE FROM indeks_meta WHERE sheet = ?", (self.sheet,))
+
+    def cari(self, kunci):
+        with closing(_buka_db(self.path)) as conn:
+            row = conn.execute(
+                "SELECT baris FROM indeks_baris WHERE sheet = ? AND kunci = ?",
+                (self.sheet, "\x1f".join(kunci))
+            ).fetchone()
+        return row[0] if row else None
+
+    def catat(self, kunci_baris, jumlah_baris, revisi):
+        """Catat pasangan (kunci, nomor_baris) hasil penulisan beserta revisi terbaru."""
+        with closing(_buka_db(self.path)) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO indeks_baris VALUES (?, ?, ?)",
+                [(self.sheet, "\x1f".join(kunci), nomor) for kunci, nomor in kunci_baris]
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO indeks_meta VALUES (?, ?, ?)", (self.sheet, revisi, jumlah_baris)
+            )
+
+
+def gabungkan_duplikat(daftar_data, kolom_kunci):
+    """
+    Satukan data dengan kunci sama (yang terakhir menang) agar satu batch
+    hanya menulis satu baris per notaris. Mengembalikan list (kunci, data).
+    """
+    posisi = {}
+    hasil = []
+    for data in daftar_data:
+        kunci = kunci_dari_data(data, kolom_kunci)
+        if all(kunci) and kunci in posisi:
+            hasil[posisi[kunci]] = (kunci, data)
+            continue
+        if all(kunci):
+            posisi[kunci] = len(hasil)
+        hasil.append((kunci, data))
+    return hasil
+
+
+def _tulis_batch(worksheet, entri, column_order, cari, jumlah_baris):
+    """
+    Tulis entri (kunci, data): yang kuncinya sudah ada lewat satu batch_update,
+    sisanya lewat satu append_rows. Mengembalikan list (status, nomor_baris).
+    """
+    hasil = [None] * len(entri)
+    pembaruan, tambahan = {}, []
+    for i, (kunci, data) in enumerate(entri):
+        baris = baris_dari_data(data, column_order)
+        nomor_baris = cari(kunci) if all(kunci) else None
+        if nomor_baris is not None:
+            pembaruan[nomor_baris] = baris
+            hasil[i] = ("diganti", nomor_baris)
+        else:
+            tambahan.append((i, baris))
+
+    if pembaruan:
+        tulis_baris(worksheet, pembaruan)
+    if tambahan:
+        resp = tambah_baris(worksheet, [baris for _, baris in tambahan])
+        baris_awal = _baris_dari_respons_append(resp) or jumlah_baris + 2
+        for j, (i, _) in enumerate(tambahan):
+            hasil[i] = ("baru", baris_awal + j)
+    return hasil
+
+
+def _simpan_dengan_indeks(worksheet, daftar_data, column_order, kolom_kunci, indeks):
+    with _kunci_tulis:
+        revisi, jumlah_baris = indeks.status()
+        revisi_sheet = indeks.revisi_sheet()
+        if revisi != revisi_sheet:
+            if not indeks.bangun_ulang(column_order, revisi_sheet):
+                # Header belum sesuai: rapikan dengan cara lama, indeks dibangun di submit berikutnya
+                hasil = tulis_ulang_semua(worksheet, daftar_data, column_order, kolom_kunci)
+                indeks.kosongkan()
+                return hasil
+            revisi, jumlah_baris = indeks.status()
+
+        entri = gabungkan_duplikat(daftar_data, kolom_kunci)
+        hasil = _tulis_batch(worksheet, entri, column_order, indeks.cari, jumlah_baris)
+
+        jumlah_tambahan = sum(1 for status, _ in hasil if status == "baru")
+        nomor_terakhir = max(nomor for _, nomor in hasil)
+        revisi_baru = indeks.revisi_sheet()
+        if nomor_terakhir - 1 > jumlah_baris + jumlah_tambahan:
+            # Ada baris yang ditambahkan di luar aplikasi: paksa bangun ulang berikutnya
+            revisi_baru = None
+        indeks.catat(
+            [(kunci, nomor) for (kunci, _), (_, nomor) in zip(entri, hasil) if all(kunci)],
+            max(jumlah_baris + jumlah_tambahan, nomor_terakhir - 1),
+            revisi_baru
+        )
+        return hasil
+
+
+def tulis_ulang_semua(worksheet, daftar_data, column_order, kolom_kunci):
+    """Cara lama: baca seluruh sheet, buang duplikat, clear, lalu tulis semua."""
+    import pandas as pd
+
+    metrik.tambah("google_api_total", layanan="sheets", operasi="get_all_records")
+    with metrik.waktu("sheets_baca"):
+        records = worksheet.get_all_records()
+    existing = pd.DataFrame(records)
+
+    # Kalau kosong, siapkan header
+    if existing.empty:
+        existing = pd.DataFrame(columns=column_order)
+
+    existing = existing.reindex(columns=column_order)
+    entri = gabungkan_duplikat(daftar_data, kolom_kunci)
+    row_df = pd.DataFrame([data for _, data in entri]).reindex(columns=column_order)
+
+    kolom_norm = {}
+    for kolom in kolom_kunci:
+        kolom_norm[kolom] = existing[kolom].astype(str).str.strip()
+        if kolom == "Nama Notaris":
+            kolom_norm[kolom] = kolom_norm[kolom].str.lower()
+
+    status = []
+    mask_duplikat = pd.Series([False] * len(existing), index=existing.index)
+    for kunci, _ in entri:
+        mask = pd.Series([all(kunci)] * len(existing), index=existing.index)
+        if all(kunci):
+            for kolom, nilai in zip(kolom_kunci, kunci):
+                mask &= (kolom_norm[kolom] == nilai)
+        status.append("diganti" if mask.any() else "baru")
+        mask_duplikat |= mask
+
+    sisa = existing[~mask_duplikat]
+    df_all = pd.concat([sisa, row_df], ignore_index=True)
+
+    values = df_all.fillna("").astype(str).values.tolist()
+    metrik.tambah("google_api_total", layanan="sheets", operasi="clear")
+    metrik.tambah("google_api_total", layanan="sheets", operasi="update")
+    with metrik.waktu("sheets_tulis"):
+        worksheet.clear()
+        worksheet.update(range_name="A1", values=[list(column_order)] + values)
+
+    return [(s, len(sisa) + 2 + i) for i, s in enumerate(status)]
+
+
+def simpan_banyak(worksheet, daftar_data, column_order, kolom_kunci=("NIK KTP",), mode=MODE_UPSERT, indeks=None):
+    """
+    Simpan banyak baris sekaligus (paling banyak satu batch_update + satu append).
+    Data berkunci sama digabung lebih dulu. Mengembalikan list (status, nomor_baris)
+    per kunci unik, dengan status 'baru' atau 'diganti'.
+    Jika `indeks` (IndeksBaris) diberikan, nomor baris dicari di indeks lokal.
+    """
+    if mode == MODE_TULIS_ULANG:
+        return tulis_ulang_semua(worksheet, daftar_data, column_order, kolom_kunci)
+    if indeks is not None:
+        return _simpan_dengan_indeks(worksheet, daftar_data, column_order, kolom_kunci, indeks)
+
+    header, kolom_nilai = _baca_header_dan_kunci(worksheet, column_order, kolom_kunci)
+    if header != list(column_order):
+        # Sheet kosong / header lama: rapikan sekali dengan cara lama
+        return tulis_ulang_semua(worksheet, daftar_data, column_order, kolom_kunci)
+
+    entri = gabungkan_duplikat(daftar_data, kolom_kunci)
+    jumlah_baris = max((len(k) for k in kolom_nilai), default=0)
+    return _tulis_batch(
+        worksheet, entri, column_order,
+        lambda kunci: cari_baris(kolom_nilai, kolom_kunci, kunci), jumlah_baris
+    )
+
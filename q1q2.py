@@ -1,37 +1,27 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime
 import os
-import openpyxl
-from pdf2image import convert_from_bytes
-import pytesseract
-import gspread 
-from oauth2client.service_account import ServiceAccountCredentials
-from io import BytesIO
-from PyPDF2 import PdfReader
-import difflib
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-from google.oauth2.service_account import Credentials
-import gspread
-from googleapiclient.discovery import build
 
+import koneksi_google
+import basis_data
+import antrian_validasi
+import penilaian_risiko
+import aturan_penilaian
+import validasi_dokumen
+import kuisioner
+import form_kuisioner
 
-pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
 
-# --- Scope Akses Google API ---
-scope = [
-    "https://www.googleapis.com/auth/drive",
-    "https://www.googleapis.com/auth/drive.file",
-    "https://www.googleapis.com/auth/spreadsheets"
-]
+# Lokasi tesseract dibaca modul dokumen saat OCR (pytesseract tidak di-import di sini)
+os.environ.setdefault("PMPJ_TESSERACT_CMD", r"C:\Program Files\Tesseract-OCR\tesseract.exe")
 
 # --- Autentikasi dengan Service Account ---
+# Credentials & client di-cache per proses (lihat koneksi_google.py); service Drive
+# baru dibangun worker saat upload pertama (unggah_drive.py), bukan saat start
+SUMBER_CREDS = "kuisioner-notaris-f2ff4ce355be.json"
+
 try:
-    creds = Credentials.from_service_account_file("kuisioner-notaris-f2ff4ce355be.json", scopes=scope)
+    creds = koneksi_google.ambil_credentials(SUMBER_CREDS)
 except Exception as e:
     st.error(f"❌ Gagal memuat credentials.json: {e}")
     creds = None
@@ -39,7 +29,7 @@ except Exception as e:
 # --- Koneksi ke Google Sheets ---
 if creds:
     try:
-        client = gspread.authorize(creds)
+        client = koneksi_google.ambil_client(SUMBER_CREDS)
         # st.success("✅ Autentikasi Google Sheets berhasil!")
     except Exception as e:
         st.error(f"❌ Gagal autentikasi Google Sheets: {e}")
@@ -47,23 +37,12 @@ if creds:
 else:
     client = None
 
-# --- Koneksi ke Google Drive ---
-if creds:
-    try:
-        drive_service = build('drive', 'v3', credentials=creds)
-        # st.info("✅ Terhubung ke Google Drive API.")
-    except Exception as e:
-        st.error(f"❌ Gagal menghubungkan ke Google Drive API: {e}")
-        drive_service = None
-else:
-    drive_service = None
-
 # --- Buka spreadsheet utama (opsional) ---
 if client:
     try:
         SPREADSHEET_ID = "1sSzjDwgmqO6YhOGzSk4kqOybdlzAEXagWW36r3nY1OM"  # ganti dengan ID sheet kamu
-        sh = client.open_by_key(SPREADSHEET_ID)
-        worksheet = sh.sheet1
+        worksheet = koneksi_google.ambil_worksheet(SUMBER_CREDS, kunci=SPREADSHEET_ID)
+        sh = worksheet.spreadsheet
         # st.success("✅ Spreadsheet berhasil dibuka lewat ID.")
     except Exception as e:
         st.error(f"❌ Gagal membuka spreadsheet: {e}")
@@ -73,433 +52,29 @@ else:
     sh = None
     worksheet = None
  
-# --- Dictionary Mapping ---
-profil = {
-    "a. Pengusaha/wiraswasta" : 9,
-    "b.  PNS (termasuk pensiunan)": 4,
-    "c.  Ibu Rumah Tangga" : 2,
-    "d.  Pelajar/Mahasiswa" : 2,
-    "e.  Pegawai Swasta" : 7,
-    "f.  Pejabat Lembaga Legislatif dan Pemerintah" : 4,
-    "g.  TNI/POLRI (termasuk Pensiunan)": 3,
-    "h. Pegawai BI/BUMN/BUMD (termasuk Pensiunan)": 2,
-    "i.  Profesional dan Konsultan" : 6,
-    "j.  Pedagang" : 5,
-    "k.  Pegawai Bank" : 2,
-    "l. Pegawai Money Changer" : 1,
-    "m. Pengajar dan Dosen" : 2,
-    "n. Petani" : 1,
-    "o.  Korporasi Perseroan Terbatas" : 7,
-    "p.  Korporasi Koperasi" : 2,
-    "q.  Korporasi Yayasan": 2,
-    "r.  Korporasi CV, Firma, dan Maatschap": 2,
-    "s.  Korporasi Perkumpulan Badan Hukum": 2,
-    "t.  Korporasi Perkumpulan Tidak Badan Hukum": 2,
-    "u.  Pengurus Parpol": 2,
-    "v.  Bertindak berdasarkan Kuasa" : 2,
-    "w. Lain-lain" : 1
-}
-
-bisnis_pengguna = {
-    "a. Perdagangan": 9,
-    "b. Pertambangan": 4,
-    "c. Pertanian": 1,
-    "d. Perikanan": 1,
-    "e. Perkebunan": 1,
-    "f. Perindustrian": 2,
-    "g. Perbankan": 3,
-    "h. Pembiayaan": 4,
-    "i. Pembangunan Property": 3,
-    "j. Kontraktor": 2,
-    "k. Konsultan": 1,
-    "l. Transportasi Barang dan Orang": 1,
-    "m. Usaha Sewa Menyewa": 2,
-    "n. Lain-lain....": 1
-}
-
-jasa = {
-    "a.  Pembelian dan Penjualan Properti": 9,
-    "b.  Pengurusan Perizinan Badan Usaha": 7,
-    "c.  Penitipan Pembayaran Pajak terkait Pengalihan Property": 3,
-    "d.  Pengurusan Pembelian dan Penjualan Badan Usaha": 3,
-    "e.  Pengelolaan terhadap Uang, Efek, dan/atau Produk Jasa Keuangan lainnya": 4,
-    "f.  Pengelolaan Rekening Giro, Rekening Tabungan, Rekening Deposito, dan/atau Rekening Efek": 2,
-    "g.  Pengoperasian dan Pengelolaan Perusahaan": 3,
-    "h. Lain-lain": 1
-}
-
-produk = {
-    "a. Akta pembayaran uang sewa, bunga, dan pensiun ": 4,
-    "b. Akta penawaran pembayaran tunai ": 4,
-    "c.  Akta protes terhadap tidak dibayarnya atau tidak diterimanya surat berharga ": 2,
-    "d. Akta Kuasa": 4,
-    "e. Akta keterangan kepemilikan": 5,
-    "f. Akta Hibah (Barang Bergerak)": 4,
-    "g. Akta Wasiat": 2,
-    "h. Akta Jaminan Fidusia ": 3,
-    "i. Akta Pendirian Perseroan Terbatas ": 8,
-    "j. Akta Perubahan Perseroan Terbatas  ": 5,
-    "k. Akta Pendirian dan Perubahan Koperasi ": 3,
-    "l. Akta Pendirian dan Perubahan Yayasan (Nirlaba) ": 3,
-    "m. Akta Pendirian dan Perubahan CV, Firma dan Maatschap (Persekutuan Perdata) - Badan usaha yang tidak berbadan hukum ": 3,
-    "n. Akta Pendirian dan Perubahan Perkumpulan Badan Hukum (Sosial/Nirlaba) ": 3,
-    "o. Akta Pendirian dan Perubahan Perkumpulan Tidak Berbadan Hukum (Sosial/Nirlaba) ": 3,
-    "p. Akta Pendirian dan Perubahan Partai Politik ": 2,
-    "q. Akta Perjanjian Sewa Menyewa ": 3,
-    "r. Akta Perjanjian Pengikatan Jual Beli ": 8,
-    "s. Akta Perjanjian Kerjasama ": 4,
-    "t. Akta Perjanjian BOT (Build Operate Transfer/Bangun Kelola Serah) ": 2,
-    "u. Akta Perjanjian JO (Joint Operation/Kerjasama Operasional Mengelola Proyek) ": 2,
-    "v. Akta Perjanjian Kredit ": 4,
-    "w. Akta Pinjam Meminjam/Pengakuan Hutang ": 4,
-    "x. Akta lainnya sesuai dengan ketentuan peraturan perundang-undangan ": 3
-}
-
-negara = {
-    "a.  Tax Haven Country": 6,
-    "b.  RRT (Tiongkok)": 8,
-    "c.  Malaysia": 7,
-    "d.  Singapura": 7,
-    "e.  Asia lainnya": 8,
-    "f.  Afrika": 1,
-    "g.  Amerika": 5,
-    "h.  Eropa": 6,
-    "i.  Australia dan Selandia Baru": 5
-}
-
-apgakkum = {"YA": 6, "TIDAK": 1}
-
-# --- Fungsi hitung inherent risk ---
-def hitung_risiko(inputs):
-    def pilih_terbesar(mapping_dict, user_inputs, default=None):
-        if all(v == 0 for v in user_inputs.values()):
-            return default, mapping_dict.get(default, 0)
-        terbaik = max(user_inputs, key=user_inputs.get)
-        return terbaik, mapping_dict.get(terbaik, 0)
-
-    jawaban_profil, skor_profil   = pilih_terbesar(profil, inputs["profil"],  default="w. Lain-lain")
-    jawaban_bisnis, skor_bisnis   = pilih_terbesar(bisnis_pengguna, inputs["bisnis"], default="n. Lain-lain....")
-    jawaban_jasa, skor_jasa       = pilih_terbesar(jasa, inputs["jasa"],     default="h. Lain-lain")
-    jawaban_negara, skor_negara   = pilih_terbesar(negara, inputs["negara"], default="e.  Asia lainnya")
-    skor_apgakkum                 = apgakkum.get(inputs["apgakkum"], 0)
-
-    total = skor_profil + skor_bisnis + skor_jasa + skor_negara + skor_apgakkum + 6
-
-    if 6 <= total <= 17: kategori = "Rendah"
-    elif 18 <= total <= 29: kategori = "Sedang"
-    elif 30 <= total <= 41: kategori = "Tinggi"
-    elif 42 <= total <= 52: kategori = "Sangat Tinggi"
-    else: kategori = "Diluar Rentang"
-
-    return {
-        "jawaban_profil": jawaban_profil, "skor_profil": skor_profil,
-        "jawaban_bisnis": jawaban_bisnis, "skor_bisnis": skor_bisnis,
-        "jawaban_jasa": jawaban_jasa,     "skor_jasa": skor_jasa,
-        "jawaban_negara": jawaban_negara, "skor_negara": skor_negara,
-        "jawaban_apgakkum": inputs["apgakkum"], "skor_apgakkum": skor_apgakkum,
-        "total_skor": total, "kategori_risiko": kategori
-    }
-
-# OCR PDF
-# ==========================================================
-# === FUNGSI VALIDASI PDF DENGAN DETEKSI OTOMATIS (Q1/Q2) ===
-# ==========================================================
-def validasi_ocr_pdf(uploaded_file, kata_kunci_list):
-    """
-    Validasi isi file PDF (OCR + deteksi otomatis tipe dokumen).
-    Mengembalikan:
-        - True/False: status valid OCR
-        - all_text: teks hasil OCR
-        - jumlah_ditemukan: jumlah kata kunci yang ditemukan
-        - tipe_file: 'Q1', 'Q2', atau 'Tidak Teridentifikasi'
-    """
-    if uploaded_file is None:
-        return False, "Tidak ada file.", 0, "Tidak Teridentifikasi"
-
-    try:
-        # --- Baca isi PDF ---
-        pdf_bytes = uploaded_file.read()
-        uploaded_file.seek(0)
-        all_text = ""
-
-        # --- 1) Coba ekstrak teks langsung ---
-        try:
-            reader = PdfReader(BytesIO(pdf_bytes))
-            for page in reader.pages[:5]:
-                text = page.extract_text()
-                if text:
-                    all_text += text.lower() + "\n"
-        except Exception:
-            pass
-
-        # --- 2) Kalau kosong, fallback ke OCR ---
-        if not all_text.strip():
-            try:
-                images = convert_from_bytes(pdf_bytes, dpi=300)[:5]
-                for img in images:
-                    text = pytesseract.image_to_string(
-                        img, lang="ind+eng", config="--psm 6"
-                    )
-                    all_text += text.lower() + "\n"
-            except Exception as e:
-                st.error(f"OCR gagal: {e}. Pastikan poppler dan tesseract terinstal.")
-                return False, "Error OCR", 0, "Tidak Teridentifikasi"
-
-        # --- 3) Deteksi tipe dokumen otomatis ---
-        indikator_q1 = ["cdd", "edd", "formulir customer", "analisis risiko", "analisis resiko"]
-        indikator_q2 = ["sop", "kebijakan", "pmpj", "mitigasi risiko", "permenkumham", "pengendalian intern"]
-
-        hitung_q1 = sum(1 for kata in indikator_q1 if kata in all_text)
-        hitung_q2 = sum(1 for kata in indikator_q2 if kata in all_text)
+# --- Aturan penilaian (bobot, batas kategori & matriks) ---
+# Satu file berversi untuk semua form: aturan_penilaian.json. Dibaca ulang
+# otomatis bila file berubah (lihat aturan_penilaian.py).
+aturan = aturan_penilaian.muat()
 
-        if hitung_q1 > hitung_q2:
-            tipe_file = "Q1"
-            variasi_kata = [
-                "formulir customer due diligence perorangan",
-                "formulir customer due diligence korporasi",
-                "analisis risiko", "analisis resiko",
-                "enhanced due diligence", "cdd", "edd"
-            ]
-        elif hitung_q2 > hitung_q1:
-            tipe_file = "Q2"
-            variasi_kata = [
-                "sop pmpj", "kebijakan pmpj", "prosedur pmpj",
-                "pedoman pmpj", "mitigasi risiko", "pasal 17 permkham",
-                "pengendalian intern", "penerapan pmpj"
-            ]
-        else:
-            tipe_file = "Tidak Teridentifikasi"
-            variasi_kata = kata_kunci_list  # fallback
-
-        # --- 4) Cek kata kunci utama ---
-        jumlah_ditemukan = 0
-        for kata_utama in kata_kunci_list:
-            kata_lower = kata_utama.lower()
-            variasi_relevan = [v for v in variasi_kata if kata_lower in v.lower()]
-
-            # Fuzzy matching (biar toleran OCR)
-            def fuzzy_found(keyword):
-                return any(
-                    difflib.SequenceMatcher(None, keyword, chunk).ratio() > 0.7
-                    for chunk in all_text.split() if len(chunk) > 3
-                )
-
-            found = (
-                kata_lower in all_text
-                or any(v in all_text for v in variasi_relevan)
-                or fuzzy_found(kata_lower)
-            )
-            if found:
-                jumlah_ditemukan += 1
-
-        return True, all_text, jumlah_ditemukan, tipe_file
-
-    except Exception:
-        return False, "Error OCR", 0, "Tidak Teridentifikasi"
-
-
-# ==========================================================
-# === FUNGSI HITUNG INTERNAL CONTROL (GABUNGAN Q1 & Q2) ===
-# ==========================================================
-def hitung_internal_control(q1, q2, uploaded_file1, uploaded_file2, is_valid_ocr_q1, is_valid_ocr_q2):
-    """
-    Hitung nilai dan kategori internal control berdasarkan dua dokumen:
-    - Q1: CDD/EDD/Analisis Risiko
-    - Q2: SOP/Kebijakan/PMPJ
-    Logika:
-        - Jika dua-duanya benar -> nilai 37 (Sangat Baik)
-        - Jika hanya satu benar -> nilai 41 (Baik)
-        - Jika dua-duanya salah / tidak ada -> nilai 141 (Lemah)
-    """
-    # Kondisi lemah (tidak isi, tidak upload, atau jawab TIDAK)
-    if (
-        q1 == "TIDAK" or q2 == "TIDAK" or
-        (uploaded_file1 is None and uploaded_file2 is None)
-    ):
-        nilai = 141
-
-    else:
-        # Dua-duanya valid
-        if is_valid_ocr_q1 and is_valid_ocr_q2:
-            nilai = 37
-        # Salah satu valid
-        elif is_valid_ocr_q1 or is_valid_ocr_q2:
-            nilai = 41
-        # Dua-duanya tidak valid
-        else:
-            nilai = 141
-
-    # Kategori
-    def kategori_ic(nilai):
-        if nilai == 37: return "Sangat Baik"
-        elif nilai == 41: return "Baik"
-        elif 89 <= nilai <= 114: return "Cukup"
-        elif 115 <= nilai <= 141: return "Lemah"
-        return "Diluar Rentang"
-
-    return nilai, kategori_ic(nilai)
-
-
-# --- Residual Risk ---
-def hitung_residual_risk(kategori_inherent, kategori_internal):
-    residual_matrix = {
-        "Lemah":       {"Rendah": "Rendah", "Sedang": "Sedang", "Tinggi": "Sangat Tinggi", "Sangat Tinggi": "Sangat Tinggi"},
-        "Cukup":       {"Rendah": "Rendah", "Sedang": "Sedang", "Tinggi": "Tinggi",        "Sangat Tinggi": "Sangat Tinggi"},
-        "Baik":        {"Rendah": "Rendah", "Sedang": "Sedang", "Tinggi": "Sedang",        "Sangat Tinggi": "Tinggi"},
-        "Sangat Baik": {"Rendah": "Rendah", "Sedang": "Rendah", "Tinggi": "Sedang",        "Sangat Tinggi": "Tinggi"}
-    }
-    risk_value = {"Rendah": 1, "Sedang": 2, "Tinggi": 3, "Sangat Tinggi": 4}
-    kategori_residual = residual_matrix.get(kategori_internal, {}).get(kategori_inherent, "Sangat Tinggi")  # Default jika miss
-    return kategori_residual, risk_value.get(kategori_residual, 4)
-
-# --- Risiko Pengguna Jasa ---
-def risiko_pengguna_jasa(jumlah_klien):
-    if jumlah_klien <= 100: return 1, "Rendah"
-    if jumlah_klien <= 200: return 2, "Sedang"
-    if jumlah_klien <= 300: return 3, "Tinggi"
-    return 4, "Sangat Tinggi"
-
-# --- Final Risk Priority ---
-def final_risk(df):
-    risk_priority = {
-        4: {1: "Tinggi", 2: "Tinggi", 3: "Sangat Tinggi", 4: "Sangat Tinggi"},
-        3: {1: "Sedang", 2: "Sedang", 3: "Tinggi",       4: "Sangat Tinggi"},
-        2: {1: "Rendah", 2: "Sedang", 3: "Sedang",       4: "Tinggi"},
-        1: {1: "Rendah", 2: "Rendah", 3: "Sedang",       4: "Tinggi"}
-    }
-    df["Tingkat Risiko"] = df.apply(lambda r: risk_priority.get(r["Nilai Residual Risk"], {}).get(r["Nilai Risiko Pengguna Jasa"]), axis=1)
-    return df
-
-# --- UI Streamlit ---
 st.title("📊 Penilaian Risiko")
 
-with st.form("risk_form"):
-    st.subheader("Identitas Notaris")
-    nama_notaris = st.text_input("1. Nama Notaris (contoh: Herman Setiawan, S.H., M.Kn)", "")
-    NIK_KTP = st.text_input("NIK KTP (16 digit angka)")
-    username = st.text_input("Username Akun AHU Online", "")
-    nomor_HP = st.text_input("Nomor HP")
-    alamat = st.text_input("Alamat Lengkap Notaris", "")
-    daftar_kota = [
-    "Kabupaten Bangkalan",
-    "Kabupaten Banyuwangi",
-    "Kabupaten Blitar",
-    "Kabupaten Bojonegoro",
-    "Kabupaten Bondowoso",
-    "Kabupaten Gresik",
-    "Kabupaten Jember",
-    "Kabupaten Jombang",
-    "Kabupaten Kediri",
-    "Kabupaten Lamongan",
-    "Kabupaten Lumajang",
-    "Kabupaten Madiun",
-    "Kabupaten Magetan",
-    "Kabupaten Malang",
-    "Kabupaten Mojokerto",
-    "Kabupaten Nganjuk",
-    "Kabupaten Ngawi",
-    "Kabupaten Pacitan",
-    "Kabupaten Pamekasan",
-    "Kabupaten Pasuruan",
-    "Kabupaten Ponorogo",
-    "Kabupaten Probolinggo",
-    "Kabupaten Sampang",
-    "Kabupaten Sidoarjo",
-    "Kabupaten Situbondo",
-    "Kabupaten Sumenep",
-    "Kabupaten Trenggalek",
-    "Kabupaten Tuban",
-    "Kabupaten Tulungagung",
-    "Kota Batu",
-    "Kota Blitar",
-    "Kota Kediri",
-    "Kota Madiun",
-    "Kota Malang",
-    "Kota Mojokerto",
-    "Kota Pasuruan",
-    "Kota Probolinggo",
-    "Kota Surabaya"
-]
-
-
-# Pilihan kota/kabupaten
-    kota = st.selectbox("Pilih Kota/Kabupaten", daftar_kota)
-
-    st.subheader("Jumlah Klien Sesuai Profesi")
-    inputs_profil = {k: st.number_input(k, min_value=0, value=0) for k in profil.keys()}
-
-    jumlah_klien = sum(inputs_profil.values())
-
-    st.subheader("Jumlah Klien Total")
-    st.write(jumlah_klien)
-
-    st.subheader("Jumlah Klien Sesuai Bisnis")
-    inputs_bisnis = {k: st.number_input(k, min_value=0, value=0) for k in bisnis_pengguna.keys()}
-
-    st.subheader("Jumlah Klien Sesuai Jasa yang Digunakan")
-    inputs_jasa = {k: st.number_input(k, min_value=0, value=0) for k in jasa.keys()}
-
-    st.subheader("Jumlah Dokumen/Produk Jasa yang Diurus Klien")
-    # FIX: gunakan nama berbeda agar tidak menimpa inputs_jasa
-    inputs_produk = {k: st.number_input(k, min_value=0, value=0) for k in produk.keys()}
-
-    st.subheader("Jumlah Klien Sesuai Negara")
-    inputs_negara = {k: st.number_input(k, min_value=0, value=0) for k in negara.keys()}
-
-    st.subheader("Terkait Aparat Penegak Hukum")
-    inputs_apgakkum = st.radio("Apakah Notaris pernah dipanggil atau diminta informasi oleh Aparat Penegak Hukum?", ["YA", "TIDAK"])
-
-    st.subheader("Pertanyaan Kepatuhan Notaris")
-    q1 = st.radio("1. Apakah Kantor Notaris anda memiliki mekanisme analisis risiko Pengguna Jasa? (form cdd, edd dan analisa resiko)?", ["YA", "TIDAK"])
-    uploaded_file1 = st.file_uploader("Upload Dokumen Pendukung (Form CDD, EDD dan Analisa Resiko) dengan format PDF", type=["pdf"])
-    if uploaded_file1 is not None:
-        st.success(f"File berhasil diupload: {uploaded_file1.name}")
-        
-    q2 = st.radio("2.  Apakah Kantor Notaris anda memiliki kebijakan dan prosedur untuk mengelola dan memitigasi risiko tinggi pencucian uang dan/atau pendanaan terorisme, termasuk PEP dan negara yang berisiko tinggi sebagaimana diatur dalam Pasal 17 PerMenkumham Nomor 9 Tahun 2017?", ["YA", "TIDAK"])
-    uploaded_file2 = st.file_uploader("Upload Dokumen Pendukung (SOP PMPJ) dengan format PDF", type=["pdf"])
-    # FIX: cek variabel yang benar
-    if uploaded_file2 is not None:
-        st.success(f"File berhasil diupload: {uploaded_file2.name}")
-
-    q3 = st.radio("3.  Apakah Kantor Notaris anda memiliki kebijakan dan prosedur untuk mengelola dan memitigasi risiko sedang pencucian uang dan/atau pendanaan terorisme sebagaimana diatur dalam Pasal 7 PerMenkumham Nomor 9 Tahun 2017?", ["YA", "TIDAK"])
-    q4 = st.radio("4.  Apakah Kantor Notaris anda memiliki kebijakan dan prosedur untuk mengelola dan memitigasi risiko rendah pencucian uang dan/atau pendanaan terorisme sebagaimana diatur dalam Pasal 16 PerMenkumham Nomor 9 Tahun 2017?", ["YA", "TIDAK"])
-    q5 = st.radio("5.  Apakah Kantor Notaris Anda memiliki kebijakan larangan untuk membuka atau memelihara hubungan usaha yang menggunakan nama fiktif?", ["YA", "TIDAK"])
-    q6 = st.radio("6.  Apakah Kantor Notaris Anda melakukan pengumpulan informasi pengguna jasa orang perseorangan sebagaimana dimaksud dalam Pasal 7 ayat (1) PerMenkumham Nomor 9 Tahun 2017?", ["YA", "TIDAK"])
-    q7 = st.radio("7.  Apakah Kantor Notaris Anda melakukan pengumpulan informasi pengguna jasa korporasi sebagaimana dimaksud dalam Pasal 7 ayat (2) PerMenkumham Nomor 9 Tahun 2017?", ["YA", "TIDAK"])
-    q8 = st.radio("8.  Apakah Kantor Notaris Anda melakukan pengumpulan informasi pengguna jasa perikatan lainnya (legal arrangements) sebagaimana dimaksud dalam Pasal 7 ayat (1) PerMenkumham Nomor 9 Tahun 2017?", ["YA", "TIDAK"])
-    q9 = st.radio("9.  Apakah Kantor Notaris Anda melakukan pengumpulan informasi Beneficial Owner (Pemilik Manfaat) dari Korporasi sebagaimana dimaksud dalam Pasal 8 PerMenkumham Nomor 9 Tahun 2017?", ["YA", "TIDAK"])
-    q10 = st.radio("10.  Apakah Kantor Notaris Anda melakukan pengumpulan informasi Beneficial Owner (Pemilik Manfaat) dari perikatan lainnya (legal arrangement) sebagaimana dimaksud dalam Pasal 9 PerMenkumham Nomor 9 Tahun 2017?", ["YA", "TIDAK"])
-    q11 = st.radio("11.  Apakah Kantor Notaris Anda memliliki kebijakan bertemu langsung dengan pegguna jasa dalam rangka pengumpulan informasi pengguna jasa?", ["YA", "TIDAK"])
-    q12 = st.radio("12. Apakah Kantor Notaris Anda melakukan konfirmasi atas dokumen Pengguna Jasa melalui meminta keterangan kepada pengguna jasa untuk mengetahui kebenaran formil dokumen dimaksud?", ["YA", "TIDAK"])
-    q13 = st.radio("13. Apakah Kantor Notaris Anda memiliki kebijakan untuk meminta dokumen pendukung lainnya dari pihak yang berwenang dalam hal terdapat keraguan atas kebenaran formil dokumen?", ["YA", "TIDAK"])
-    q14 = st.radio("14. Apakah Kantor Notaris anda melakukan pemantauan kewajaran transaksi pengguna jasa?", ["YA", "TIDAK"])
-    q15 = st.radio("15. Apakah Kantor Notaris anda melakukan pencatatan transaksi pengguna jasa?", ["YA", "TIDAK"])
-    q16 = st.radio("16. Apakah Kantor Notaris Anda memiliki sistem informasi mengenai identifikasi, pemantauan transaksi, dan penyediaan laporan mengenai transaksi yang dilakukan oleh pengguna jasa?", ["YA", "TIDAK"])
-    q17 = st.radio("17. Apakah Kantor Notaris anda menatausahakan dokumen seluruh informasi dan dokumen transaksi pengguna jasa dan beneficial owner (pemilik manfaat)?", ["YA", "TIDAK"])
-    q18 = st.radio("18. Apakah Kantor Notaris anda menatausahakan dokumen seluruh informasi dan dokumen pengguna jasa dan beneficial owner (pemilik manfaat) yang diperoleh dalam rangka penerapan prinsip mengenali pengguna jasa?", ["YA", "TIDAK"])
-    q19 = st.radio("19. Apakah Kantor Notaris anda menatausahakan dokumen analisis kewajaran atas transaksi pengguna jasa dan beneficial owner (pemilik manfaat)?", ["YA", "TIDAK"])
-    q20 = st.radio("20. Apakah Kantor Notaris anda akan memutuskan hubungan usaha dengan pengguna jasa jika Pengguna Jasa menolak untuk mematuhi prinsip mengenali Pengguna Jasa?", ["YA", "TIDAK"])
-    q21 = st.radio("21. Apakah Kantor Notaris anda akan memutuskan hubungan usaha dengan pengguna jasa jika Notaris meragukan kebenaran informasi yang disampaikan oleh Pengguna Jasa?", ["YA", "TIDAK"])
-    q22 = st.radio("22. Apakah Kantor Notaris anda akan melaporkan kepada PPATK mengenai tindakan sebagaimana dimaksud pada pertanyaan nomor 20 dan nomor 21 di atas?", ["YA", "TIDAK"])
-    q23 = st.radio("23. Apakah Kantor Notaris anda melakukan upaya pemutakhiran informasi dan dokumen pengguna jasa dalam hal terdapat perubahan yang diketahui oleh Notaris yang bersumber dari Pengguna Jasa yang sama atau informasi lain yang dapat dipertanggungjawabkan?", ["YA", "TIDAK"])
-    q24 = st.radio("24. Apakah Kantor Notaris Anda mendokumentasikan hasil pemutakhiran informasi dan/atau dokumen sebagaimana dimaksud dalam pertanyaan Nomor 23?", ["YA", "TIDAK"])
-    q25 = st.radio("25. Apakah Kantor Notaris Anda melakukan pengendalian internal melalui pelaksanaan pemeriksaan berkala terhadap penerapan prinsip mengenali Pengguna Jasa?", ["YA", "TIDAK"])
-    q26 = st.radio("26. Apakah Kantor Notaris Anda melakukan pengendalian internal melalui Pemutakhiran daftar Pengguna Jasa atau pemberi kuasa yang memenuhi kriteria berisiko tinggi?", ["YA", "TIDAK"])
-    q27 = st.radio("27. Apakah Kantor Notaris Anda melakukan prosedur penyaringan untuk penerimaan karyawan baru (pre-employee screening)?", ["YA", "TIDAK"])
-    q28 = st.radio("28. Apakah Kantor Notaris Anda melakukan pengenalan dan pemantauan terhadap profil karyawan?", ["YA", "TIDAK"])
-    q29 = st.radio("29. Apakah Kantor Notaris anda melakukan sosialisasi atau pelatihan mengenai penerapan peraturan perundang-undangan yang terkait dengan prinsip mengenali Pengguna Jasa? (baik diselenggarakan secara mandiri atau instansi terkait)", ["YA", "TIDAK"])
-    q30 = st.radio("30. Apakah Kantor Notaris anda melakukan sosialisasi atau pelatihan mengenai teknik, metode, dan tipologi pencucian uang dan/atau pendanaan terorisme? (baik diselenggarakan secara mandiri atau instansi terkait)", ["YA", "TIDAK"])
-    q31 = st.radio("31. Apakah Kantor Notaris anda melakukan sosialisasi atau pelatihan mengenai kebijakan dan prosedur penerapan prinsip mengenali Pengguna Jasa serta peran dan tanggung jawab pegawai dalam mencegah dan memberantas pencucian uang dan/atau pendanaan terorisme? (baik diselenggarakan secara mandiri atau instansi terkait)", ["YA", "TIDAK"])
-    q32 = st.radio("32. Apakah Kantor Notaris Anda memanfaatkan teknologi baru dalam memberikan pelayanan kepada pengguna jasa?", ["YA", "TIDAK"])
-    q33 = st.radio("33. Apabila jawaban Nomor 32 adalah iya, apakah Kantor Notaris Anda melakukan pengidentifikasian dan pengukuran mengenai risiko terjadinya tindak pidana pencucian uang dan pendanaan terorisme, sebelum pemanfaatan atau pengembangan teknologi baru tersebut pada pertanyaan Nomor 32?", ["YA", "TIDAK"])
-    q34 = st.radio("34.  Apakah Kantor Notaris anda pernah melakukan kerja sama dengan penegak hukum dan otoritas yang berwenang untuk memberantas tindak pidana pencucian uang dan pendanaan terorisme?", ["YA", "TIDAK"])
-
-    submitted = st.form_submit_button("Submit")
+# --- Form kuisioner ---
+# Widget dibangun dari skema kuisioner.py. Setiap bagian adalah fragment
+# (form_kuisioner.py): mengubah input hanya menjalankan ulang bagiannya,
+# tombol Submit menjalankan ulang skrip penuh.
+JENIS_FORM = antrian_validasi.JENIS_Q1Q2
+form_kuisioner.tampilkan(JENIS_FORM, aturan)
+submitted = st.button("Submit")
 
 # ------------------------- Validasi & Hitung -------------------------
 if submitted:
-    required_fields = [nama_notaris, NIK_KTP, username, nomor_HP, alamat, kota, q1, q2, q34]
-    missing = any(f is None or f == "" for f in required_fields)
+    jawaban = form_kuisioner.jawaban(JENIS_FORM, aturan)
+    NIK_KTP = jawaban["identitas"][kuisioner.KOLOM_NIK]
+    nomor_HP = jawaban["identitas"][kuisioner.KOLOM_HP]
+    uploaded_file1, uploaded_file2 = jawaban["berkas"]
+    q1, q2 = (jawaban["pertanyaan"][p["kolom"]] for p in kuisioner.PERTANYAAN[:2])
+    missing = any(f is None or f == "" for f in jawaban["identitas"].values())
 
     if missing:
         st.error("⚠️ Semua data wajib diisi (kecuali dokumen pendukung).")
@@ -511,195 +86,46 @@ if submitted:
         st.error("⚠️ NIK KTP harus 16 digit.")
 
     else:
-        # ======================================================
-        # === Bagian baru: validasi OCR & hitung internal control
-        # ======================================================
-
-        # Kata kunci umum (biar fungsi bisa deteksi otomatis Q1 / Q2)
-        kata_kunci_umum = [
-            "formulir customer due diligence", "analisis risiko", "enhanced due diligence",
-            "cdd", "edd", "sop", "kebijakan", "SOP", "mitigasi risiko", "pasal 17 permkham"
-        ]
-
-        # === Validasi File 1 ===
-        is_valid_ocr_q1, teks_ocr_q1, jumlah_kata_ditemukan_q1, tipe_file1 = validasi_ocr_pdf(
-            uploaded_file1, kata_kunci_umum
-        )
-
-        # === Validasi File 2 ===
-        is_valid_ocr_q2, teks_ocr_q2, jumlah_kata_ditemukan_q2, tipe_file2 = validasi_ocr_pdf(
-            uploaded_file2, kata_kunci_umum
-        )
-
-        # === Hitung Nilai Internal Control Gabungan ===
-        nilai_ic, kategori_ic = hitung_internal_control(
-            q1, q2,
-            uploaded_file1, uploaded_file2,
-            is_valid_ocr_q1, is_valid_ocr_q2
-        )
-
-        # ======================================================
-        # === Output hasil ke UI
-        # ======================================================
-        st.success(f"✅ Nilai Internal Control: {nilai_ic} ({kategori_ic})")
-        st.write(f"📄 File 1 terdeteksi sebagai: {tipe_file1}, kata kunci ditemukan: {jumlah_kata_ditemukan_q1}")
-        st.write(f"📄 File 2 terdeteksi sebagai: {tipe_file2}, kata kunci ditemukan: {jumlah_kata_ditemukan_q2}")
-
         # Simpan file pendukung (jika ada) & catat path
-        # --- Simpan file & upload ke Google Drive ---
+        # --- Simpan file lokal; validasi OCR & upload Drive dikerjakan worker latar belakang ---
         os.makedirs("uploads", exist_ok=True)
         doc1_path, doc2_path = "", ""
-        file_link_1, file_link_2 = "", ""
-
-        def upload_to_drive(local_path, original_name):
-            """Upload file ke folder Google Drive yang sudah di-share ke service account."""
-            if drive_service is None:
-                st.warning("⚠️ Tidak ada koneksi ke Google Drive. File hanya disimpan lokal.")
-                return local_path
-
-            try:
-                FOLDER_ID = "1FtagTFvNn9jIsT-pSdWujfFpr4DbsFT7"  # ID folder tujuan
-
-                # Metadata file (nama + folder tujuan)
-                file_metadata = {
-                    "name": original_name,
-                    "parents": [FOLDER_ID]
-                }
-
-                media = MediaFileUpload(local_path, mimetype="application/pdf")
-
-                # Upload file ke folder yang sudah di-share ke service account
-                uploaded = drive_service.files().create(
-                    body=file_metadata,
-                    media_body=media,
-                    fields="id, webViewLink",
-                    supportsAllDrives=True
-                ).execute()
-
-                file_id = uploaded.get("id")
-                link = uploaded.get("webViewLink")
-
-                # Jika upload gagal (nggak ada file_id)
-                if not file_id:
-                    st.warning("⚠️ Upload gagal: tidak ada file ID. Pastikan folder sudah di-share ke service account.")
-                    return local_path
-
-                # Tambahkan izin baca publik (biar bisa dilihat siapa pun yang bisa akses folder/spreadsheet)
-                try:
-                    drive_service.permissions().create(
-                        fileId=file_id,
-                        body={"type": "anyone", "role": "reader"},
-                        supportsAllDrives=True
-                    ).execute()
-                except Exception as perm_err:
-                    st.warning(f"⚠️ Tidak bisa ubah izin file (mungkin sudah publik): {perm_err}")
 
-                # Tampilkan hasil upload (buat debug)
-                st.write("✅ File berhasil diupload ke Drive:")
-                st.write(f"🧩 file_id: {file_id}")
-                st.write(f"🔗 webViewLink: {link}")
+        # Simpan file 1 (hanya untuk validasi OCR; tidak diupload ke Drive)
+        if uploaded_file1 is not None:
+            filename_1 = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_doc1_{uploaded_file1.name}"
+            doc1_path = os.path.join("uploads", filename_1)
+            with open(doc1_path, "wb") as f:
+                f.write(uploaded_file1.getbuffer())
 
-                return link
-
-            except Exception as e:
-                st.error(f"❌ Gagal upload ke Google Drive: {e}")
-                return local_path
-
-
-        # Simpan & upload file 2
+        # Simpan file 2 (diupload ke Drive oleh worker)
         if uploaded_file2 is not None:
             filename_2 = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_doc2_{uploaded_file2.name}"
             doc2_path = os.path.join("uploads", filename_2)
             with open(doc2_path, "wb") as f:
                 f.write(uploaded_file2.getbuffer())
-            file_link_2 = upload_to_drive(doc2_path, uploaded_file2.name)
 
         # Hitung risiko
-        hasil_inherent = hitung_risiko({
-            "profil": inputs_profil,
-            "bisnis": inputs_bisnis,
-            "jasa": inputs_jasa,
-            "negara": inputs_negara,
-            "apgakkum": inputs_apgakkum
-        })
+        jumlah = jawaban["jumlah"]
+        hasil_inherent = penilaian_risiko.hitung_risiko({
+            "profil": jumlah["profil"],
+            "bisnis": jumlah["bisnis_pengguna"],
+            "jasa": jumlah["jasa"],
+            "negara": jumlah["negara"],
+            "apgakkum": jawaban["apgakkum"]
+        }, aturan)
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        nilai_ic, kategori_ic = hitung_internal_control(q1, uploaded_file1, is_valid_ocr_q1)
-        kategori_residual, nilai_residual = hitung_residual_risk(
-            hasil_inherent["kategori_risiko"], kategori_ic
+        # Internal control gabungan Q1 & Q2, residual & tingkat risiko akhir dihitung worker
+        # setelah validasi OCR kedua dokumen
+        nilai_pengguna, kategori_pengguna = penilaian_risiko.risiko_pengguna_jasa(
+            sum(jumlah["profil"].values()), aturan
         )
-        nilai_pengguna, kategori_pengguna = risiko_pengguna_jasa(jumlah_klien)
-
-        df_temp = pd.DataFrame([{
-            "Nilai Residual Risk": nilai_residual,
-            "Nilai Risiko Pengguna Jasa": nilai_pengguna
-        }])
-        kategori_final = final_risk(df_temp).loc[0, "Tingkat Risiko"]
 
         # --- Susun baris lengkap ---
-        # Bagian identitas
-        data = {
-            "Timestamp": timestamp,
-            "Nama Notaris": nama_notaris.title(),
-            "NIK KTP": NIK_KTP,
-            "Username Akun AHU Online": username,
-            "Nomor HP": nomor_HP,
-            "2. Alamat Lengkap Notaris": alamat,
-            "Kota/Kabupaten": kota,
-            "3. Jumlah Klien Tahun 2024-2025": jumlah_klien,
-        }
-
-        # Rinci: profil, bisnis, jasa, produk, negara
-        data.update({k: inputs_profil.get(k, 0) for k in profil.keys()})
-        data.update({k: inputs_bisnis.get(k, 0) for k in bisnis_pengguna.keys()})
-        data.update({k: inputs_jasa.get(k, 0) for k in jasa.keys()})
-        data.update({k: inputs_produk.get(k, 0) for k in produk.keys()})
-        data.update({k: inputs_negara.get(k, 0) for k in negara.keys()})
+        # Identitas, jumlah klien per pilihan, 34 pertanyaan, dokumen & APGAKKUM dari skema form
+        data = {kuisioner.KOLOM_TIMESTAMP: timestamp, **kuisioner.baris(JENIS_FORM, jawaban)}
 
-        # 34 pertanyaan + dokumen pendukung
-        q_list = [q1,q2,q3,q4,q5,q6,q7,q8,q9,q10,q11,q12,q13,q14,q15,q16,q17,q18,q19,q20,q21,q22,q23,q24,q25,q26,q27,q28,q29,q30,q31,q32,q33,q34]
-        q_cols = [
-            "1.  Apakah Kantor Notaris anda memiliki mekanisme analisis risiko Pengguna Jasa? (form cdd, edd dan analisa resiko)",
-            "2.  Apakah Kantor Notaris anda memiliki kebijakan dan prosedur untuk mengelola dan memitigasi risiko tinggi ... Pasal 17 PerMenkumham 9/2017?",
-            "3.  Apakah Kantor Notaris anda memiliki kebijakan dan prosedur untuk mengelola dan memitigasi risiko sedang pencucian uang dan/atau pendanaan terorisme sebagaimana diatur dalam Pasal 7 PerMenkumham Nomor 9 Tahun 2017?",
-            "4.  Apakah Kantor Notaris anda memiliki kebijakan dan prosedur untuk mengelola dan memitigasi risiko rendah pencucian uang dan/atau pendanaan terorisme sebagaimana diatur dalam Pasal 16 PerMenkumham Nomor 9 Tahun 2017?",
-            "5.  Kebijakan larangan nama fiktif?",
-            "6.  Pengumpulan informasi OP (Pasal 7 ayat 1)?",
-            "7.  Pengumpulan informasi Korporasi (Pasal 7 ayat 2)?",
-            "8.  Pengumpulan informasi legal arrangements?",
-            "9.  Pengumpulan BO Korporasi (Pasal 8)?",
-            "10. Pengumpulan BO legal arrangement (Pasal 9)?",
-            "11. Kebijakan bertemu langsung dengan pengguna jasa?",
-            "12. Konfirmasi kebenaran formil dokumen ke pengguna jasa?",
-            "13. Meminta dokumen pendukung dari otoritas berwenang bila ragu?",
-            "14. Pemantauan kewajaran transaksi?",
-            "15. Pencatatan transaksi pengguna jasa?",
-            "16. Sistem informasi identifikasi/pemantauan/laporan transaksi?",
-            "17. Penatausahaan dokumen transaksi & BO?",
-            "18. Penatausahaan dokumen PJP & BO (prinsip PJP)?",
-            "19. Penatausahaan dokumen analisis kewajaran transaksi?",
-            "20. Putus hubungan bila PJP menolak prinsip PJP?",
-            "21. Putus hubungan bila info PJP diragukan?",
-            "22. Laporkan ke PPATK atas tindakan di no.20 & no.21?",
-            "23. Pemutakhiran informasi & dokumen PJP bila ada perubahan?",
-            "24. Dokumentasi hasil pemutakhiran?",
-            "25. Pemeriksaan berkala penerapan prinsip PJP?",
-            "26. Pemutakhiran daftar PJP/kuasa berisiko tinggi?",
-            "27. Screening penerimaan karyawan (pre-employee)?",
-            "28. Pengenalan & pemantauan profil karyawan?",
-            "29. Sosialisasi/perlatihan regulasi PJP?",
-            "30. Sosialisasi/perlatihan tipologi TPPU/TPPT?",
-            "31. Sosialisasi/perlatihan kebijakan & prosedur PJP?",
-            "32. Pemanfaatan teknologi baru?",
-            "33. Identifikasi & pengukuran risiko sebelum adopsi teknologi baru?",
-            "34. Kerja sama dengan penegak hukum & otoritas berwenang?"
-        ]
-        for i, col in enumerate(q_cols):
-            data[col] = q_list[i]
-        data["Dokumen_Pendukung (Q1)"] = file_link_1
-        data["Dokumen Pendukung (SOP PMPJ) (Q2)"] = file_link_2
-
-        # APGAKKUM + skor pilihan terbesar
-        data["Apakah Notaris pernah dipanggil atau diminta informasi oleh Aparat Penegak Hukum?"] = inputs_apgakkum
+        # Skor pilihan terbesar
         data["jawaban_profil"]   = hasil_inherent["jawaban_profil"]
         data["skor_profil"]      = hasil_inherent["skor_profil"]
         data["jawaban_bisnis"]   = hasil_inherent["jawaban_bisnis"]
@@ -714,33 +140,12 @@ if submitted:
         # Ringkasan skor/tingkat risiko
         data["Nilai Inherent Risk"]     = hasil_inherent["total_skor"]
         data["Tingkat Inherent Risk"]   = hasil_inherent["kategori_risiko"]
-        data["Nilai Internal Control"]  = nilai_ic
-        data["Tingkat Internal Control"]= kategori_ic
-        data["Tingkat Residual Risk"]   = kategori_residual
-        data["Nilai Residual Risk"]     = nilai_residual
         data["Nilai Risiko Pengguna Jasa"]   = nilai_pengguna
         data["Tingkat Risiko Pengguna Jasa"] = kategori_pengguna
-        data["Tingkat Risiko"]               = kategori_final
-
-        # --- Urutan kolom (opsional): taruh kolom identitas & ringkasan dulu, sisanya mengikuti ---
-        ident_cols = [
-            "Timestamp","Nama Notaris","NIK KTP","Username Akun AHU Online","Nomor HP",
-            "2. Alamat Lengkap Notaris","Kota/Kabupaten","3. Jumlah Klien Tahun 2024-2025"
-        ]
-        ringkasan_cols = [
-            "Nilai Inherent Risk","Tingkat Inherent Risk",
-            "Nilai Internal Control","Tingkat Internal Control",
-            "Tingkat Residual Risk","Nilai Residual Risk",
-            "Nilai Risiko Pengguna Jasa","Tingkat Risiko Pengguna Jasa","Tingkat Risiko"
-        ]
-        q_cols_with_docs = q_cols + ["Dokumen_Pendukung (Q1)","Dokumen Pendukung (SOP PMPJ) (Q2)"]
-        detail_cols = list(profil.keys()) + list(bisnis_pengguna.keys()) + list(jasa.keys()) + list(produk.keys()) + list(negara.keys())
-        pilihan_cols = ["Apakah Notaris pernah dipanggil atau diminta informasi oleh Aparat Penegak Hukum?",
-                        "jawaban_profil","skor_profil","jawaban_bisnis","skor_bisnis",
-                        "jawaban_jasa","skor_jasa","jawaban_negara","skor_negara",
-                        "jawaban_apgakkum","skor_apgakkum"]
+        data["Versi Aturan"]                 = hasil_inherent["versi_aturan"]
 
-        column_order = ident_cols + detail_cols + q_cols_with_docs + pilihan_cols + ringkasan_cols
+        # --- Urutan kolom: identitas, rincian, pertanyaan & dokumen, pilihan, ringkasan ---
+        column_order = kuisioner.column_order(JENIS_FORM, aturan)
 
         # --- Simpan ke Excel ---
         
@@ -753,68 +158,84 @@ if submitted:
             result = chr(65 + remainder) + result
         return result
 
-    if client is None:
-        st.error("Gagal autentikasi Google Sheets. Data tidak disimpan.")
-    else:
-        SPREADSHEET_NAME = "Hasil Penilaian Risiko"
-        SPREADSHEET_ID = "1sSzjDwgmqO6YhOGzSk4kqOybdlzAEXagWW36r3nY1OM"  
-        try:
-            try:
-                sh = client.open_by_key(SPREADSHEET_ID)
-            except gspread.SpreadsheetNotFound:
-                sh = client.open(SPREADSHEET_NAME)
-
-            worksheet = sh.sheet1  # sheet pertama
-
-            # Ambil semua data sheet
-            records = worksheet.get_all_records()
-            existing = pd.DataFrame(records)
-
-            # Kalau kosong, siapkan header
-            if existing.empty:
-                existing = pd.DataFrame(columns=column_order)
-
-            existing = existing.reindex(columns=column_order)
-
-            # Data baru
-            row_df = pd.DataFrame([data]).reindex(columns=column_order)
+    SPREADSHEET_NAME = "Hasil Penilaian Risiko"
+    SPREADSHEET_ID = "1sSzjDwgmqO6YhOGzSk4kqOybdlzAEXagWW36r3nY1OM"  
+    FOLDER_ID = "1FtagTFvNn9jIsT-pSdWujfFpr4DbsFT7"  # folder Drive (sudah di-share ke service account)
+    try:
+        # Upsert berdasarkan Nama + NIK di basis data lokal; Google Sheets
+        # dicerminkan secara batch oleh job sinkronisasi latar belakang.
+        target = basis_data.buat_target(
+            SUMBER_CREDS, column_order, ["Nama Notaris", "NIK KTP"], kunci=SPREADSHEET_ID, nama=SPREADSHEET_NAME
+        )
 
-            # Cek duplikat (Nama + NIK)
-            nama_baru = data.get("Nama Notaris", "")
-            nama_baru_lower = str(nama_baru).lower() if nama_baru else ""
-            nik_baru = data.get("NIK KTP", "")
+        # Validasi OCR kedua file, upload Drive, internal control & penyimpanan baris
+        # final dikerjakan di latar belakang (antrian_validasi.py); form langsung kembali.
+        id_pekerjaan = antrian_validasi.kirim(antrian_validasi.JENIS_Q1Q2, {
+            "sumber": SUMBER_CREDS,
+            "target": target,
+            "data": data,
+            "dokumen": [
+                {"path": doc1_path, "nama": uploaded_file1.name, "unggah": False,
+                 "kolom": kuisioner.DOKUMEN[0]["kolom"], "kolom_hash": kuisioner.DOKUMEN[0]["kolom_hash"]}
+                if doc1_path else None,
+                {"path": doc2_path, "nama": uploaded_file2.name, "unggah": True,
+                 "kolom": kuisioner.DOKUMEN[1]["kolom"], "kolom_hash": kuisioner.DOKUMEN[1]["kolom_hash"]}
+                if doc2_path else None,
+            ],
+            "folder_drive": FOLDER_ID,
+            "semua_drive": True,
+            "kata_kunci": validasi_dokumen.KATA_KUNCI_UMUM,
+            "jawaban": {"q1": q1, "q2": q2},
+            "kategori_inherent": hasil_inherent["kategori_risiko"],
+            "nilai_pengguna": nilai_pengguna,
+        })
+        st.session_state.setdefault("pekerjaan_validasi", []).append(id_pekerjaan)
 
-            if nama_baru_lower and nik_baru and not existing.empty:
-                existing_nama_lower = existing["Nama Notaris"].astype(str).str.lower()
-                existing_nik_str = existing["NIK KTP"].astype(str)
-                mask_duplikat = (existing_nama_lower == nama_baru_lower) & (existing_nik_str == str(nik_baru))
-            else:
-                mask_duplikat = pd.Series([False]*len(existing))
+        st.info("⏳ Data diterima. Dokumen pendukung sedang divalidasi; status ada di bawah.")
+        if client is None:
+            st.warning("⚠️ Koneksi Google Sheets belum tersedia. Data disimpan lokal dan akan dikirim otomatis.")
 
-            if mask_duplikat.any():
-                existing_filtered = existing[~mask_duplikat].copy()
-                df_all = pd.concat([existing_filtered, row_df], ignore_index=True)
-                st.warning(f"⚠️ Data lama untuk '{nama_baru}' (NIK: {nik_baru}) ditemukan dan diganti.")
+    except Exception as e:
+        import traceback
+        st.error(f"❌ Error saat menyimpan:\n{traceback.format_exc()}")
+
+# --- Status pemrosesan dokumen (pekerjaan latar belakang) ---
+antrian_validasi.jalankan_worker()
+
+
+# Fragment: tombol "Perbarui status" hanya menjalankan ulang bagian ini, bukan form
+@st.fragment
+def tampilkan_status():
+    daftar_pekerjaan = st.session_state.get("pekerjaan_validasi", [])
+    if daftar_pekerjaan:
+        st.subheader("Status Pemrosesan Dokumen")
+        masih_berjalan = False
+        for id_pekerjaan in reversed(daftar_pekerjaan):
+            pekerjaan = antrian_validasi.status(id_pekerjaan)
+            if pekerjaan is None:
+                continue
+            if pekerjaan["status"] in ("menunggu", "berjalan"):
+                masih_berjalan = True
+                st.progress(pekerjaan["kemajuan"], text=f"⏳ {pekerjaan['tahap'] or 'Menunggu antrian...'}")
+            elif pekerjaan["status"] == "gagal":
+                st.error(f"❌ Pemrosesan dokumen gagal: {pekerjaan['error']}")
             else:
-                df_all = pd.concat([existing, row_df], ignore_index=True)
-                st.info("✅ Data baru ditambahkan.")
-
-            # Clear & update sheet
-            worksheet.clear()
-
-            header = list(column_order)
-            values = df_all.fillna("").astype(str).values.tolist()
-            data_to_write = [header] + values
-
-            resp = worksheet.update("A1", data_to_write)
+                hasil = pekerjaan["hasil"]
+                for i, dok in enumerate(hasil["dokumen"], start=1):
+                    if dok.get("tipe") is not None:
+                        st.info(f"📄 File {i} terdeteksi sebagai: {dok['tipe']}, kata kunci ditemukan: {dok['jumlah_kata']}")
+                st.success(f"Nilai Internal Control: {hasil['nilai_ic']} - {hasil['kategori_ic']}")
+                if hasil["status_simpan"] == "diganti":
+                    st.warning(
+                        f"⚠️ Data lama untuk '{hasil['nama']}' (NIK: {hasil['nik']}) ditemukan dan diganti."
+                    )
+                else:
+                    st.info("✅ Data baru ditambahkan.")
+                st.success("✅ Data berhasil disimpan")
+            for pesan in pekerjaan["pesan"]:
+                st.caption(pesan)
+        if masih_berjalan:
+            st.button("🔄 Perbarui status")
 
-            # Tangani hasil resp
-            if isinstance(resp, dict):
-                st.success(f"✅ Data berhasil disimpan")
-            # else:
-            #     st.success("✅ Data tersimpan ke Google Spreadsheet.")
-            #     st.write("Response:", resp)   # debug
 
-        except Exception as e:
-            import traceback
-            st.error(f"❌ Error saat menyimpan:\n{traceback.format_exc()}")
+tampilkan_status()
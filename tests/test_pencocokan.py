@@ -0,0 +1,97 @@
+"""pencocokan.py harus memberi keputusan yang sama persis dengan loop difflib lama."""
+import random
+from difflib import SequenceMatcher
+
+import pytest
+
+import pencocokan
+from benchmarks import fixture
+
+
+KATA_KUNCI = [
+    "formulir customer due diligence", "analisis risiko", "enhanced due diligence",
+    "pasal 17 permkham", "kebijakan", "cdd", "sop pmpj",
+]
+
+
+def _jendela_referensi(kata, teks, ambang, lebih=3, awal=0, akhir=None):
+    batas = len(teks) - len(kata) + 1 if akhir is None else min(akhir, len(teks) - len(kata) + 1)
+    return any(
+        SequenceMatcher(None, kata, teks[i:i + len(kata) + lebih]).ratio() > ambang
+        for i in range(awal, batas)
+    )
+
+
+def _token_referensi(kata, teks, ambang, panjang_min):
+    return any(
+        SequenceMatcher(None, kata, t).ratio() > ambang for t in teks.split() if len(t) >= panjang_min
+    )
+
+
+def _rusak(kata, rnd, jumlah):
+    """Salinan `kata` dengan `jumlah` huruf diganti / dihapus / disisipkan (hasil OCR yang meleset)."""
+    huruf = list(kata)
+    for _ in range(jumlah):
+        i = rnd.randrange(len(huruf) + 1)
+        aksi = rnd.choice(("ganti", "hapus", "sisip"))
+        if aksi == "sisip" or not huruf:
+            huruf.insert(i, rnd.choice("aeiourstnkl "))
+        elif i < len(huruf):
+            if aksi == "ganti":
+                huruf[i] = rnd.choice("aeiourstnkl")
+            else:
+                del huruf[i]
+    return "".join(huruf)
+
+
+def _teks_acak(rnd, kata):
+    """Teks isian bising dengan beberapa kata kunci yang rusak di sekitar ambang."""
+    bagian = []
+    for _ in range(rnd.randint(3, 8)):
+        bagian.append(" ".join(rnd.choice(fixture.KATA_ISIAN) for _ in range(rnd.randint(1, 6))))
+        bagian.append(_rusak(rnd.choice(KATA_KUNCI + [kata]), rnd, rnd.randint(0, max(1, len(kata) // 2))))
+    return " ".join(bagian)
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_cari_jendela_mirip_sama_dengan_sequencematcher(seed):
+    rnd = random.Random(seed)
+    for _ in range(60):
+        kata = rnd.choice(KATA_KUNCI)
+        teks = _teks_acak(rnd, kata)
+        ambang = rnd.choice((0.6, 0.7, 0.8, 0.9))
+        lebih = rnd.randint(0, 4)
+        awal = rnd.randint(0, len(teks) // 2)
+        akhir = rnd.choice((None, rnd.randint(0, len(teks) + 5)))
+        assert pencocokan.cari_jendela_mirip(kata, teks, ambang, lebih, awal, akhir) == _jendela_referensi(
+            kata, teks, ambang, lebih, awal, akhir
+        ), (kata, teks, ambang, lebih, awal, akhir)
+
+
+def test_cari_jendela_mirip_teks_pendek():
+    assert pencocokan.cari_jendela_mirip("kebijakan", "", 0.6) is False
+    assert pencocokan.cari_jendela_mirip("kebijakan", "kebijak", 0.6) is False
+    assert pencocokan.cari_jendela_mirip("kebijakan", "kebijakan", 0.6) is True
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_cari_token_mirip_sama_dengan_sequencematcher(seed):
+    rnd = random.Random(100 + seed)
+    for _ in range(60):
+        kata = rnd.choice([k for k in KATA_KUNCI if " " not in k] + ["permkham", "mitigasi", "diligence"])
+        teks = _teks_acak(rnd, kata)
+        ambang = rnd.choice((0.6, 0.7, 0.8))
+        panjang_min = rnd.choice((1, 3, 4))
+        token = pencocokan.siapkan_token(teks, panjang_min=panjang_min)
+        assert pencocokan.cari_token_mirip(kata, token, ambang) == _token_referensi(
+            kata, teks, ambang, panjang_min
+        ), (kata, teks, ambang, panjang_min)
+
+
+def test_teks_ocr_bising_benchmark():
+    teks = fixture.teks_ocr_bising(3_000, seed=5)
+    token = pencocokan.siapkan_token(teks)
+    for kata in ("analisis risiko", "pasal 17 permkham", "enhanced due diligence"):
+        assert pencocokan.cari_jendela_mirip(kata, teks, 0.6) == _jendela_referensi(kata, teks, 0.6)
+    for kata in ("permkham", "kebijakan", "mitigasi", "diligence"):
+        assert pencocokan.cari_token_mirip(kata, token, 0.7) == _token_referensi(kata, teks, 0.7, 4)
@@ -0,0 +1,52 @@
+"""nilai_ulang (vektor) harus sama dengan fungsi per-submit di penilaian_risiko.py."""
+import pandas as pd
+import pytest
+
+import aturan_penilaian
+import penilaian_massal
+import penilaian_risiko
+from benchmarks import fixture
+
+
+@pytest.fixture(scope="module")
+def aturan():
+    return aturan_penilaian.muat()
+
+
+@pytest.mark.parametrize("per_wilayah", [True, False])
+def test_nilai_ulang_sama_dengan_hitung_risiko(aturan, per_wilayah):
+    data = fixture.data_submit(500, seed=11, aturan=aturan, per_wilayah=per_wilayah)
+    # Kategori internal control tak dikenal & semua jumlah 0 (pilihan default) juga harus sama
+    data[0][penilaian_massal.KOLOM_INTERNAL_CONTROL] = "Belum Dinilai"
+    for label in aturan.label["profil"]:
+        data[1][label] = 0
+    hasil = penilaian_massal.nilai_ulang(pd.DataFrame(data), per_wilayah=per_wilayah, aturan=aturan)
+
+    for baris, (_, ulang) in zip(data, hasil.iterrows()):
+        inherent = penilaian_risiko.hitung_risiko(fixture.input_form(baris, aturan), aturan)
+        for kolom, nilai in inherent.items():
+            if kolom.startswith(("jawaban_", "skor_")):
+                assert ulang[kolom] == nilai, kolom
+        assert ulang["Nilai Inherent Risk"] == inherent["total_skor"]
+        assert ulang["Tingkat Inherent Risk"] == inherent["kategori_risiko"]
+
+        kategori_res, nilai_res = penilaian_risiko.hitung_residual_risk(
+            inherent["kategori_risiko"], baris[penilaian_massal.KOLOM_INTERNAL_CONTROL], aturan
+        )
+        assert ulang["Tingkat Residual Risk"] == kategori_res
+        assert ulang["Nilai Residual Risk"] == nilai_res
+
+        nilai_peng, kategori_peng = penilaian_risiko.risiko_pengguna_jasa(
+            baris[penilaian_massal.KOLOM_JUMLAH_KLIEN], aturan
+        )
+        assert ulang["Nilai Risiko Pengguna Jasa"] == nilai_peng
+        assert ulang["Tingkat Risiko Pengguna Jasa"] == kategori_peng
+        assert ulang["Tingkat Risiko"] == penilaian_risiko.tingkat_risiko(nilai_res, nilai_peng, aturan)
+        assert ulang[penilaian_massal.KOLOM_VERSI_ATURAN] == inherent["versi_aturan"]
+
+
+def test_nilai_ulang_skor_provinsi(aturan):
+    provinsi = next(iter(aturan.bobot["wilayah_skor"]))
+    df = pd.DataFrame(fixture.data_submit(3, seed=2, aturan=aturan)).assign(**{provinsi: -1})
+    hasil = penilaian_massal.nilai_ulang(df, aturan=aturan)
+    assert (hasil[provinsi] == aturan.bobot["wilayah_skor"][provinsi]).all()
@@ -0,0 +1,200 @@
+"""
+Upload dokumen pendukung (PDF) ke folder Google Drive.
+
+Dipakai worker antrian_validasi.py; service Drive diambil dari cache
+koneksi_google sehingga aman dipanggil dari thread mana pun.
+
+Isi PDF dikirim langsung dari memori (bytes yang sudah dibaca worker untuk
+validasi), tanpa membaca ulang file lokal. File yang lebih besar dari satu
+chunk dikirim dengan resumable upload per UKURAN_CHUNK; bila koneksi putus
+atau Google membalas 429/5xx, upload dilanjutkan dari byte terakhir yang
+diterima server, bukan diulang dari awal. File kecil (<= satu chunk) cukup
+satu request multipart.
+
+Izin baca publik hanya dipasang per file bila folder tujuan belum dibagikan
+"siapa saja yang punya link" (file di folder publik mewarisi izinnya), jadi
+pada folder yang sudah publik setiap upload tidak butuh request tambahan.
+
+Dokumen dengan isi identik (SHA-256 sama) di folder yang sama tidak diupload
+ulang: link file yang sudah ada diambil dari tabel berkas_drive di basis data
+lokal (mis. notaris submit ulang form CDD yang sama, atau template Kanwil
+yang dipakai banyak kantor). Jika file itu dihapus dari Drive, hapus juga
+entrinya dengan basis_data.lupakan_berkas_drive(file_id).
+"""
+import hashlib
+import io
+import logging
+import os
+import random
+import socket
+import threading
+import time
+
+import basis_data
+import koneksi_google
+import metrik
+
+
+# Ukuran chunk resumable upload; harus kelipatan 256 KiB (syarat Drive API)
+_KELIPATAN_CHUNK = 256 * 1024
+UKURAN_CHUNK = max(
+    int(float(os.environ.get("PMPJ_CHUNK_UNGGAH_MB", 8)) * 1024 * 1024) // _KELIPATAN_CHUNK, 1
+) * _KELIPATAN_CHUNK
+BATAS_COBA = int(os.environ.get("PMPJ_BATAS_COBA_UNGGAH", 6))   # percobaan per request yang gagal sementara
+JEDA_MAKS = 30.0           # detik, batas backoff antar percobaan
+CACHE_IZIN_FOLDER = 600.0  # detik status publik folder disimpan
+
+STATUS_SEMENTARA = {408, 429, 500, 502, 503, 504}
+
+logger = logging.getLogger(__name__)
+
+_izin_folder = {}   # folder_id -> (waktu cek, publik?)
+_kunci_izin = threading.Lock()
+
+# Lock per potongan hash: isi sama yang diupload bersamaan hanya dikirim sekali
+_kunci_isi = [threading.Lock() for _ in range(64)]
+
+
+def _gagal_sementara(e):
+    import httplib2
+    from googleapiclient.errors import HttpError
+
+    if isinstance(e, HttpError):
+        return e.resp is not None and int(e.resp.status) in STATUS_SEMENTARA
+    return isinstance(e, (httplib2.HttpLib2Error, ConnectionError, socket.timeout, TimeoutError))
+
+
+def _dengan_coba_ulang(fungsi, laporan, keterangan):
+    """Jalankan fungsi; ulangi dengan backoff eksponensial bila gagalnya sementara."""
+    for percobaan in range(BATAS_COBA):
+        try:
+            return fungsi()
+        except Exception as e:
+            if not _gagal_sementara(e) or percobaan == BATAS_COBA - 1:
+                raise
+            jeda = min(2 ** percobaan, JEDA_MAKS) * (0.5 + random.random() / 2)
+            metrik.tambah("unggah_coba_ulang_total")
+            laporan(f"⏳ {keterangan} terganggu ({e}); dicoba lagi dalam {jeda:.1f} detik...")
+            time.sleep(jeda)
+
+
+def _folder_publik(drive_service, folder_id, opsi):
+    """True jika folder sudah bisa dibaca siapa saja yang punya link (di-cache sebentar)."""
+    with _kunci_izin:
+        tersimpan = _izin_folder.get(folder_id)
+    if tersimpan is not None and time.monotonic() - tersimpan[0] < CACHE_IZIN_FOLDER:
+        return tersimpan[1]
+
+    try:
+        metrik.tambah("google_api_total", layanan="drive", operasi="files.get")
+        meta = drive_service.files().get(
+            fileId=folder_id, fields="permissions(type,role)", **opsi
+        ).execute()
+    except Exception as e:
+        logger.info("Izin folder %s tidak bisa dibaca, izin dipasang per file: %s", folder_id, e)
+        return False
+    publik = any(
+        p.get("type") == "anyone" and p.get("role") in ("reader", "commenter", "writer")
+        for p in meta.get("permissions", [])
+    )
+    with _kunci_izin:
+        _izin_folder[folder_id] = (time.monotonic(), publik)
+    return publik
+
+
+def _kirim_isi(drive_service, isi_pdf, file_metadata, opsi, laporan):
+    """Upload isi (bytes); resumable per chunk bila lebih besar dari satu chunk."""
+    from googleapiclient.http import MediaIoBaseUpload
+
+    resumable = len(isi_pdf) > UKURAN_CHUNK
+    media = MediaIoBaseUpload(
+        io.BytesIO(isi_pdf), mimetype="application/pdf", chunksize=UKURAN_CHUNK, resumable=resumable
+    )
+    metrik.tambah("google_api_total", layanan="drive", operasi="files.create")
+    request = drive_service.files().create(
+        body=file_metadata, media_body=media, fields="id, webViewLink", **opsi
+    )
+    if not resumable:
+        return _dengan_coba_ulang(request.execute, laporan, "Upload")
+
+    # Setelah error, next_chunk() menanyakan posisi terakhir ke server lalu melanjutkan dari sana
+    respons = None
+    while respons is None:
+        status, respons = _dengan_coba_ulang(request.next_chunk, laporan, "Upload")
+        metrik.tambah("google_api_total", layanan="drive", operasi="upload_chunk")
+        if status is not None:
+            laporan(f"⬆️ Upload {file_metadata['name']}: {int(status.progress() * 100)}%")
+    return respons
+
+
+def sha256(isi_pdf):
+    return hashlib.sha256(isi_pdf).hexdigest()
+
+
+def unggah_pdf(sumber, isi_pdf, nama_asli, folder_id, semua_drive=False, laporan=None,
+               hash_isi=None, path_db=basis_data.PATH_DB):
+    """
+    Upload isi PDF (bytes) ke folder Drive (harus sudah di-share ke akun
+    `sumber`) dan pastikan bisa dibaca publik. Isi yang sudah pernah diupload
+    ke folder itu tidak dikirim lagi; link lamanya dipakai. Mengembalikan link
+    file, atau None jika Drive tidak tersedia / upload gagal (salinan lokal di
+    uploads/ tidak disentuh sehingga upload bisa diulang).
+    """
+    laporan = laporan or logger.warning
+    hash_isi = hash_isi or sha256(isi_pdf)
+    with metrik.waktu("unggah_drive"), _kunci_isi[int(hash_isi[:8], 16) % len(_kunci_isi)]:
+        tersimpan = basis_data.cari_berkas_drive(hash_isi, folder_id, path=path_db)
+        if tersimpan is not None:
+            metrik.tambah("unggah_dedup_total", hasil="dipakai_ulang")
+            logger.info("File %s sama dengan %s di Drive, tidak diupload ulang", nama_asli, tersimpan[0])
+            return tersimpan[1]
+
+        metrik.tambah("unggah_dedup_total", hasil="baru")
+        hasil = _unggah(sumber, isi_pdf, nama_asli, folder_id, semua_drive, laporan)
+        if hasil is None:
+            return None
+        file_id, link = hasil
+        basis_data.simpan_berkas_drive(hash_isi, folder_id, file_id, link, len(isi_pdf), path=path_db)
+        return link
+
+
+def _unggah(sumber, isi_pdf, nama_asli, folder_id, semua_drive, laporan):
+    """(file_id, link) hasil upload, atau None jika Drive tidak tersedia / upload gagal."""
+    try:
+        drive_service = koneksi_google.ambil_drive_service(sumber)
+    except Exception:
+        laporan("⚠️ Tidak ada koneksi ke Google Drive. File hanya disimpan lokal.")
+        return None
+
+    opsi = {"supportsAllDrives": True} if semua_drive else {}
+    try:
+        # Metadata file (nama + folder tujuan)
+        file_metadata = {"name": nama_asli, "parents": [folder_id]}
+        uploaded = _kirim_isi(drive_service, isi_pdf, file_metadata, opsi, laporan)
+
+        file_id = uploaded.get("id")
+        if not file_id:
+            laporan("⚠️ Upload gagal: tidak ada file ID. Pastikan folder sudah di-share ke service account.")
+            return None
+
+        # Izin baca publik (biar bisa dilihat siapa pun yang bisa akses spreadsheet);
+        # tidak perlu jika folder sudah publik karena file mewarisi izin folder
+        if not _folder_publik(drive_service, folder_id, opsi):
+            try:
+                metrik.tambah("google_api_total", layanan="drive", operasi="permissions.create")
+                _dengan_coba_ulang(
+                    drive_service.permissions().create(
+                        fileId=file_id, body={"type": "anyone", "role": "reader"}, fields="id", **opsi
+                    ).execute,
+                    laporan, "Pengaturan izin"
+                )
+            except Exception as perm_err:
+                laporan(f"⚠️ Tidak bisa ubah izin file (mungkin sudah publik): {perm_err}")
+
+        link = uploaded.get("webViewLink") or f"https://drive.google.com/file/d/{file_id}/view?usp=sharing"
+        logger.info("File %s diupload ke Drive: %s", nama_asli, link)
+        return file_id, link
+
+    except Exception as e:
+        laporan(f"❌ Gagal upload ke Google Drive: {e}")
+        return None
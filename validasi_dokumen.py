@@ -0,0 +1,275 @@
+"""
+Validasi dokumen pendukung kuisioner (ekstraksi teks / OCR + kata kunci).
+
+Dipakai oleh worker antrian_validasi.py (dan alat lain tanpa Streamlit),
+jadi tidak ada pemanggilan st.*: peringatan dikirim ke callback `laporan`
+(default: logging). Hasil disimpan di cache_dokumen per isi PDF.
+
+Modul dokumen (pdfplumber, pytesseract, pdf2image, PyPDF2) baru di-import
+saat dokumen pertama divalidasi, sehingga form yang hanya butuh
+KATA_KUNCI_UMUM tidak ikut memuatnya saat start.
+"""
+import logging
+from contextlib import closing
+
+import cache_dokumen
+import metrik
+import pencocokan
+
+
+logger = logging.getLogger(__name__)
+
+# Kata kunci umum form q1q2 (biar fungsi bisa deteksi otomatis Q1 / Q2)
+KATA_KUNCI_UMUM = [
+    "formulir customer due diligence", "analisis risiko", "enhanced due diligence",
+    "cdd", "edd", "sop", "kebijakan", "SOP", "mitigasi risiko", "pasal 17 permkham"
+]
+
+
+# --- Kuisioner Kanwil (stkanwil.py) ---
+def validasi_kanwil(pdf_bytes, kata_kunci_list, judul="", laporan=None):
+    """
+    Validasi dokumen Q1 kuisioner Kanwil (CDD/EDD/Analisis Risiko).
+    Mengembalikan (valid, teks, jumlah kata kunci ditemukan).
+    """
+    laporan = laporan or logger.warning
+    if pdf_bytes is None:
+        return False, "Tidak ada file.", 0
+    import dokumen
+
+    try:
+        # PDF yang sama (isi + pengaturan) langsung diambil dari cache disk
+        kunci_cache = cache_dokumen.buat_kunci(
+            pdf_bytes, fungsi="validasi_kanwil", versi=4, kata_kunci=kata_kunci_list,
+            maks_halaman=5, dpi=dokumen.DPI_ADAPTIF, ambang=dokumen.AMBANG_KEYAKINAN,
+            mesin=dokumen.MESIN_PDFPLUMBER
+        )
+        tersimpan = cache_dokumen.ambil(kunci_cache)
+        metrik.tambah("cache_dokumen_total", hasil="miss" if tersimpan is None else "hit")
+        if tersimpan is not None:
+            return tuple(tersimpan)
+
+        variasi_kata = [
+            "formulir customer due diligence perorangan",
+            "formulir customer due diligence",
+            "enhanced due diligence", "formulir customer due diligence korporasi"
+        ]
+
+        all_text = ""
+        ditemukan = set()  # indeks kata kunci yang sudah ketemu
+        awal_fuzzy = [0] * len(kata_kunci_list)  # per kata kunci: posisi jendela pertama yang belum dicek
+
+        def fuzzy_found(i, keyword, akhir_dokumen):
+            # Jendela all_text[j:j+panjang+3] dengan rasio difflib > 0.6; linear, lihat pencocokan.py.
+            # Sebelum dokumen selesai hanya jendela utuh yang dicek: len(keyword)+3 karakter terakhir
+            # ditahan sampai halaman berikutnya datang, sehingga hasilnya sama dengan sekali cek
+            # pada teks lengkap
+            akhir = None if akhir_dokumen else max(len(all_text) - len(keyword) - 3 + 1, 0)
+            awal, awal_fuzzy[i] = awal_fuzzy[i], max(awal_fuzzy[i], akhir or 0)
+            return pencocokan.cari_jendela_mirip(keyword, all_text, 0.6, lebih=3, awal=awal, akhir=akhir)
+
+        def periksa(akhir_dokumen=False):
+            """Cek kata kunci yang belum ketemu; True jika semua kata kunci sudah ketemu."""
+            with metrik.waktu("pencocokan"):
+                for i, kata_utama in enumerate(kata_kunci_list):
+                    if i in ditemukan:
+                        continue  # teks hanya bertambah, kata yang sudah ketemu tetap ketemu
+                    kata_lower = kata_utama.lower()
+                    variasi_relevan = [v for v in variasi_kata if kata_lower in v.lower()]
+                    found = (
+                        kata_lower in all_text
+                        or any(v in all_text for v in variasi_relevan)
+                        or fuzzy_found(i, kata_lower, akhir_dokumen)
+                    )
+                    if found:
+                        ditemukan.add(i)
+            return len(ditemukan) == len(kata_kunci_list)
+
+        def tambah_halaman(teks):
+            """Tambah teks satu halaman; True jika semua kata kunci sudah ketemu."""
+            nonlocal all_text
+            if not teks:
+                return False
+            all_text += teks.lower() + "\n"
+            return periksa()
+
+        # Text layer dicek per halaman; hanya halaman tanpa text layer (scan) yang di-OCR
+        try:
+            lapisan = dokumen.lapisan_teks(pdf_bytes, maks_halaman=5, ekstraktor=dokumen.EKSTRAKTOR_PDFPLUMBER)
+        except Exception as e:
+            laporan(f"⚠️ Gagal ekstrak teks langsung: {e}")
+            lapisan = [(None, True)] * 5
+
+        if any(perlu_ocr for _, perlu_ocr in lapisan):
+            laporan("📸 Proses scan PDF sedang berjalan...")
+
+        # Halaman diproses berurutan; berhenti begitu hasil tidak bisa berubah lagi
+        try:
+            # 🔹 Render + OCR halaman scan pertama dulu, sisanya paralel di process pool hanya bila perlu;
+            #    resolusi rendah dulu, naik hanya untuk halaman yang keyakinan OCR-nya rendah
+            with closing(dokumen.gabung_halaman(
+                pdf_bytes, lapisan, dpi=dokumen.DPI_ADAPTIF, mesin=dokumen.MESIN_PDFPLUMBER
+            )) as halaman:
+                for text in halaman:
+                    if tambah_halaman(text):
+                        break
+        except Exception as e:
+            if not all_text.strip():
+                laporan(f"❌ Gagal OCR dari gambar PDF: {e}")
+                return False, "Error OCR", 0
+            laporan(f"⚠️ Sebagian halaman gagal di-OCR: {e}")
+
+        # Dokumen selesai: cek jendela di ujung teks yang tadi ditahan
+        periksa(akhir_dokumen=True)
+        jumlah_ditemukan = len(ditemukan)
+
+        if not all_text.strip():
+            laporan(f"⚠️ OCR tidak menemukan teks di file {judul}.")
+            return False, "Tidak ada teks terdeteksi", 0
+
+        hasil = (True, all_text, jumlah_ditemukan)
+        cache_dokumen.simpan(kunci_cache, hasil)
+        return hasil
+
+    except Exception as e:
+        laporan(f"❌ Error umum saat OCR: {e}")
+        return False, "Error OCR", 0
+
+
+# --- Kuisioner Q1/Q2 dengan deteksi tipe otomatis (q1q2.py) ---
+def validasi_q1q2(pdf_bytes, kata_kunci_list, laporan=None):
+    """
+    Validasi isi file PDF (OCR + deteksi otomatis tipe dokumen).
+    Mengembalikan:
+        - True/False: status valid OCR
+        - all_text: teks hasil OCR
+        - jumlah_ditemukan: jumlah kata kunci yang ditemukan
+        - tipe_file: 'Q1', 'Q2', atau 'Tidak Teridentifikasi'
+    """
+    laporan = laporan or logger.warning
+    if pdf_bytes is None:
+        return False, "Tidak ada file.", 0, "Tidak Teridentifikasi"
+    import dokumen
+
+    try:
+        # --- 0) PDF yang sama (isi + pengaturan) langsung diambil dari cache disk ---
+        kunci_cache = cache_dokumen.buat_kunci(
+            pdf_bytes, fungsi="validasi_q1q2", versi=4, kata_kunci=kata_kunci_list,
+            maks_halaman=5, dpi=dokumen.DPI_ADAPTIF, ambang=dokumen.AMBANG_KEYAKINAN,
+            mesin=dokumen.MESIN_PDF2IMAGE
+        )
+        tersimpan = cache_dokumen.ambil(kunci_cache)
+        metrik.tambah("cache_dokumen_total", hasil="miss" if tersimpan is None else "hit")
+        if tersimpan is not None:
+            return tuple(tersimpan)
+
+        indikator_q1 = ["cdd", "edd", "formulir customer", "analisis risiko", "analisis resiko"]
+        indikator_q2 = ["sop", "kebijakan", "pmpj", "mitigasi risiko", "permenkumham", "pengendalian intern"]
+        variasi_q1 = [
+            "formulir customer due diligence perorangan",
+            "formulir customer due diligence korporasi",
+            "analisis risiko", "analisis resiko",
+            "enhanced due diligence", "cdd", "edd"
+        ]
+        variasi_q2 = [
+            "sop pmpj", "kebijakan pmpj", "prosedur pmpj",
+            "pedoman pmpj", "mitigasi risiko", "pasal 17 permkham",
+            "pengendalian intern", "penerapan pmpj"
+        ]
+        kata_lower_list = [k.lower() for k in kata_kunci_list]
+
+        all_text = ""
+        fuzzy_ditemukan = set()  # indeks kata kunci yang cocok fuzzy (teks hanya bertambah)
+
+        # --- Deteksi tipe dokumen otomatis ---
+        def hitung_indikator():
+            return (sum(1 for kata in indikator_q1 if kata in all_text),
+                    sum(1 for kata in indikator_q2 if kata in all_text))
+
+        def tentukan_tipe():
+            hitung_q1, hitung_q2 = hitung_indikator()
+            if hitung_q1 > hitung_q2:
+                return "Q1", variasi_q1
+            if hitung_q2 > hitung_q1:
+                return "Q2", variasi_q2
+            return "Tidak Teridentifikasi", kata_kunci_list  # fallback
+
+        def tipe_pasti():
+            # Indikator hanya bertambah: tipe tetap bila tipe lain tidak bisa menyusul
+            # lagi, yaitu bila hitungannya melebihi semua indikator tipe lain.
+            # Dengan 5 indikator Q1 vs 6 indikator Q2, Q1 tidak pernah pasti lebih awal:
+            # berhenti awal hanya terjadi pada Q2 dengan keenam indikatornya ketemu;
+            # dokumen Q1 / tak teridentifikasi selalu dibaca sampai maks_halaman.
+            # (valid tidak bergantung pada tipe, tetapi tipe & jumlah kata ikut dilaporkan.)
+            hitung_q1, hitung_q2 = hitung_indikator()
+            return hitung_q1 > len(indikator_q2) or hitung_q2 > len(indikator_q1)
+
+        # --- Cek kata kunci utama ---
+        def kata_ditemukan(variasi_kata):
+            hasil_cek = set()
+            for i, kata_lower in enumerate(kata_lower_list):
+                variasi_relevan = [v for v in variasi_kata if kata_lower in v.lower()]
+                if (
+                    kata_lower in all_text
+                    or any(v in all_text for v in variasi_relevan)
+                    or i in fuzzy_ditemukan
+                ):
+                    hasil_cek.add(i)
+            return hasil_cek
+
+        def tambah_halaman(teks):
+            """
+            Tambah teks satu halaman lalu klasifikasi ulang.
+            True hanya jika halaman sisanya tidak bisa mengubah hasil: tipe sudah
+            pasti (praktis hanya Q2, lihat tipe_pasti) dan semua kata kunci sudah
+            ketemu. Selain itu semua halaman dibaca.
+            """
+            nonlocal all_text
+            if not teks:
+                return False
+            teks = teks.lower()
+            all_text += teks + "\n"
+
+            with metrik.waktu("pencocokan"):
+                # Fuzzy matching (biar toleran OCR); token tidak melintasi halaman,
+                # jadi cukup token unik halaman baru yang dicek (lihat pencocokan.py)
+                chunks = pencocokan.siapkan_token(teks, panjang_min=4)
+                for i, kata_lower in enumerate(kata_lower_list):
+                    if i in fuzzy_ditemukan or kata_lower in all_text:
+                        continue
+                    if pencocokan.cari_token_mirip(kata_lower, chunks, 0.7):
+                        fuzzy_ditemukan.add(i)
+
+                _, variasi_kata = tentukan_tipe()
+                return tipe_pasti() and len(kata_ditemukan(variasi_kata)) == len(kata_lower_list)
+
+        # --- 1) Cek text layer per halaman (PDF campuran: digital + hasil scan) ---
+        try:
+            lapisan = dokumen.lapisan_teks(pdf_bytes, maks_halaman=5, ekstraktor=dokumen.EKSTRAKTOR_PYPDF2)
+        except Exception:
+            lapisan = [(None, True)] * 5
+
+        # --- 2) Gabungkan teks langsung + OCR halaman scan, halaman demi halaman ---
+        # Halaman scan pertama di-OCR dulu; berikutnya paralel di process pool hanya bila perlu.
+        # Resolusi rendah dulu; naik ke 300 dpi hanya untuk halaman yang keyakinan OCR-nya rendah
+        try:
+            with closing(dokumen.gabung_halaman(pdf_bytes, lapisan, dpi=dokumen.DPI_ADAPTIF)) as halaman:
+                for text in halaman:
+                    if tambah_halaman(text):
+                        break
+        except Exception as e:
+            if not all_text.strip():
+                laporan(f"OCR gagal: {e}. Pastikan poppler dan tesseract terinstal.")
+                return False, "Error OCR", 0, "Tidak Teridentifikasi"
+            laporan(f"Sebagian halaman gagal di-OCR: {e}")
+
+        # --- 3) Tipe & jumlah kata kunci dari halaman yang sudah dibaca ---
+        tipe_file, variasi_kata = tentukan_tipe()
+        jumlah_ditemukan = len(kata_ditemukan(variasi_kata))
+
+        hasil = (True, all_text, jumlah_ditemukan, tipe_file)
+        cache_dokumen.simpan(kunci_cache, hasil)
+        return hasil
+
+    except Exception:
+        return False, "Error OCR", 0, "Tidak Teridentifikasi"
@@ -0,0 +1,177 @@
+"""
+Validasi massal arsip PDF (CDD/EDD & SOP PMPJ) tanpa Streamlit.
+
+Menjalankan logika deteksi tipe Q1/Q2 + kata kunci yang sama dengan form
+q1q2.py (validasi_dokumen.validasi_q1q2) untuk semua PDF di sebuah folder,
+dengan beberapa proses worker. Hasil ditulis per baris (JSON Lines) begitu
+satu file selesai, sehingga bisa dipantau dengan `tail -f` dan dilanjutkan
+setelah terputus: file yang sudah tercatat (path, ukuran & waktu ubah sama)
+dilewati. File yang gagal diperiksa (mis. tidak bisa dibaca) dicatat dengan
+field "error" tanpa menghentikan proses, dan dicoba lagi saat dijalankan ulang.
+
+Contoh:
+    python validasi_massal.py uploads --keluaran hasil_validasi.jsonl --worker 4
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import dokumen
+import metrik
+import validasi_dokumen
+
+
+logger = logging.getLogger(__name__)
+
+
+def cari_pdf(folder):
+    """Semua file .pdf di bawah folder (rekursif, urut), sebagai path relatif."""
+    hasil = []
+    for akar, subfolder, daftar_file in os.walk(folder):
+        subfolder.sort()
+        for nama in sorted(daftar_file):
+            if nama.lower().endswith(".pdf"):
+                hasil.append(os.path.relpath(os.path.join(akar, nama), folder))
+    return hasil
+
+
+def _identitas(folder, relatif):
+    info = os.stat(os.path.join(folder, relatif))
+    return relatif, info.st_size, int(info.st_mtime)
+
+
+def sudah_diproses(path_keluaran):
+    """Identitas (file, ukuran, diubah) yang sudah tercatat di file keluaran (selain yang error)."""
+    selesai = set()
+    if not os.path.exists(path_keluaran):
+        return selesai
+    with open(path_keluaran, encoding="utf-8") as f:
+        for baris in f:
+            try:
+                hasil = json.loads(baris)
+                if "error" not in hasil:
+                    selesai.add((hasil["file"], hasil["ukuran"], hasil["diubah"]))
+            except (ValueError, KeyError):
+                continue  # baris terakhir terpotong saat proses dihentikan
+    return selesai
+
+
+# --- Dijalankan di proses worker ---
+def _siapkan_worker(tesseract_cmd):
+    # Paralelisme ada di level file: OCR halaman dikerjakan langsung di proses worker
+    dokumen.JUMLAH_PROSES_OCR = 1
+    if tesseract_cmd:
+        import pytesseract
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+
+def _periksa(folder, relatif, ukuran, diubah, kata_kunci):
+    mulai = time.perf_counter()
+    pesan = []
+    with open(os.path.join(folder, relatif), "rb") as f:
+        pdf_bytes = f.read()
+    detik_baca = time.perf_counter() - mulai
+
+    # Satu file per proses worker pada satu waktu: selisih penghitung = halaman OCR file ini
+    sebelum = metrik.nilai("halaman_total", sumber="ocr")
+    valid, _, jumlah, tipe = validasi_dokumen.validasi_q1q2(pdf_bytes, kata_kunci, laporan=pesan.append)
+    halaman_ocr = metrik.nilai("halaman_total", sumber="ocr") - sebelum
+
+    return {
+        "file": relatif, "ukuran": ukuran, "diubah": diubah,
+        "valid": valid, "tipe": tipe, "jumlah_kata": jumlah,
+        "halaman_ocr": halaman_ocr,
+        "detik_baca": round(detik_baca, 3),
+        "detik_validasi": round(time.perf_counter() - mulai - detik_baca, 3),
+        "pesan": pesan,
+    }
+
+
+# --- Proses utama ---
+def jalankan(folder, path_keluaran, jumlah_worker, kata_kunci=validasi_dokumen.KATA_KUNCI_UMUM,
+             tesseract_cmd=None):
+    """Validasi semua PDF yang belum tercatat; mengembalikan jumlah file yang diproses."""
+    selesai = sudah_diproses(path_keluaran)
+    antrian = [
+        identitas for identitas in (_identitas(folder, r) for r in cari_pdf(folder))
+        if identitas not in selesai
+    ]
+    logger.info("%d PDF baru, %d sudah tercatat", len(antrian), len(selesai))
+    if not antrian:
+        return 0
+
+    # Lanjutkan di baris baru jika baris terakhir terpotong
+    if os.path.exists(path_keluaran) and os.path.getsize(path_keluaran):
+        with open(path_keluaran, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            terpotong = f.read(1) != b"\n"
+    else:
+        terpotong = False
+
+    diproses = 0
+    mulai = time.perf_counter()
+    with open(path_keluaran, "a", encoding="utf-8") as keluaran, ProcessPoolExecutor(
+        max_workers=jumlah_worker, mp_context=multiprocessing.get_context("spawn"),
+        initializer=_siapkan_worker, initargs=(tesseract_cmd,)
+    ) as executor:
+        if terpotong:
+            keluaran.write("\n")
+        sisa = iter(antrian)
+        berjalan = {}   # future -> identitas file
+        try:
+            while True:
+                # Antrian dibatasi supaya Ctrl+C tidak membuang ribuan tugas yang sudah dikirim
+                for identitas in sisa:
+                    berjalan[executor.submit(_periksa, folder, *identitas, kata_kunci)] = identitas
+                    if len(berjalan) >= 2 * jumlah_worker:
+                        break
+                if not berjalan:
+                    break
+                beres, _ = wait(berjalan, return_when=FIRST_COMPLETED)
+                for future in beres:
+                    relatif, ukuran, diubah = berjalan.pop(future)
+                    try:
+                        hasil = future.result()
+                    except Exception as e:
+                        logger.error("Gagal memeriksa %s: %s", relatif, e)
+                        hasil = {"file": relatif, "ukuran": ukuran, "diubah": diubah,
+                                 "error": f"{type(e).__name__}: {e}"}
+                    keluaran.write(json.dumps(hasil, ensure_ascii=False) + "\n")
+                    keluaran.flush()
+                    diproses += 1
+                if diproses % 50 < len(beres):
+                    laju = diproses / (time.perf_counter() - mulai)
+                    logger.info("%d/%d file (%.2f file/detik)", diproses, len(antrian), laju)
+        except KeyboardInterrupt:
+            logger.warning("Dihentikan; %d file tercatat, sisanya dilanjutkan saat dijalankan lagi", diproses)
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+    return diproses
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validasi massal PDF CDD/EDD & SOP PMPJ (JSON Lines).")
+    parser.add_argument("folder", nargs="?", default="uploads", help="folder PDF (default: uploads)")
+    parser.add_argument("--keluaran", default="hasil_validasi.jsonl",
+                        help="file hasil JSON Lines; dilanjutkan jika sudah ada")
+    parser.add_argument("--worker", type=int, default=os.cpu_count() or 1, help="jumlah proses worker")
+    parser.add_argument("--kata-kunci", nargs="+", default=validasi_dokumen.KATA_KUNCI_UMUM,
+                        help="kata kunci (default: sama dengan form q1q2)")
+    parser.add_argument("--tesseract", help="path executable tesseract (jika tidak ada di PATH)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        jalankan(args.folder, args.keluaran, args.worker, args.kata_kunci, args.tesseract)
+    except KeyboardInterrupt:
+        return 130
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())